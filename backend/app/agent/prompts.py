@@ -49,9 +49,13 @@ When a user asks for a workout plan, you MUST follow this sequence:
 
 When you have enough information to create a plan:
 
-1. Call `get_exercise_history` for 2-3 key compound lifts relevant to their goals
+1. Call `get_personal_records` for 2-3 key compound lifts relevant to their goals
    (e.g. Barbell Bench Press, Barbell Back Squat, Conventional Deadlift) to
-   understand their current strength levels. If history is empty (new user),
+   understand their current strength levels. For a returning user, call
+   `get_progress_analytics` once to see e1RM trends, plateaus, RPE drift and
+   weekly volume per muscle group — use it to pick progressions, swap out
+   plateaued lifts and balance volume. Use `get_exercise_history` only when
+   you need recent set-by-set detail. If history is empty (new user),
    suggest conservative starting weights based on their experience level —
    don't ask the user for their maxes unless they offer.
 2. Call `search_youtube` for each exercise in the plan to get demo links.
@@ -0,0 +1,181 @@
+"""Progress analytics over a user's training log.
+
+The window of logs is fetched once as column arrays (one array_agg per
+column) and every metric is computed with grouped NumPy reductions, so the
+cost is a single query plus a few vector passes regardless of how many
+exercises the user trains:
+
+- e1RM trend: least-squares slope of the best daily e1RM (Epley), kg/week
+- weekly volume (weight x reps) per muscle group, weeks starting Monday
+- RPE drift: slope of the mean daily RPE, points/week; rising RPE at a flat
+  e1RM usually means fatigue is accumulating
+- plateau: enough recent sessions but no new best e1RM in the last weeks
+"""
+import uuid
+from datetime import date, timedelta
+
+import asyncpg
+import numpy as np
+
+_EPOCH = date(1970, 1, 1)
+
+MIN_WINDOW_DAYS = 7
+MAX_WINDOW_DAYS = 730
+
+_PLATEAU_WINDOW_DAYS = 28
+_PLATEAU_MIN_SESSIONS = 3
+_PLATEAU_MIN_GAIN = 0.01  # a best within 1% of the previous one isn't progress
+_TREND_MIN_SESSIONS = 3
+
+# Days are integer days since 1970-01-01 in the database's timezone, the same
+# day boundaries exercise_daily_stats uses.
+_COLUMNS_SQL = """
+SELECT (CURRENT_DATE - DATE '1970-01-01') AS today,
+       array_agg(l.exercise_name ORDER BY l.logged_at) AS exercise,
+       array_agg(COALESCE(e.muscle_group, 'other') ORDER BY l.logged_at) AS muscle_group,
+       array_agg(DATE(l.logged_at) - DATE '1970-01-01' ORDER BY l.logged_at) AS day,
+       array_agg(l.weight_kg::float8 ORDER BY l.logged_at) AS weight,
+       array_agg(l.reps ORDER BY l.logged_at) AS reps,
+       array_agg(l.rpe::float8 ORDER BY l.logged_at) AS rpe
+FROM exercise_logs l
+LEFT JOIN exercises e ON e.name = l.exercise_name
+WHERE l.user_id = $1 AND l.logged_at >= NOW() - INTERVAL '1 day' * $2
+      AND l.weight_kg > 0 AND l.reps > 0
+"""
+
+
+async def fetch_training_columns(conn: asyncpg.Connection, user_id: uuid.UUID, days: int) -> dict[str, np.ndarray]:
+    """Return the user's weighted sets from the last ``days`` as column arrays.
+
+    Keys: exercise, muscle_group (str), day (int), weight, reps, rpe (float;
+    rpe is NaN where not logged) and today (0-d int).
+    """
+    row = await conn.fetchrow(_COLUMNS_SQL, user_id, days)
+    return {
+        "today": np.int64(row["today"]),
+        "exercise": np.array(row["exercise"] or [], dtype=object),
+        "muscle_group": np.array(row["muscle_group"] or [], dtype=object),
+        "day": np.array(row["day"] or [], dtype=np.int64),
+        "weight": np.array(row["weight"] or [], dtype=float),
+        "reps": np.array(row["reps"] or [], dtype=float),
+        "rpe": np.array(row["rpe"] or [], dtype=float),
+    }
+
+
+def _grouped_slope(group: np.ndarray, x: np.ndarray, y: np.ndarray, n_groups: int) -> np.ndarray:
+    """Least-squares slope of y on x within each group; NaN y values are skipped.
+
+    Groups with fewer than _TREND_MIN_SESSIONS points (or no spread in x) get NaN.
+    """
+    valid = ~np.isnan(y)
+    g, x, y = group[valid], x[valid], y[valid]
+    n = np.bincount(g, minlength=n_groups).astype(float)
+    sx = np.bincount(g, x, minlength=n_groups)
+    sy = np.bincount(g, y, minlength=n_groups)
+    sxx = np.bincount(g, x * x, minlength=n_groups)
+    sxy = np.bincount(g, x * y, minlength=n_groups)
+    denom = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sxy - sx * sy) / denom
+    slope[(n < _TREND_MIN_SESSIONS) | ~(denom > 1e-9)] = np.nan
+    return slope
+
+
+def _round(value: float, digits: int) -> float | None:
+    return None if np.isnan(value) else round(float(value), digits) + 0.0  # no -0.0
+
+
+def summarize(columns: dict[str, np.ndarray], window_days: int) -> dict:
+    """Compute the analytics summary from fetch_training_columns output."""
+    today = int(columns["today"])
+    names, ex = np.unique(columns["exercise"], return_inverse=True)
+    summary = {"window_days": window_days, "exercises": [], "weekly_volume": []}
+    if len(names) == 0:
+        return summary
+
+    day, weight, reps, rpe = columns["day"], columns["weight"], columns["reps"], columns["rpe"]
+    n_ex = len(names)
+
+    # One point per exercise per training day; keys sort by exercise, then day
+    span = int(day.max() - day.min()) + 1
+    keys, point = np.unique(ex * span + (day - day.min()), return_inverse=True)
+    point_ex = keys // span
+    point_day = keys % span + day.min()
+
+    e1rm = np.where(reps == 1, weight, weight * (1 + reps / 30.0))
+    best = np.full(len(keys), -np.inf)
+    np.maximum.at(best, point, e1rm)
+
+    has_rpe = ~np.isnan(rpe)
+    rpe_sum = np.bincount(point, np.where(has_rpe, rpe, 0.0), minlength=len(keys))
+    rpe_n = np.bincount(point, has_rpe.astype(float), minlength=len(keys))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        day_rpe = rpe_sum / rpe_n
+
+    weeks = (point_day - today) / 7.0
+    e1rm_trend = _grouped_slope(point_ex, weeks, best, n_ex)
+    rpe_drift = _grouped_slope(point_ex, weeks, day_rpe, n_ex)
+
+    sessions = np.bincount(point_ex, minlength=n_ex)
+    last_point = np.cumsum(sessions) - 1
+    best_e1rm = np.full(n_ex, -np.inf)
+    np.maximum.at(best_e1rm, point_ex, best)
+
+    recent = point_day > today - _PLATEAU_WINDOW_DAYS
+    recent_sessions = np.bincount(point_ex[recent], minlength=n_ex)
+    recent_best = np.full(n_ex, -np.inf)
+    np.maximum.at(recent_best, point_ex[recent], best[recent])
+    prior_best = np.full(n_ex, -np.inf)
+    np.maximum.at(prior_best, point_ex[~recent], best[~recent])
+    plateau = (
+        (recent_sessions >= _PLATEAU_MIN_SESSIONS)
+        & np.isfinite(prior_best)
+        & (recent_best <= prior_best * (1 + _PLATEAU_MIN_GAIN))
+    )
+
+    # Muscle group of each exercise: taken from its first set
+    first_set = np.zeros(n_ex, dtype=np.int64)
+    first_set[ex[::-1]] = np.arange(len(ex))[::-1]
+    ex_group = columns["muscle_group"][first_set]
+
+    order = np.lexsort((names, -sessions))
+    summary["exercises"] = [
+        {
+            "exercise_name": str(names[i]),
+            "muscle_group": str(ex_group[i]),
+            "sessions": int(sessions[i]),
+            "latest_e1rm": _round(best[last_point[i]], 1),
+            "best_e1rm": _round(best_e1rm[i], 1),
+            "e1rm_trend_kg_per_week": _round(e1rm_trend[i], 2),
+            "rpe_drift_per_week": _round(rpe_drift[i], 2),
+            "plateau": bool(plateau[i]),
+        }
+        for i in order
+    ]
+
+    # Monday-based weeks: 1970-01-01 was a Thursday
+    groups, mg = np.unique(columns["muscle_group"], return_inverse=True)
+    week = day - (day + 3) % 7
+    keys, cell = np.unique((week - week.min()) // 7 * len(groups) + mg, return_inverse=True)
+    volume = np.bincount(cell, weight * reps)
+    sets = np.bincount(cell)
+    summary["weekly_volume"] = [
+        {
+            "week_start": (_EPOCH + timedelta(days=int(week.min() + k // len(groups) * 7))).isoformat(),
+            "muscle_group": str(groups[k % len(groups)]),
+            "volume_kg": round(float(v), 1),
+            "sets": int(s),
+        }
+        for k, v, s in zip(keys, volume, sets)
+    ]
+    return summary
+
+
+async def progress_analytics(conn: asyncpg.Connection, user_id: uuid.UUID, days: int = 180) -> dict:
+    """Fetch the user's last ``days`` of logs and summarize them.
+
+    ``days`` is clamped to [MIN_WINDOW_DAYS, MAX_WINDOW_DAYS] so callers that
+    don't validate it (the MCP tool) can't ask for an unbounded scan.
+    """
+    days = min(max(days, MIN_WINDOW_DAYS), MAX_WINDOW_DAYS)
+    return summarize(await fetch_training_columns(conn, user_id, days), days)
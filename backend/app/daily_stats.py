@@ -0,0 +1,68 @@
+"""Rebuild exercise_daily_stats from exercise_logs.
+
+The rollup is kept current by the exercise_logs trigger in main._SCHEMA_SQL;
+rebuild it after backfills, bulk imports or manual data fixes.
+
+    cd backend && python -m app.daily_stats [--user USER_ID]
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+
+import asyncpg
+
+from app.config import settings
+
+logger = logging.getLogger("daily_stats")
+
+_REBUILD_SQL = """
+INSERT INTO exercise_daily_stats (user_id, exercise_name, log_date, max_weight, best_reps, total_sets, volume_kg)
+SELECT user_id, exercise_name, DATE(logged_at),
+       MAX(weight_kg), MAX(reps), COUNT(*), COALESCE(SUM(weight_kg * reps), 0)
+FROM exercise_logs
+WHERE user_id IS NOT NULL AND ($1::uuid IS NULL OR user_id = $1)
+GROUP BY user_id, exercise_name, DATE(logged_at)
+"""
+
+
+async def rebuild_daily_stats(conn: asyncpg.Connection, user_id: uuid.UUID | None = None) -> int:
+    """Recompute the rollup for one user (or everyone). Returns the row count.
+
+    Blocks writes to exercise_logs for the duration so the trigger can't
+    interleave with the rebuild.
+    """
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE exercise_logs IN SHARE MODE")
+        await conn.execute(
+            "DELETE FROM exercise_daily_stats WHERE $1::uuid IS NULL OR user_id = $1",
+            user_id,
+        )
+        status = await conn.execute(_REBUILD_SQL, user_id)
+    count = int(status.split()[-1])
+    logger.info("Rebuilt %d exercise_daily_stats rows (user=%s)", count, user_id or "all")
+    return count
+
+
+async def backfill_daily_stats(conn: asyncpg.Connection) -> None:
+    """Populate the rollup on first startup after it was introduced."""
+    if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM exercise_daily_stats)"):
+        return
+    if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM exercise_logs)"):
+        await rebuild_daily_stats(conn)
+
+
+async def main(user_id: uuid.UUID | None) -> None:
+    conn = await asyncpg.connect(dsn=settings.DATABASE_URL)
+    try:
+        count = await rebuild_daily_stats(conn, user_id)
+    finally:
+        await conn.close()
+    print(f"Rebuilt {count} exercise_daily_stats rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", type=uuid.UUID, help="only rebuild this user's rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.user))
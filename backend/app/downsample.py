@@ -0,0 +1,46 @@
+"""Largest-Triangle-Three-Buckets downsampling for chart series.
+
+LTTB keeps the points that contribute most to the visual shape of a line, so
+peaks (PRs) and dips survive thinning that uniform sampling would drop.
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Return the sorted indices of at most ``n_out`` points of (x, y) to keep.
+
+    The first and last points are always kept, as is the series maximum.
+    x must be increasing. Series already within n_out are returned whole.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries over the interior points; one point is picked per bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    picked = np.empty(n_out, dtype=int)
+    picked[0], picked[-1] = 0, n - 1
+
+    prev = 0
+    for b in range(n_out - 2):
+        start, end = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        nxt_start, nxt_end = end, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[nxt_start:nxt_end].mean()
+        avg_y = y[nxt_start:nxt_end].mean()
+
+        bx, by = x[start:end], y[start:end]
+        areas = np.abs((x[prev] - avg_x) * (by - y[prev]) - (x[prev] - bx) * (avg_y - y[prev]))
+        prev = start + int(areas.argmax())
+        picked[b + 1] = prev
+
+    # Never drop the top of the series (e.g. the heaviest set): it replaces
+    # whatever was picked from its bucket
+    peak = int(y.argmax())
+    if peak not in picked:
+        bucket = int(np.searchsorted(edges, peak, side="right"))
+        picked[min(bucket, n_out - 2)] = peak
+        picked.sort()
+    return picked
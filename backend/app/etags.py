@@ -0,0 +1,75 @@
+"""Strong ETags for the session and history reads the app polls.
+
+A read's ETag hashes the user, the route and its parameters together with
+a fingerprint of the rows behind the response. The fingerprint is the row
+count plus a sum of hashes of (key, change_xid). sync_stamp restamps
+change_xid on every session write, so any insert, update or delete in scope
+changes it. Computing it needs only keys and stamps, so checking
+If-None-Match never reads workout_sessions.exercises or builds a response.
+
+History is fingerprinted from exercise_daily_stats, one row per day, whose
+change_xid the rollup trigger restamps on every write to that day's sets.
+The raw exercise_logs window is never scanned. Because nothing is
+shared between rows, concurrent writers don't contend the way a per-user
+counter row would.
+
+Routes take the fingerprint before reading their data. A write that lands
+in between makes the body newer than its ETag, which only costs the client
+one extra full response.
+"""
+import hashlib
+import uuid
+from datetime import date
+
+import asyncpg
+from fastapi import Request, Response
+
+
+def _fingerprint(key: str) -> str:
+    return f"COUNT(*) || ':' || COALESCE(SUM(hashtextextended({key}::text || ':' || change_xid, 0)), 0)"
+
+
+_SCHEDULE_SQL = f"""
+SELECT {_fingerprint("id")} FROM workout_sessions
+WHERE user_id = $1 AND scheduled_date BETWEEN $2 AND $3
+"""
+
+_SESSION_SQL = "SELECT change_xid FROM workout_sessions WHERE id = $1 AND user_id = $2"
+
+# Same rows and window as the history queries
+_HISTORY_SQL = f"""
+SELECT {_fingerprint("log_date")} FROM exercise_daily_stats
+WHERE user_id = $1 AND exercise_name = $2
+      AND log_date >= DATE(NOW() - INTERVAL '1 day' * $3)
+"""
+
+
+async def schedule_fingerprint(conn: asyncpg.Connection, user_id: uuid.UUID, start: date, end: date) -> str:
+    return await conn.fetchval(_SCHEDULE_SQL, user_id, start, end)
+
+
+async def session_fingerprint(conn: asyncpg.Connection, session_id: uuid.UUID, user_id: uuid.UUID) -> str | None:
+    """None if the session doesn't exist (or isn't the user's)."""
+    change_xid = await conn.fetchval(_SESSION_SQL, session_id, user_id)
+    return None if change_xid is None else str(change_xid)
+
+
+async def history_fingerprint(conn: asyncpg.Connection, user_id: uuid.UUID, exercise_name: str, days: int) -> str:
+    return await conn.fetchval(_HISTORY_SQL, user_id, exercise_name, days)
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha256(repr(tuple(str(p) for p in parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Response | None:
+    """Return a 304 if the request's If-None-Match matches ``etag``.
+
+    Otherwise set the ETag header on ``response`` and return None.
+    """
+    header = request.headers.get("if-none-match")
+    if header and (header.strip() == "*" or etag in (t.strip().removeprefix("W/") for t in header.split(","))):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
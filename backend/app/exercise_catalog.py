@@ -0,0 +1,141 @@
+import logging
+import re
+import time
+
+import asyncpg
+
+logger = logging.getLogger("exercise_catalog")
+
+# Keep in step with the SQL thresholds in exercise_resolver
+_TRIGRAM_CANDIDATE_SIM = 0.3
+_TRIGRAM_MATCH_SIM = 0.4
+_MUSCLE_BONUS = 0.15
+_MUSCLE_CANDIDATES = 10
+
+# pg_trgm treats runs of alphanumerics as words and ignores everything else
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the pg_trgm trigram set for text (lowercased, words padded '  w ')."""
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: frozenset[str], b: frozenset[str]) -> float:
+    """pg_trgm similarity(): shared trigrams over the union of both sets."""
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class ExerciseCatalog:
+    """Process-local snapshot of the exercises table for DB-free name resolution.
+
+    Holds lowercase canonical names, lowercase aliases, muscle groups and an
+    inverted trigram index. Loaded at startup; reloaded from the DB when
+    invalidated or older than ``ttl`` seconds so rows added by another process
+    (the MCP server auto-inserts too) are picked up.
+    """
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self._loaded_at: float | None = None
+        self._invalidated = False
+        self._by_name: dict[str, str] = {}
+        self._by_alias: dict[str, str] = {}
+        self._muscle: dict[str, str | None] = {}
+        self._grams: dict[str, frozenset[str]] = {}
+        self._index: dict[str, set[str]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def is_stale(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return self._invalidated or time.monotonic() - self._loaded_at > self.ttl
+
+    def invalidate(self) -> None:
+        """Force a reload on the next resolve (no-op if never loaded)."""
+        self._invalidated = True
+
+    async def load(self, conn: asyncpg.Connection) -> None:
+        rows = await conn.fetch(
+            """SELECT e.name, e.muscle_group,
+                      COALESCE(array_agg(a.alias) FILTER (WHERE a.alias IS NOT NULL), '{}') AS aliases
+               FROM exercises e
+               LEFT JOIN exercise_aliases a ON a.exercise_name = e.name
+               GROUP BY e.id"""
+        )
+        self._by_name.clear()
+        self._by_alias.clear()
+        self._muscle.clear()
+        self._grams.clear()
+        self._index.clear()
+        for r in rows:
+            self.add(r["name"], r["muscle_group"], r["aliases"] or [])
+        self._loaded_at = time.monotonic()
+        self._invalidated = False
+        logger.info("Loaded %d exercises into catalog cache", len(self._by_name))
+
+    def add(self, name: str, muscle_group: str | None = None, aliases: list[str] | None = None) -> None:
+        """Add a single exercise, e.g. right after an auto-insert."""
+        self._by_name[name.lower()] = name
+        for alias in aliases or []:
+            self._by_alias.setdefault(alias.lower(), name)
+        self._muscle[name] = muscle_group
+        grams = trigrams(name)
+        self._grams[name] = grams
+        for g in grams:
+            self._index.setdefault(g, set()).add(name)
+
+    def lookup(self, raw_name: str, muscle_hint: str | None = None) -> tuple[str, str] | None:
+        """Resolve raw_name against the snapshot.
+
+        Returns (canonical_name, tier) with tier one of 'exact', 'alias',
+        'trigram', or None when the SQL path should decide.
+        """
+        key = raw_name.lower()
+        name = self._by_name.get(key)
+        if name:
+            return name, "exact"
+        name = self._by_alias.get(key)
+        if name:
+            return name, "alias"
+
+        query = trigrams(raw_name)
+        candidates: set[str] = set()
+        for g in query:
+            candidates.update(self._index.get(g, ()))
+        scored = [(similarity(query, self._grams[c]), c) for c in candidates]
+
+        if muscle_hint:
+            top = sorted(
+                (s for s in scored if s[0] >= _TRIGRAM_CANDIDATE_SIM),
+                key=lambda s: s[0],
+                reverse=True,
+            )[:_MUSCLE_CANDIDATES]
+            if not top:
+                return None
+            best = max(
+                top,
+                key=lambda s: s[0] + (_MUSCLE_BONUS if self._muscle.get(s[1]) == muscle_hint else 0.0),
+            )
+            effective = best[0] + (_MUSCLE_BONUS if self._muscle.get(best[1]) == muscle_hint else 0.0)
+            if effective >= _TRIGRAM_MATCH_SIM:
+                return best[1], "trigram"
+            return None
+
+        best = max(scored, default=None, key=lambda s: s[0])
+        if best and best[0] >= _TRIGRAM_MATCH_SIM:
+            return best[1], "trigram"
+        return None
+
+
+catalog = ExerciseCatalog()
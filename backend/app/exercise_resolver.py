@@ -1,7 +1,12 @@
 import logging
+import time
+import uuid
+from collections import OrderedDict
 
 import asyncpg
 
+from app.exercise_catalog import catalog
+
 logger = logging.getLogger("exercise_resolver")
 
 # Map keywords found in user input to muscle_group values in the database
@@ -24,6 +29,78 @@ _MUSCLE_KEYWORDS: dict[str, str] = {
 }
 
 
+# Best match for one name: the user's remembered mapping > exact > alias >
+# trigram (muscle-group bonus applied when a hint is given). The first three
+# are index lookups; the trigram tier only runs when none of them matched,
+# and filters with pg_trgm's % operator so the GIN index on exercises.name
+# applies (% uses pg_trgm.similarity_threshold, default 0.3, which is the
+# lowest threshold below). Formatted with the SQL expressions for the raw
+# name, the hint and the user id.
+_RANKED_MATCH_SQL = """
+WITH direct AS (
+    SELECT name, tier, sim FROM (
+        (SELECT m.exercise_name AS name, 'memo' AS tier, NULL::real AS sim, 1 AS rank
+         FROM exercise_name_memos m WHERE m.user_id = {user} AND m.raw_key = LOWER({raw}))
+        UNION ALL
+        (SELECT e.name, 'exact', NULL::real, 2
+         FROM exercises e WHERE LOWER(e.name) = LOWER({raw}) LIMIT 1)
+        UNION ALL
+        (SELECT a.exercise_name, 'alias', NULL::real, 3
+         FROM exercise_aliases a WHERE LOWER(a.alias) = LOWER({raw}))
+    ) ranked
+    ORDER BY rank
+    LIMIT 1
+)
+SELECT name, tier, sim FROM direct
+UNION ALL
+(SELECT c.name, 'trigram', c.sim
+ FROM (SELECT e.name, e.muscle_group, similarity(e.name, {raw}) AS sim
+       FROM exercises e
+       WHERE e.name % {raw}
+             AND similarity(e.name, {raw}) >= CASE WHEN {hint} IS NULL THEN 0.4 ELSE 0.3 END
+       ORDER BY sim DESC
+       LIMIT 10) c
+ WHERE NOT EXISTS (SELECT 1 FROM direct)
+       AND c.sim + CASE WHEN c.muscle_group = {hint} THEN 0.15 ELSE 0 END >= 0.4
+ ORDER BY c.sim + CASE WHEN c.muscle_group = {hint} THEN 0.15 ELSE 0 END DESC, c.sim DESC
+ LIMIT 1)
+"""
+
+_RESOLVE_SQL = _RANKED_MATCH_SQL.format(raw="$1::text", hint="$2::text", user="$3::uuid")
+
+_BULK_RESOLVE_SQL = f"""
+SELECT i.raw, m.name, m.tier
+FROM unnest($1::text[], $2::text[]) AS i(raw, hint)
+LEFT JOIN LATERAL ({_RANKED_MATCH_SQL.format(raw="i.raw", hint="i.hint", user="$3::uuid")}) m ON true
+"""
+
+# Each user's remembered raw -> canonical mappings from exercise_name_memos,
+# keyed by lowercased raw name. A user's mappings are loaded together, so a
+# catalog hit can be served without a DB round trip once we know the user has
+# no mapping for the name. Bounded LRU over users; a snapshot is reloaded after
+# _MEMO_TTL seconds so changes made by another process (the MCP server resolves
+# and logs too) are picked up.
+_MEMO_MAX_USERS = 1000
+_MEMO_TTL = 60.0
+_memos: OrderedDict[uuid.UUID, tuple[float, dict[str, str]]] = OrderedDict()
+
+
+async def _user_memos(conn: asyncpg.Connection, user_id: uuid.UUID) -> dict[str, str]:
+    cached = _memos.get(user_id)
+    if cached and time.monotonic() - cached[0] <= _MEMO_TTL:
+        _memos.move_to_end(user_id)
+        return cached[1]
+    rows = await conn.fetch(
+        "SELECT raw_key, exercise_name FROM exercise_name_memos WHERE user_id = $1", user_id
+    )
+    memos = {r["raw_key"]: r["exercise_name"] for r in rows}
+    _memos[user_id] = (time.monotonic(), memos)
+    _memos.move_to_end(user_id)
+    while len(_memos) > _MEMO_MAX_USERS:
+        _memos.popitem(last=False)
+    return memos
+
+
 def _extract_muscle_group(raw_name: str) -> str | None:
     """Extract a muscle_group hint from user input based on keyword matching."""
     lower = raw_name.lower()
@@ -33,96 +110,245 @@ def _extract_muscle_group(raw_name: str) -> str | None:
     return None
 
 
-async def resolve_exercise_name(conn: asyncpg.Connection, raw_name: str) -> str:
-    """Resolve a raw exercise name to its canonical form.
+async def insert_exercises(conn: asyncpg.Connection, names: list[str]) -> None:
+    """Add unmatched names as new canonical exercises (existing names are skipped)."""
+    await conn.execute(
+        """INSERT INTO exercises (name)
+           SELECT unnest($1::text[])
+           ON CONFLICT (name) DO NOTHING""",
+        names,
+    )
+    logger.info("Auto-inserted %d new exercises: %s", len(names), names)
+    if not catalog.is_loaded:
+        return
+    if conn.is_in_transaction():
+        # The insert may still roll back; reload from committed rows next time
+        catalog.invalidate()
+    else:
+        for name in names:
+            catalog.add(name)
+
 
-    Returns the canonical name, or the original if no match found.
+async def resolve_exercise(
+    conn: asyncpg.Connection, raw_name: str, user_id: uuid.UUID | None = None, auto_insert: bool = True
+) -> tuple[str, str]:
+    """Resolve a raw exercise name to (canonical_name, tier).
+
+    tier is 'memo' (the user's remembered mapping), 'exact', 'alias', 'trigram',
+    'inserted' (no match, auto-inserted as a new canonical exercise) or 'blank'
+    (empty input, returned unchanged). With auto_insert=False an unmatched name
+    comes back unchanged with tier 'unmatched', for callers that need to check
+    something before creating it (see insert_exercises).
 
     Strategy:
-    1. Exact match (case-insensitive) on exercises.name
-    2. Alias match (case-insensitive) on exercises.aliases array
-    3. Trigram similarity >= 0.4 on exercises.name, preferring matching muscle_group
+    1. The user's remembered mapping for this input (see remember_resolutions)
+    2. Exact match (case-insensitive) on exercises.name
+    3. Alias match (case-insensitive) on exercise_aliases
+    4. Trigram similarity >= 0.4 on exercises.name, preferring matching muscle_group
+
+    When the in-process catalog is loaded the same strategy runs against it and
+    the user's cached mappings first, so known names resolve without a DB round
+    trip. Misses go to the DB as a single ranked statement, which stays the
+    source of truth.
     """
     if not raw_name or not raw_name.strip():
-        return raw_name
+        return raw_name, "blank"
 
     raw_name = raw_name.strip()
-
-    # 1. Exact match on canonical name
-    row = await conn.fetchrow(
-        "SELECT name FROM exercises WHERE LOWER(name) = LOWER($1)",
-        raw_name,
-    )
-    if row:
-        return row["name"]
-
-    # 2. Alias match
-    row = await conn.fetchrow(
-        """SELECT name FROM exercises
-           WHERE EXISTS (
-               SELECT 1 FROM unnest(aliases) AS a WHERE LOWER(a) = LOWER($1)
-           )""",
-        raw_name,
-    )
-    if row:
-        logger.info("Resolved '%s' via alias to '%s'", raw_name, row["name"])
-        return row["name"]
-
-    # 3. Trigram similarity with muscle-group preference
     muscle_hint = _extract_muscle_group(raw_name)
 
-    if muscle_hint:
-        # Prefer exercises whose muscle_group matches the keyword in user input.
-        # Fetch top candidates and re-rank: matching muscle_group gets a bonus.
-        rows = await conn.fetch(
-            """SELECT name, muscle_group, similarity(name, $1) AS sim
-               FROM exercises
-               WHERE similarity(name, $1) >= 0.3
-               ORDER BY sim DESC
-               LIMIT 10""",
-            raw_name,
-        )
-        if rows:
-            # Re-rank: add 0.15 bonus to sim for matching muscle_group
-            best = max(
-                rows,
-                key=lambda r: float(r["sim"]) + (0.15 if r["muscle_group"] == muscle_hint else 0.0),
-            )
-            effective_sim = float(best["sim"]) + (0.15 if best["muscle_group"] == muscle_hint else 0.0)
-            if effective_sim >= 0.4:
-                logger.warning(
-                    "Resolved '%s' via trigram+muscle (sim=%.2f, muscle=%s, effective=%.2f) to '%s'",
-                    raw_name,
-                    best["sim"],
-                    muscle_hint,
-                    effective_sim,
-                    best["name"],
-                )
-                return best["name"]
-    else:
-        row = await conn.fetchrow(
-            """SELECT name, similarity(name, $1) AS sim
-               FROM exercises
-               WHERE similarity(name, $1) >= 0.4
-               ORDER BY sim DESC
-               LIMIT 1""",
-            raw_name,
-        )
-        if row:
+    if catalog.is_loaded:
+        if catalog.is_stale():
+            await catalog.load(conn)
+        if user_id is not None:
+            remembered = (await _user_memos(conn, user_id)).get(raw_name.lower())
+            if remembered:
+                return remembered, "memo"
+        hit = catalog.lookup(raw_name, muscle_hint)
+        if hit:
+            return hit
+
+    row = await conn.fetchrow(_RESOLVE_SQL, raw_name, muscle_hint, user_id)
+    if row:
+        if row["tier"] == "trigram":
             logger.warning(
-                "Resolved '%s' via trigram (sim=%.2f) to '%s'",
-                raw_name,
-                row["sim"],
-                row["name"],
+                "Resolved '%s' via trigram (sim=%.2f, muscle=%s) to '%s'",
+                raw_name, row["sim"], muscle_hint, row["name"],
             )
-            return row["name"]
+        elif row["tier"] != "memo":
+            if row["tier"] == "alias":
+                logger.info("Resolved '%s' via alias to '%s'", raw_name, row["name"])
+            # Known to the DB but not the catalog — another process added it
+            catalog.invalidate()
+        return row["name"], row["tier"]
 
+    if not auto_insert:
+        return raw_name, "unmatched"
     # No match found — auto-insert as a new canonical exercise
+    await insert_exercises(conn, [raw_name])
+    return raw_name, "inserted"
+
+
+async def resolve_exercise_name(
+    conn: asyncpg.Connection, raw_name: str, user_id: uuid.UUID | None = None
+) -> str:
+    """Resolve a raw exercise name to its canonical form.
+
+    Returns the canonical name, or the original if no match found (see
+    resolve_exercise for the matching strategy).
+    """
+    name, _ = await resolve_exercise(conn, raw_name, user_id)
+    return name
+
+
+# Tiers worth remembering once the user has acted on the result: a fuzzy match
+# they accepted, or a name that became a new exercise. Either can be corrected
+# with correct_resolution, which then takes precedence over every other tier.
+REMEMBERED_TIERS = frozenset({"trigram", "inserted"})
+
+
+async def remember_resolutions(
+    conn: asyncpg.Connection, user_id: uuid.UUID, resolutions: dict[str, str]
+) -> None:
+    """Persist {raw_name: canonical_name} for the user in one statement.
+
+    Call after the user has acted on the resolved names (e.g. logged a set).
+    Mappings this process already knows about are skipped.
+    """
+    cached = _memos.get(user_id)
+    known = cached[1] if cached else {}
+    pending: dict[str, str] = {}
+    for raw_name, canonical_name in resolutions.items():
+        key = raw_name.strip().lower()
+        if key and known.get(key) != canonical_name:
+            pending[key] = canonical_name
+    if not pending:
+        return
     await conn.execute(
-        """INSERT INTO exercises (name)
-           VALUES ($1)
-           ON CONFLICT (name) DO NOTHING""",
-        raw_name,
+        """INSERT INTO exercise_name_memos (user_id, raw_key, exercise_name)
+           SELECT $1, LOWER(r.raw_key), r.exercise_name FROM unnest($2::text[], $3::text[]) AS r(raw_key, exercise_name)
+           ON CONFLICT (user_id, raw_key)
+           DO UPDATE SET exercise_name = EXCLUDED.exercise_name, updated_at = NOW()""",
+        user_id, list(pending), list(pending.values()),
+    )
+    if cached:
+        known.update(pending)
+
+
+async def list_resolutions(conn: asyncpg.Connection, user_id: uuid.UUID) -> list[dict]:
+    """The user's remembered mappings, by raw name."""
+    return [
+        dict(r)
+        for r in await conn.fetch(
+            """SELECT raw_key, exercise_name, updated_at FROM exercise_name_memos
+               WHERE user_id = $1 ORDER BY raw_key""",
+            user_id,
+        )
+    ]
+
+
+async def correct_resolution(
+    conn: asyncpg.Connection, user_id: uuid.UUID, raw_name: str, exercise_name: str
+) -> str | None:
+    """Point the user's raw name at an existing exercise, replacing any mapping.
+
+    exercise_name is matched case-insensitively against exercises.name. Returns
+    the canonical name stored, or None if there is no such exercise.
+    """
+    stored = await conn.fetchval(
+        """INSERT INTO exercise_name_memos (user_id, raw_key, exercise_name)
+           SELECT $1, LOWER($2), e.name FROM exercises e WHERE LOWER(e.name) = LOWER($3) LIMIT 1
+           ON CONFLICT (user_id, raw_key)
+           DO UPDATE SET exercise_name = EXCLUDED.exercise_name, updated_at = NOW()
+           RETURNING exercise_name""",
+        user_id, raw_name.strip(), exercise_name.strip(),
     )
-    logger.info("Auto-inserted new exercise: '%s'", raw_name)
-    return raw_name
+    _memos.pop(user_id, None)
+    return stored
+
+
+async def forget_resolution(conn: asyncpg.Connection, user_id: uuid.UUID, raw_name: str) -> bool:
+    """Drop the user's mapping for raw_name. Returns False if there wasn't one."""
+    result = await conn.execute(
+        "DELETE FROM exercise_name_memos WHERE user_id = $1 AND raw_key = LOWER($2)",
+        user_id, raw_name.strip(),
+    )
+    _memos.pop(user_id, None)
+    return result != "DELETE 0"
+
+
+async def resolve_exercise_tiers(
+    conn: asyncpg.Connection, names: list[str], user_id: uuid.UUID | None = None, auto_insert: bool = True
+) -> dict[str, tuple[str, str]]:
+    """Resolve many raw names at once. Returns {raw_name: (canonical_name, tier)}.
+
+    Same precedence and tiers as resolve_exercise, but everything the catalog
+    and the user's cached mappings can't answer goes to the DB in one
+    set-based query, and unmatched names are auto-inserted with a single
+    multi-row INSERT (or left 'unmatched' with auto_insert=False). Costs at
+    most two round trips regardless of how many names are passed (plus one to
+    load the user's mappings when they aren't cached).
+    """
+    result: dict[str, tuple[str, str]] = {}
+    pending: dict[str, str] = {}  # stripped raw -> muscle hint
+
+    memos: dict[str, str] = {}
+    if catalog.is_loaded:
+        if catalog.is_stale():
+            await catalog.load(conn)
+        if user_id is not None:
+            memos = await _user_memos(conn, user_id)
+
+    for name in names:
+        if name in result:
+            continue
+        if not name or not name.strip():
+            result[name] = (name, "blank")
+            continue
+        raw = name.strip()
+        hint = _extract_muscle_group(raw)
+        remembered = memos.get(raw.lower())
+        hit = catalog.lookup(raw, hint) if catalog.is_loaded and not remembered else None
+        if remembered:
+            result[name] = (remembered, "memo")
+        elif hit:
+            result[name] = hit
+        else:
+            pending[raw] = hint
+
+    resolved: dict[str, tuple[str, str]] = {}
+    if pending:
+        rows = await conn.fetch(_BULK_RESOLVE_SQL, list(pending), list(pending.values()), user_id)
+        unmatched: dict[str, str] = {}  # lowercased -> first spelling seen
+        for r in rows:
+            if r["name"] is not None:
+                resolved[r["raw"]] = (r["name"], r["tier"])
+                if r["tier"] == "trigram":
+                    logger.warning("Resolved '%s' via trigram to '%s'", r["raw"], r["name"])
+                elif r["tier"] != "memo":
+                    catalog.invalidate()
+            else:
+                # Case-only variants collapse onto one new exercise, as they
+                # would when resolved one at a time
+                resolved[r["raw"]] = (
+                    unmatched.setdefault(r["raw"].lower(), r["raw"]),
+                    "inserted" if auto_insert else "unmatched",
+                )
+
+        if unmatched and auto_insert:
+            await insert_exercises(conn, list(unmatched.values()))
+
+    for name in names:
+        if name not in result:
+            result[name] = resolved[name.strip()]
+    return result
+
+
+async def resolve_exercise_names(
+    conn: asyncpg.Connection, names: list[str], user_id: uuid.UUID | None = None
+) -> dict[str, str]:
+    """Resolve many raw names at once. Returns {raw_name: canonical_name}.
+
+    See resolve_exercise_tiers.
+    """
+    return {name: canonical for name, (canonical, _) in (await resolve_exercise_tiers(conn, names, user_id)).items()}
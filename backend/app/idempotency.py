@@ -0,0 +1,68 @@
+"""Idempotency-Key handling for retried writes.
+
+A write sent with an Idempotency-Key claims the key in the same transaction
+as the write and stores its response there, so either both commit or
+neither does. A retry with the same key gets the stored response back; a
+retry that races the original waits on the key's row lock until the
+original commits or rolls back. Keys are per user and expire after KEY_TTL.
+"""
+import json
+import logging
+import uuid
+from datetime import timedelta
+
+import asyncpg
+
+logger = logging.getLogger("idempotency")
+
+KEY_TTL = timedelta(hours=24)
+MAX_KEY_LENGTH = 255
+
+# Claims the key, or reclaims it if it has expired. Returns no row when a live
+# claim exists. The same statement clears the user's other expired keys.
+_CLAIM_SQL = """
+WITH purge AS (
+    DELETE FROM idempotency_keys
+    WHERE user_id = $1 AND key <> $2 AND created_at < NOW() - $4::interval
+)
+INSERT INTO idempotency_keys (user_id, key, request_hash)
+VALUES ($1, $2, $3)
+ON CONFLICT (user_id, key) DO UPDATE
+    SET request_hash = EXCLUDED.request_hash, response = NULL, created_at = NOW()
+    WHERE idempotency_keys.created_at < NOW() - $4::interval
+RETURNING key
+"""
+
+
+async def claim_key(conn: asyncpg.Connection, user_id: uuid.UUID, key: str, request_hash: str) -> dict | None:
+    """Claim ``key`` for this request; call inside the write's transaction.
+
+    Returns None if the caller now owns the key and should do the write, or
+    the earlier request's {"request_hash", "response"} if the key was used.
+    """
+    if await conn.fetchval(_CLAIM_SQL, user_id, key, request_hash, KEY_TTL) is not None:
+        return None
+    row = await conn.fetchrow(
+        "SELECT request_hash, response FROM idempotency_keys WHERE user_id = $1 AND key = $2",
+        user_id, key,
+    )
+    return {"request_hash": row["request_hash"], "response": json.loads(row["response"])}
+
+
+async def store_response(conn: asyncpg.Connection, user_id: uuid.UUID, key: str, response: dict) -> None:
+    """Record the response for a key claimed with claim_key."""
+    await conn.execute(
+        "UPDATE idempotency_keys SET response = $3::jsonb WHERE user_id = $1 AND key = $2",
+        user_id, key, json.dumps(response),
+    )
+
+
+async def purge_expired_keys(conn: asyncpg.Connection) -> int:
+    """Delete every expired key. Returns the number removed."""
+    status = await conn.execute(
+        "DELETE FROM idempotency_keys WHERE created_at < NOW() - $1::interval", KEY_TTL
+    )
+    count = int(status.split()[-1])
+    if count:
+        logger.info("Purged %d expired idempotency keys", count)
+    return count
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
@@ -17,6 +18,7 @@ from app.routes.profile import router as profile_router
 from app.routes.sessions import router as sessions_router
 from app.routes.exercises import router as exercises_router
 from app.routes.voice import router as voice_router
+from app.routes.sync import router as sync_router
 
 
 _SCHEMA_SQL = """
@@ -56,8 +58,10 @@ CREATE TABLE IF NOT EXISTS workout_sessions (
     completed_at TIMESTAMPTZ,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
+-- Range-partitioned by month on logged_at (see app.partitioning); databases
+-- created before that keep a plain table until `python -m app.partitioning migrate`.
 CREATE TABLE IF NOT EXISTS exercise_logs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES profiles(id),
     session_id UUID REFERENCES workout_sessions(id),
     exercise_name VARCHAR(100) NOT NULL,
@@ -68,8 +72,9 @@ CREATE TABLE IF NOT EXISTS exercise_logs (
     distance_m DECIMAL(7,1),
     duration_seconds INT,
     notes VARCHAR(500),
-    logged_at TIMESTAMPTZ DEFAULT NOW()
-);
+    logged_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, logged_at)
+) PARTITION BY RANGE (logged_at);
 CREATE TABLE IF NOT EXISTS chat_messages (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES profiles(id),
@@ -88,10 +93,84 @@ CREATE TABLE IF NOT EXISTS exercises (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+CREATE TABLE IF NOT EXISTS exercise_aliases (
+    alias VARCHAR(100) NOT NULL,
+    exercise_name VARCHAR(100) NOT NULL REFERENCES exercises(name) ON DELETE CASCADE ON UPDATE CASCADE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS exercise_name_memos (
+    user_id UUID NOT NULL REFERENCES profiles(id),
+    raw_key VARCHAR(100) NOT NULL,
+    exercise_name VARCHAR(100) NOT NULL REFERENCES exercises(name) ON DELETE CASCADE ON UPDATE CASCADE,
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (user_id, raw_key)
+);
+
+-- Per-day rollup of exercise_logs for progress charts, maintained by
+-- trg_exercise_logs_daily_stats below. Rebuild with `python -m app.daily_stats`.
+CREATE TABLE IF NOT EXISTS exercise_daily_stats (
+    user_id UUID NOT NULL REFERENCES profiles(id),
+    exercise_name VARCHAR(100) NOT NULL,
+    log_date DATE NOT NULL,
+    max_weight DECIMAL(5,1),
+    best_reps INT,
+    total_sets INT NOT NULL,
+    volume_kg DECIMAL(12,1) NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, exercise_name, log_date)
+);
+-- Transaction id of the last write to the day's sets, including set_number and
+-- rpe edits that leave the aggregates alone; the history ETags hash it.
+ALTER TABLE exercise_daily_stats
+    ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT pg_current_xact_id()::text::bigint;
+
+-- Best-ever marks per user/exercise, one row per record_type (max_weight,
+-- e1rm, max_reps, max_distance, max_duration). max_reps is the most reps in
+-- any set; rep_records holds the best at each weight. Both are maintained by
+-- trg_exercise_logs_personal_records below.
+CREATE TABLE IF NOT EXISTS personal_records (
+    user_id UUID NOT NULL REFERENCES profiles(id),
+    exercise_name VARCHAR(100) NOT NULL,
+    record_type VARCHAR(20) NOT NULL,
+    value DECIMAL(9,1) NOT NULL,
+    weight_kg DECIMAL(5,1),
+    reps INT,
+    log_id UUID NOT NULL,
+    achieved_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, exercise_name, record_type)
+);
+
+-- Most reps done at each weight per user/exercise. Sets without a weight
+-- (bodyweight) are keyed at 0.
+CREATE TABLE IF NOT EXISTS rep_records (
+    user_id UUID NOT NULL REFERENCES profiles(id),
+    exercise_name VARCHAR(100) NOT NULL,
+    weight_kg DECIMAL(5,1) NOT NULL,
+    reps INT NOT NULL,
+    log_id UUID NOT NULL,
+    achieved_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, exercise_name, weight_kg)
+);
+
+-- Responses to writes sent with an Idempotency-Key header, so a client retry
+-- replays the stored response instead of repeating the write. Keys expire
+-- after app.idempotency.KEY_TTL.
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    user_id UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+    key VARCHAR(255) NOT NULL,
+    request_hash CHAR(64) NOT NULL,
+    response JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (user_id, key)
+);
+
 CREATE INDEX IF NOT EXISTS idx_exercises_name_trgm ON exercises USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_exercises_name_lower ON exercises (LOWER(name));
+CREATE UNIQUE INDEX IF NOT EXISTS idx_exercise_aliases_lower ON exercise_aliases (LOWER(alias));
 CREATE INDEX IF NOT EXISTS idx_exercise_logs_lookup ON exercise_logs(user_id, exercise_name, logged_at);
 CREATE INDEX IF NOT EXISTS idx_sessions_schedule ON workout_sessions(user_id, scheduled_date);
 CREATE INDEX IF NOT EXISTS idx_chat_history ON chat_messages(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_idempotency_keys_created ON idempotency_keys(created_at);
 
 ALTER TABLE profiles ADD COLUMN IF NOT EXISTS training_objective VARCHAR(1000);
 ALTER TABLE exercise_logs ADD COLUMN IF NOT EXISTS distance_m DECIMAL(7,1);
@@ -100,23 +179,379 @@ ALTER TABLE exercise_logs ALTER COLUMN reps DROP NOT NULL;
 
 ALTER TABLE workout_sessions ADD COLUMN IF NOT EXISTS schema_version INT DEFAULT 1;
 ALTER TABLE exercise_logs ADD COLUMN IF NOT EXISTS round_number INT;
+
+-- Set numbers are unique per exercise within a session; the index also serves
+-- every session_id lookup (set numbering, per-session lists, session deletes).
+-- Renumber duplicates left by concurrent logging before it existed, then create it.
+-- A partitioned exercise_logs can't have this index on the parent (it would
+-- have to include logged_at), so each partition gets its own; see below.
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'exercise_logs'::regclass) = 'r'
+       AND to_regclass('idx_exercise_logs_session_set') IS NULL THEN
+        UPDATE exercise_logs l SET set_number = n.rn
+        FROM (SELECT id, ROW_NUMBER() OVER (
+                  PARTITION BY session_id, exercise_name ORDER BY set_number, logged_at, id) AS rn
+              FROM exercise_logs
+              WHERE (session_id, exercise_name) IN (
+                  SELECT session_id, exercise_name FROM exercise_logs
+                  GROUP BY session_id, exercise_name, set_number
+                  HAVING COUNT(*) > 1)) n
+        WHERE l.id = n.id AND l.set_number <> n.rn;
+        CREATE UNIQUE INDEX idx_exercise_logs_session_set
+            ON exercise_logs (session_id, exercise_name, set_number);
+    END IF;
+END $$;
+
+-- Create the monthly exercise_logs partition starting at p_month (UTC month
+-- boundaries) with its set-number unique index. Skips the month, with a
+-- warning, if rows for it already landed in the default partition.
+CREATE OR REPLACE FUNCTION create_exercise_logs_partition(p_month DATE) RETURNS BOOLEAN AS $$
+DECLARE
+    v_name TEXT := 'exercise_logs_' || to_char(p_month, 'YYYY_MM');
+    v_from TIMESTAMPTZ := date_trunc('month', p_month)::timestamp AT TIME ZONE 'UTC';
+    v_to TIMESTAMPTZ := (date_trunc('month', p_month) + INTERVAL '1 month')::timestamp AT TIME ZONE 'UTC';
+BEGIN
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN false;
+    END IF;
+    IF EXISTS (SELECT 1 FROM exercise_logs_default WHERE logged_at >= v_from AND logged_at < v_to) THEN
+        RAISE WARNING 'exercise_logs_default has rows for %, not creating %', to_char(p_month, 'YYYY-MM'), v_name;
+        RETURN false;
+    END IF;
+    EXECUTE format('CREATE TABLE %I PARTITION OF exercise_logs FOR VALUES FROM (%L) TO (%L)', v_name, v_from, v_to);
+    EXECUTE format('CREATE UNIQUE INDEX %I ON %I (session_id, exercise_name, set_number)', v_name || '_session_set', v_name);
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Make sure partitions exist for this month and the next p_months_ahead.
+-- No-op while exercise_logs is a plain table. Returns how many were created.
+CREATE OR REPLACE FUNCTION ensure_exercise_logs_partitions(p_months_ahead INT) RETURNS INT AS $$
+DECLARE
+    v_month DATE := date_trunc('month', NOW() AT TIME ZONE 'UTC')::date;
+    v_created INT := 0;
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = 'exercise_logs'::regclass) <> 'p' THEN
+        RETURN 0;
+    END IF;
+    -- Several app instances run this at startup and daily
+    PERFORM pg_advisory_xact_lock(hashtext('ensure_exercise_logs_partitions'));
+    IF to_regclass('exercise_logs_default') IS NULL THEN
+        CREATE TABLE exercise_logs_default PARTITION OF exercise_logs DEFAULT;
+        CREATE UNIQUE INDEX exercise_logs_default_session_set
+            ON exercise_logs_default (session_id, exercise_name, set_number);
+    END IF;
+    FOR i IN 0..p_months_ahead LOOP
+        IF create_exercise_logs_partition((v_month + make_interval(months => i))::date) THEN
+            v_created := v_created + 1;
+        END IF;
+    END LOOP;
+    RETURN v_created;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT ensure_exercise_logs_partitions(3);
+
+-- Highest set number per exercise in a session, read under a per-(session,
+-- exercise) advisory lock held until the caller's transaction ends. The
+-- set-number unique index is per partition, so two inserts landing either side
+-- of a month boundary wouldn't collide on it; the lock serializes numbering
+-- instead. plpgsql runs the query on a snapshot taken after the lock is
+-- granted, which one SQL statement locking inline would not. Locks are taken
+-- in name order so batches can't deadlock.
+CREATE OR REPLACE FUNCTION lock_session_set_numbers(p_session UUID, p_names TEXT[])
+RETURNS TABLE (exercise TEXT, max_set INT) AS $$
+DECLARE
+    v_name TEXT;
+BEGIN
+    FOR v_name IN SELECT DISTINCT n FROM unnest(p_names) AS n ORDER BY n LOOP
+        PERFORM pg_advisory_xact_lock(hashtext(p_session::text || ':' || v_name));
+    END LOOP;
+    RETURN QUERY
+        SELECT l.exercise_name::text, MAX(l.set_number)
+        FROM exercise_logs l
+        WHERE l.session_id = p_session AND l.exercise_name = ANY(p_names)
+        GROUP BY l.exercise_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recompute one exercise_daily_stats row from exercise_logs. Locks the row
+-- first so a concurrent writer to the same day either sees our result or
+-- applies its change on top of it.
+CREATE OR REPLACE FUNCTION refresh_exercise_daily_stats(p_user UUID, p_name VARCHAR, p_day DATE)
+RETURNS void AS $$
+DECLARE
+    agg RECORD;
+BEGIN
+    PERFORM 1 FROM exercise_daily_stats
+    WHERE user_id = p_user AND exercise_name = p_name AND log_date = p_day
+    FOR UPDATE;
+
+    SELECT MAX(weight_kg) AS max_weight, MAX(reps) AS best_reps, COUNT(*) AS total_sets,
+           COALESCE(SUM(weight_kg * reps), 0) AS volume_kg
+    INTO agg
+    FROM exercise_logs
+    WHERE user_id = p_user AND exercise_name = p_name
+          AND logged_at >= p_day AND logged_at < p_day + 1;
+
+    IF agg.total_sets = 0 THEN
+        DELETE FROM exercise_daily_stats
+        WHERE user_id = p_user AND exercise_name = p_name AND log_date = p_day;
+    ELSE
+        INSERT INTO exercise_daily_stats (user_id, exercise_name, log_date, max_weight, best_reps, total_sets, volume_kg)
+        VALUES (p_user, p_name, p_day, agg.max_weight, agg.best_reps, agg.total_sets, agg.volume_kg)
+        ON CONFLICT (user_id, exercise_name, log_date) DO UPDATE
+        SET max_weight = EXCLUDED.max_weight, best_reps = EXCLUDED.best_reps,
+            total_sets = EXCLUDED.total_sets, volume_kg = EXCLUDED.volume_kg,
+            change_xid = EXCLUDED.change_xid;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Inserts fold into the day's row; updates and deletes recompute the day(s)
+-- they touched, since a max can go down. Every path restamps change_xid.
+CREATE OR REPLACE FUNCTION exercise_logs_daily_stats() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        IF NEW.user_id IS NOT NULL THEN
+            INSERT INTO exercise_daily_stats AS s (user_id, exercise_name, log_date, max_weight, best_reps, total_sets, volume_kg)
+            VALUES (NEW.user_id, NEW.exercise_name, DATE(NEW.logged_at), NEW.weight_kg, NEW.reps, 1,
+                    COALESCE(NEW.weight_kg * NEW.reps, 0))
+            ON CONFLICT (user_id, exercise_name, log_date) DO UPDATE
+            SET max_weight = GREATEST(s.max_weight, EXCLUDED.max_weight),
+                best_reps = GREATEST(s.best_reps, EXCLUDED.best_reps),
+                total_sets = s.total_sets + 1,
+                volume_kg = s.volume_kg + EXCLUDED.volume_kg,
+                change_xid = EXCLUDED.change_xid;
+        END IF;
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'UPDATE'
+       AND (NEW.user_id, NEW.exercise_name, DATE(NEW.logged_at), NEW.weight_kg, NEW.reps)
+           IS NOT DISTINCT FROM (OLD.user_id, OLD.exercise_name, DATE(OLD.logged_at), OLD.weight_kg, OLD.reps) THEN
+        -- Aggregates unchanged (set_number, rpe or time of day): only restamp the day
+        UPDATE exercise_daily_stats SET change_xid = pg_current_xact_id()::text::bigint
+        WHERE user_id = NEW.user_id AND exercise_name = NEW.exercise_name AND log_date = DATE(NEW.logged_at);
+        RETURN NULL;
+    END IF;
+
+    IF OLD.user_id IS NOT NULL THEN
+        PERFORM refresh_exercise_daily_stats(OLD.user_id, OLD.exercise_name, DATE(OLD.logged_at));
+    END IF;
+    IF TG_OP = 'UPDATE' AND NEW.user_id IS NOT NULL
+       AND (NEW.user_id, NEW.exercise_name, DATE(NEW.logged_at))
+           IS DISTINCT FROM (OLD.user_id, OLD.exercise_name, DATE(OLD.logged_at)) THEN
+        PERFORM refresh_exercise_daily_stats(NEW.user_id, NEW.exercise_name, DATE(NEW.logged_at));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_exercise_logs_daily_stats
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, exercise_name, set_number, weight_kg, reps, rpe, logged_at
+    ON exercise_logs
+    FOR EACH ROW EXECUTE FUNCTION exercise_logs_daily_stats();
+
+-- The record values one set counts towards. e1rm is Epley (a single is its own 1RM).
+CREATE OR REPLACE FUNCTION personal_record_values(
+    p_weight DECIMAL, p_reps INT, p_distance DECIMAL, p_duration INT
+) RETURNS TABLE (record_type VARCHAR, value DECIMAL) AS $$
+    SELECT t.record_type, t.value
+    FROM (VALUES
+        ('max_weight'::varchar, p_weight),
+        ('e1rm', CASE WHEN p_reps = 1 THEN p_weight
+                      WHEN p_reps > 1 THEN ROUND(p_weight * (1 + p_reps / 30.0), 1) END),
+        ('max_reps', p_reps::decimal),
+        ('max_distance', p_distance),
+        ('max_duration', p_duration::decimal)
+    ) AS t(record_type, value)
+    WHERE t.value > 0
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Recompute every record for one user/exercise from exercise_logs. Ties go
+-- to the heavier, then higher-rep, then earlier set.
+CREATE OR REPLACE FUNCTION refresh_personal_records(p_user UUID, p_name VARCHAR)
+RETURNS void AS $$
+BEGIN
+    PERFORM 1 FROM personal_records
+    WHERE user_id = p_user AND exercise_name = p_name
+    FOR UPDATE;
+    DELETE FROM personal_records WHERE user_id = p_user AND exercise_name = p_name;
+    INSERT INTO personal_records (user_id, exercise_name, record_type, value, weight_kg, reps, log_id, achieved_at)
+    SELECT DISTINCT ON (r.record_type)
+           p_user, p_name, r.record_type, r.value, l.weight_kg, l.reps, l.id, l.logged_at
+    FROM exercise_logs l,
+         personal_record_values(l.weight_kg, l.reps, l.distance_m, l.duration_seconds) r
+    WHERE l.user_id = p_user AND l.exercise_name = p_name
+    ORDER BY r.record_type, r.value DESC, COALESCE(l.weight_kg, 0) DESC, COALESCE(l.reps, 0) DESC, l.logged_at, l.id;
+
+    DELETE FROM rep_records WHERE user_id = p_user AND exercise_name = p_name;
+    INSERT INTO rep_records (user_id, exercise_name, weight_kg, reps, log_id, achieved_at)
+    SELECT DISTINCT ON (COALESCE(l.weight_kg, 0))
+           p_user, p_name, COALESCE(l.weight_kg, 0), l.reps, l.id, l.logged_at
+    FROM exercise_logs l
+    WHERE l.user_id = p_user AND l.exercise_name = p_name AND l.reps > 0
+    ORDER BY COALESCE(l.weight_kg, 0), l.reps DESC, l.logged_at, l.id;
+END;
+$$ LANGUAGE plpgsql;
+
+-- A new or edited set raises any record it beats. Editing or deleting the
+-- set that holds a record recomputes that exercise's records.
+CREATE OR REPLACE FUNCTION exercise_logs_personal_records() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.user_id IS NOT NULL AND (EXISTS (
+        SELECT 1 FROM personal_records
+        WHERE user_id = OLD.user_id AND exercise_name = OLD.exercise_name AND log_id = OLD.id
+    ) OR EXISTS (
+        SELECT 1 FROM rep_records
+        WHERE user_id = OLD.user_id AND exercise_name = OLD.exercise_name
+              AND weight_kg = COALESCE(OLD.weight_kg, 0) AND log_id = OLD.id
+    )) THEN
+        PERFORM refresh_personal_records(OLD.user_id, OLD.exercise_name);
+        IF TG_OP = 'DELETE' OR (NEW.user_id, NEW.exercise_name) IS NOT DISTINCT FROM (OLD.user_id, OLD.exercise_name) THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    IF TG_OP <> 'DELETE' AND NEW.user_id IS NOT NULL THEN
+        INSERT INTO personal_records AS pr (user_id, exercise_name, record_type, value, weight_kg, reps, log_id, achieved_at)
+        SELECT NEW.user_id, NEW.exercise_name, r.record_type, r.value, NEW.weight_kg, NEW.reps, NEW.id, NEW.logged_at
+        FROM personal_record_values(NEW.weight_kg, NEW.reps, NEW.distance_m, NEW.duration_seconds) r
+        ON CONFLICT (user_id, exercise_name, record_type) DO UPDATE
+        SET value = EXCLUDED.value, weight_kg = EXCLUDED.weight_kg, reps = EXCLUDED.reps,
+            log_id = EXCLUDED.log_id, achieved_at = EXCLUDED.achieved_at
+        WHERE (EXCLUDED.value, COALESCE(EXCLUDED.weight_kg, 0), COALESCE(EXCLUDED.reps, 0))
+              > (pr.value, COALESCE(pr.weight_kg, 0), COALESCE(pr.reps, 0));
+
+        IF NEW.reps > 0 THEN
+            INSERT INTO rep_records AS rr (user_id, exercise_name, weight_kg, reps, log_id, achieved_at)
+            VALUES (NEW.user_id, NEW.exercise_name, COALESCE(NEW.weight_kg, 0), NEW.reps, NEW.id, NEW.logged_at)
+            ON CONFLICT (user_id, exercise_name, weight_kg) DO UPDATE
+            SET reps = EXCLUDED.reps, log_id = EXCLUDED.log_id, achieved_at = EXCLUDED.achieved_at
+            WHERE EXCLUDED.reps > rr.reps;
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_exercise_logs_personal_records
+    AFTER INSERT OR DELETE OR UPDATE OF user_id, exercise_name, weight_kg, reps, distance_m, duration_seconds
+    ON exercise_logs
+    FOR EACH ROW EXECUTE FUNCTION exercise_logs_personal_records();
+
+-- Delta sync (/api/sync, see app.routes.sync). Inserts and updates stamp the
+-- row with the writing transaction's id; deletes leave a tombstone. Rows
+-- written before this existed keep change_xid 0 and are never re-sent.
+ALTER TABLE profiles ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE workout_sessions ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE workout_sessions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+ALTER TABLE exercise_logs ADD COLUMN IF NOT EXISTS change_xid BIGINT NOT NULL DEFAULT 0;
+ALTER TABLE exercise_logs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ DEFAULT NOW();
+CREATE INDEX IF NOT EXISTS idx_sessions_sync ON workout_sessions(user_id, change_xid);
+CREATE INDEX IF NOT EXISTS idx_exercise_logs_sync ON exercise_logs(user_id, change_xid);
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    user_id UUID NOT NULL,
+    entity VARCHAR(20) NOT NULL,
+    entity_id UUID NOT NULL,
+    change_xid BIGINT NOT NULL DEFAULT pg_current_xact_id()::text::bigint,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_user ON sync_tombstones(user_id, change_xid);
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_deleted ON sync_tombstones(deleted_at);
+
+CREATE OR REPLACE FUNCTION sync_stamp() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    NEW.updated_at := NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- TG_ARGV[0] is the entity name the client sees in the tombstone
+CREATE OR REPLACE FUNCTION sync_tombstone() RETURNS trigger AS $$
+BEGIN
+    IF OLD.user_id IS NOT NULL THEN
+        INSERT INTO sync_tombstones (user_id, entity, entity_id) VALUES (OLD.user_id, TG_ARGV[0], OLD.id);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_profiles_sync_stamp
+    BEFORE INSERT OR UPDATE ON profiles
+    FOR EACH ROW EXECUTE FUNCTION sync_stamp();
+CREATE OR REPLACE TRIGGER trg_workout_sessions_sync_stamp
+    BEFORE INSERT OR UPDATE ON workout_sessions
+    FOR EACH ROW EXECUTE FUNCTION sync_stamp();
+CREATE OR REPLACE TRIGGER trg_exercise_logs_sync_stamp
+    BEFORE INSERT OR UPDATE ON exercise_logs
+    FOR EACH ROW EXECUTE FUNCTION sync_stamp();
+CREATE OR REPLACE TRIGGER trg_workout_sessions_sync_tombstone
+    AFTER DELETE ON workout_sessions
+    FOR EACH ROW EXECUTE FUNCTION sync_tombstone('session');
+CREATE OR REPLACE TRIGGER trg_exercise_logs_sync_tombstone
+    AFTER DELETE ON exercise_logs
+    FOR EACH ROW EXECUTE FUNCTION sync_tombstone('log');
+
+-- Tells every API process to drop its cached reads of the user's sessions
+-- (app/session_cache.py). Sent on commit, whichever process made the change.
+CREATE OR REPLACE FUNCTION notify_session_change() RETURNS trigger AS $$
+DECLARE
+    uid UUID := COALESCE(NEW.user_id, OLD.user_id);
+BEGIN
+    IF uid IS NOT NULL THEN
+        PERFORM pg_notify('session_changes', uid::text);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_workout_sessions_notify
+    AFTER INSERT OR UPDATE OR DELETE ON workout_sessions
+    FOR EACH ROW EXECUTE FUNCTION notify_session_change();
 """
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     app.state.pool = await asyncpg.create_pool(dsn=settings.DATABASE_URL)
-    from app.seed_exercises import seed_exercises
+    from app.seed_exercises import migrate_legacy_aliases, seed_exercises
+    from app.exercise_catalog import catalog
+    from app.daily_stats import backfill_daily_stats
+    from app.personal_records import backfill_personal_records
+    from app.idempotency import purge_expired_keys
+    from app.routes.sync import purge_tombstones, purge_tombstones_daily
+    from app.partitioning import maintain_partitions
+    from app.session_migration import migrate_v1_sessions
+    from app.session_cache import session_cache
 
     async with app.state.pool.acquire() as conn:
         await conn.execute(_SCHEMA_SQL)
+        await migrate_legacy_aliases(conn)
         await seed_exercises(conn)
+        await catalog.load(conn)
+        await backfill_daily_stats(conn)
+        await backfill_personal_records(conn)
+        await purge_expired_keys(conn)
+        await purge_tombstones(conn)
         # Dev user seeding moved to infra/scripts/dev-seed.sql
         # Run manually for local dev: psql -f infra/scripts/dev-seed.sql
+    partition_task = asyncio.create_task(maintain_partitions(app.state.pool))
+    tombstone_task = asyncio.create_task(purge_tombstones_daily(app.state.pool))
+    migration_task = asyncio.create_task(migrate_v1_sessions(app.state.pool))
+    cache_task = asyncio.create_task(session_cache.listen(settings.DATABASE_URL))
     agent, mcp_tool = await create_agent()
     app.state.agent = agent
     app.state.mcp_tool = mcp_tool
     yield
+    partition_task.cancel()
+    tombstone_task.cancel()
+    migration_task.cancel()
+    cache_task.cancel()
     await app.state.mcp_tool.close()
     await app.state.pool.close()
 
@@ -137,6 +572,7 @@ app.include_router(chat_router)
 app.include_router(sessions_router)
 app.include_router(exercises_router)
 app.include_router(voice_router)
+app.include_router(sync_router)
 
 
 @app.get("/health")
@@ -9,8 +9,11 @@ import asyncpg
 from fastmcp import FastMCP
 from googleapiclient.discovery import build as build_google_client
 
+from app.analytics import progress_analytics
 from app.config import settings
-from app.exercise_resolver import resolve_exercise_name
+from app.exercise_catalog import catalog
+from app.exercise_resolver import resolve_exercise_name, resolve_exercise_names
+from app.personal_records import get_personal_records as fetch_personal_records
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
 logger = logging.getLogger("mcp.tools")
@@ -37,6 +40,8 @@ async def _get_pool() -> asyncpg.Pool:
     global _pool
     if _pool is None:
         _pool = await asyncpg.create_pool(dsn=settings.DATABASE_URL)
+        async with _pool.acquire() as conn:
+            await catalog.load(conn)
     return _pool
 
 
@@ -77,11 +82,13 @@ def _normalise_session_groups(session: dict) -> tuple[list[dict], int]:
 
 
 async def _resolve_exercises_in_groups(conn, groups: list[dict]) -> None:
-    """Resolve exercise names to canonical forms within exercise groups."""
-    for group in groups:
-        for exercise in group.get("exercises", []):
-            if exercise.get("name"):
-                exercise["name"] = await resolve_exercise_name(conn, exercise["name"])
+    """Resolve exercise names to canonical forms within exercise groups (one bulk lookup)."""
+    exercises = [ex for g in groups for ex in g.get("exercises", []) if ex.get("name")]
+    if not exercises:
+        return
+    resolved = await resolve_exercise_names(conn, [ex["name"] for ex in exercises])
+    for exercise in exercises:
+        exercise["name"] = resolved[exercise["name"]]
 
 
 @mcp.tool()
@@ -142,7 +149,7 @@ async def get_exercise_history(
     logger.info("[get_exercise_history] user_id=%s, exercise=%s, limit=%d", user_id, exercise_name, limit)
     pool = await _get_pool()
     async with pool.acquire() as conn:
-        resolved = await resolve_exercise_name(conn, exercise_name)
+        resolved = await resolve_exercise_name(conn, exercise_name, uuid.UUID(user_id))
         rows = await conn.fetch(
             """SELECT weight_kg, reps, rpe, logged_at
                FROM exercise_logs
@@ -170,6 +177,47 @@ async def get_exercise_history(
     }
 
 
+@mcp.tool()
+async def get_personal_records(user_id: str, exercise_names: list[str] | None = None) -> dict:
+    """Retrieve a user's best-ever marks per exercise: max_weight (with the reps
+    done at it), e1rm (estimated one-rep max), max_reps (most reps in any set),
+    reps_at_weight (the most reps done at each weight, heaviest first), and for
+    cardio max_distance (metres) and max_duration (seconds). Pass exercise_names to
+    limit the lookup; omit it for every exercise the user has logged.
+    Much cheaper than reading full history when you only need current bests."""
+    logger.info("[get_personal_records] user_id=%s, exercises=%s", user_id, exercise_names)
+    uid = uuid.UUID(user_id)
+    pool = await _get_pool()
+    async with pool.acquire() as conn:
+        names = None
+        if exercise_names:
+            resolved = await resolve_exercise_names(conn, exercise_names, uid)
+            names = list(dict.fromkeys(resolved.values()))
+        records = await fetch_personal_records(conn, uid, names)
+    if not records:
+        return {"records": {}, "note": "No personal records yet. The user has not logged these exercises."}
+    logger.info("[get_personal_records] returning records for %d exercises", len(records))
+    return {"records": records}
+
+
+@mcp.tool()
+async def get_progress_analytics(user_id: str, days: int = 180) -> dict:
+    """Summarise a user's training over the last `days` (default 180, 7-730) in one call.
+    Per exercise: sessions, latest_e1rm and best_e1rm (estimated one-rep max, kg),
+    e1rm_trend_kg_per_week, rpe_drift_per_week (rising RPE with a flat e1RM
+    suggests fatigue) and plateau (3+ sessions in the last 4 weeks without a new
+    best). Also weekly_volume: kg lifted (weight x reps) and sets per muscle
+    group per week. Use this instead of reading history exercise by exercise."""
+    logger.info("[get_progress_analytics] user_id=%s, days=%d", user_id, days)
+    pool = await _get_pool()
+    async with pool.acquire() as conn:
+        summary = await progress_analytics(conn, uuid.UUID(user_id), days)
+    if not summary["exercises"]:
+        summary["note"] = "No weighted sets logged in this window."
+    logger.info("[get_progress_analytics] returning %d exercises", len(summary["exercises"]))
+    return summary
+
+
 def _youtube_search(api_key: str, query: str, max_results: int = 1) -> list[dict]:
     """Synchronous YouTube Data API v3 search (called via run_in_executor)."""
     youtube = build_google_client("youtube", "v3", developerKey=api_key)
@@ -317,19 +365,22 @@ async def save_workout_plan(user_id: str, week_start: str, sessions: list[dict])
                 json.dumps(plan_data),
             )
 
+            # Normalise to exercise_groups format
+            to_create = []
             for session in plan_data.get("sessions", []):
                 day_name = session.get("day", "").strip().lower()
                 offset = _DAY_OFFSETS.get(day_name)
                 if offset is None:
                     logger.warning("[save_workout_plan] unrecognised day '%s', skipping session", session.get("day"))
                     continue
-                scheduled = start + timedelta(days=offset)
-                session_id = uuid.uuid4()
-
-                # Normalise to exercise_groups format
                 exercise_groups, schema_version = _normalise_session_groups(session)
-                await _resolve_exercises_in_groups(conn, exercise_groups)
+                to_create.append((session, start + timedelta(days=offset), exercise_groups, schema_version))
 
+            # Resolve every exercise name in the plan in one go
+            await _resolve_exercises_in_groups(conn, [g for _, _, groups, _ in to_create for g in groups])
+
+            for session, scheduled, exercise_groups, schema_version in to_create:
+                session_id = uuid.uuid4()
                 await conn.execute(
                     """INSERT INTO workout_sessions
                        (id, user_id, plan_id, scheduled_date, title, exercises, schema_version)
@@ -0,0 +1,155 @@
+"""Monthly range partitioning of exercise_logs on logged_at.
+
+New databases create exercise_logs partitioned (main._SCHEMA_SQL, and
+infra/scripts/seed.sql for docker-compose); older ones keep a plain table
+until migrated. Partitions are named exercise_logs_YYYY_MM
+(UTC months) plus exercise_logs_default for anything outside them. Startup
+and a daily background task keep PARTITION_MONTHS_AHEAD future months ready.
+
+History queries that filter on logged_at only touch the months they cover,
+and an old month can be detached as a standalone table to archive or drop.
+Detaching doesn't fire the exercise_logs triggers, so progress charts
+(exercise_daily_stats) and personal records keep the detached data.
+
+Routes don't change, with one caveat: set numbers are unique per partition
+rather than table-wide (a unique index on the parent would have to include
+logged_at). Only two sets logged at the same moment across a month boundary
+could collide.
+
+    cd backend && python -m app.partitioning migrate
+    cd backend && python -m app.partitioning ensure
+    cd backend && python -m app.partitioning detach --before 2025-01
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date, datetime
+
+import asyncpg
+
+from app.config import settings
+
+logger = logging.getLogger("partitioning")
+
+PARTITION_MONTHS_AHEAD = 3
+_MAINTENANCE_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Swap the plain table for a partitioned copy: partitions for every month that
+# has data, the rows themselves, then the old table goes. Indexes, triggers and
+# the remaining constraints come from re-running the schema afterwards. The
+# copy runs before any trigger exists, so change_xid and updated_at are kept
+# and the rollups aren't recomputed.
+_MIGRATE_SQL = """
+ALTER TABLE exercise_logs RENAME TO exercise_logs_unpartitioned;
+ALTER INDEX exercise_logs_pkey RENAME TO exercise_logs_unpartitioned_pkey;
+CREATE TABLE exercise_logs (LIKE exercise_logs_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)
+    PARTITION BY RANGE (logged_at);
+ALTER TABLE exercise_logs
+    ALTER COLUMN logged_at SET NOT NULL,
+    ADD PRIMARY KEY (id, logged_at),
+    ADD FOREIGN KEY (user_id) REFERENCES profiles(id),
+    ADD FOREIGN KEY (session_id) REFERENCES workout_sessions(id);
+SELECT ensure_exercise_logs_partitions(0);
+SELECT create_exercise_logs_partition(m::date)
+FROM generate_series(
+    date_trunc('month', (SELECT MIN(logged_at) FROM exercise_logs_unpartitioned) AT TIME ZONE 'UTC'),
+    date_trunc('month', NOW() AT TIME ZONE 'UTC'),
+    INTERVAL '1 month'
+) AS m;
+INSERT INTO exercise_logs SELECT * FROM exercise_logs_unpartitioned;
+DROP TABLE exercise_logs_unpartitioned;
+"""
+
+
+async def is_partitioned(conn: asyncpg.Connection) -> bool:
+    return await conn.fetchval("SELECT relkind = 'p' FROM pg_class WHERE oid = 'exercise_logs'::regclass")
+
+
+async def ensure_partitions(conn: asyncpg.Connection) -> int:
+    """Create any missing partitions up to PARTITION_MONTHS_AHEAD. Returns the count."""
+    created = await conn.fetchval("SELECT ensure_exercise_logs_partitions($1)", PARTITION_MONTHS_AHEAD)
+    if created:
+        logger.info("Created %d exercise_logs partitions", created)
+    return created
+
+
+async def maintain_partitions(pool: asyncpg.Pool) -> None:
+    """Background task: run ensure_partitions daily for the life of the app."""
+    while True:
+        await asyncio.sleep(_MAINTENANCE_INTERVAL_SECONDS)
+        try:
+            async with pool.acquire() as conn:
+                await ensure_partitions(conn)
+        except Exception:
+            logger.exception("exercise_logs partition maintenance failed")
+
+
+async def migrate_to_partitioned(conn: asyncpg.Connection) -> int:
+    """Convert a plain exercise_logs to the partitioned layout. Returns rows moved.
+
+    Runs in one transaction holding an exclusive lock on exercise_logs, so stop
+    the app (or expect log writes to wait) while it runs.
+    """
+    from app.main import _SCHEMA_SQL
+
+    async with conn.transaction():
+        if await is_partitioned(conn):
+            logger.info("exercise_logs is already partitioned")
+            return 0
+        await conn.execute("LOCK TABLE exercise_logs IN ACCESS EXCLUSIVE MODE")
+        missing = await conn.fetchval("SELECT COUNT(*) FROM exercise_logs WHERE logged_at IS NULL")
+        if missing:
+            raise RuntimeError(f"{missing} exercise_logs rows have no logged_at; set it before migrating")
+        count = await conn.fetchval("SELECT COUNT(*) FROM exercise_logs")
+        # The partition functions come from the schema; make sure they're current
+        await conn.execute(_SCHEMA_SQL)
+        await conn.execute(_MIGRATE_SQL)
+        await conn.execute(_SCHEMA_SQL)
+    logger.info("Moved %d exercise_logs rows into monthly partitions", count)
+    return count
+
+
+async def detach_partitions(conn: asyncpg.Connection, before: date) -> list[str]:
+    """Detach every monthly partition for a month before ``before``'s month.
+
+    The detached tables keep their names and data; archive (pg_dump -t) or
+    drop them afterwards. Returns the detached table names.
+    """
+    rows = await conn.fetch(
+        """SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+           WHERE i.inhparent = 'exercise_logs'::regclass AND c.relname ~ '^exercise_logs_[0-9]{4}_[0-9]{2}$'
+           ORDER BY c.relname"""
+    )
+    cutoff = f"exercise_logs_{before:%Y_%m}"
+    detached = [r["relname"] for r in rows if r["relname"] < cutoff]
+    for name in detached:
+        await conn.execute(f'ALTER TABLE exercise_logs DETACH PARTITION "{name}"')
+        logger.info("Detached %s", name)
+    return detached
+
+
+async def main(args: argparse.Namespace) -> None:
+    conn = await asyncpg.connect(dsn=settings.DATABASE_URL)
+    try:
+        if args.command == "migrate":
+            print(f"Moved {await migrate_to_partitioned(conn)} rows")
+        elif args.command == "ensure":
+            print(f"Created {await ensure_partitions(conn)} partitions")
+        else:
+            detached = await detach_partitions(conn, args.before)
+            print(f"Detached {len(detached)} partitions: {', '.join(detached) or '-'}")
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="convert a plain exercise_logs table to monthly partitions")
+    sub.add_parser("ensure", help=f"create partitions up to {PARTITION_MONTHS_AHEAD} months ahead")
+    detach = sub.add_parser("detach", help="detach monthly partitions older than a month")
+    detach.add_argument(
+        "--before", required=True, type=lambda v: datetime.strptime(v, "%Y-%m").date(),
+        help="first month to keep (YYYY-MM)",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,133 @@
+"""Personal records lookups and rebuilds.
+
+personal_records holds one row per user/exercise/record_type and
+rep_records the most reps at each weight. Both are kept current by the
+exercise_logs trigger in main._SCHEMA_SQL, so lookups are primary-key reads
+rather than a scan of the user's history. Rebuild them after backfills,
+bulk imports or manual data fixes.
+
+    cd backend && python -m app.personal_records [--user USER_ID]
+"""
+import argparse
+import asyncio
+import logging
+import uuid
+
+import asyncpg
+
+from app.config import settings
+
+logger = logging.getLogger("personal_records")
+
+_REBUILD_SQL = """
+INSERT INTO personal_records (user_id, exercise_name, record_type, value, weight_kg, reps, log_id, achieved_at)
+SELECT DISTINCT ON (l.user_id, l.exercise_name, r.record_type)
+       l.user_id, l.exercise_name, r.record_type, r.value, l.weight_kg, l.reps, l.id, l.logged_at
+FROM exercise_logs l,
+     personal_record_values(l.weight_kg, l.reps, l.distance_m, l.duration_seconds) r
+WHERE l.user_id IS NOT NULL AND ($1::uuid IS NULL OR l.user_id = $1)
+ORDER BY l.user_id, l.exercise_name, r.record_type,
+         r.value DESC, COALESCE(l.weight_kg, 0) DESC, COALESCE(l.reps, 0) DESC, l.logged_at, l.id
+"""
+
+_REBUILD_REPS_SQL = """
+INSERT INTO rep_records (user_id, exercise_name, weight_kg, reps, log_id, achieved_at)
+SELECT DISTINCT ON (l.user_id, l.exercise_name, COALESCE(l.weight_kg, 0))
+       l.user_id, l.exercise_name, COALESCE(l.weight_kg, 0), l.reps, l.id, l.logged_at
+FROM exercise_logs l
+WHERE l.user_id IS NOT NULL AND l.reps > 0 AND ($1::uuid IS NULL OR l.user_id = $1)
+ORDER BY l.user_id, l.exercise_name, COALESCE(l.weight_kg, 0), l.reps DESC, l.logged_at, l.id
+"""
+
+# Rep records are listed with the other records as 'reps_at_weight', heaviest first
+_LOOKUP_SQL = """
+SELECT exercise_name, record_type, value, weight_kg, reps, achieved_at
+FROM personal_records
+WHERE user_id = $1 AND ($2::text[] IS NULL OR exercise_name = ANY($2))
+UNION ALL
+SELECT exercise_name, 'reps_at_weight', reps, weight_kg, reps, achieved_at
+FROM rep_records
+WHERE user_id = $1 AND ($2::text[] IS NULL OR exercise_name = ANY($2))
+ORDER BY exercise_name, record_type, weight_kg DESC
+"""
+
+
+async def get_personal_records(
+    conn: asyncpg.Connection, user_id: uuid.UUID, exercise_names: list[str] | None = None
+) -> dict[str, dict[str, dict]]:
+    """Return {exercise_name: {record_type: record}} for a user.
+
+    Each record has value, weight_kg, reps and achieved_at (the set that set
+    it). 'reps_at_weight' is instead a list of records, one per weight
+    (heaviest first, bodyweight at 0). Pass canonical exercise_names to limit
+    the lookup; None means all.
+    """
+    rows = await conn.fetch(_LOOKUP_SQL, user_id, exercise_names)
+    records: dict[str, dict] = {}
+    for r in rows:
+        record = {
+            "value": float(r["value"]),
+            "weight_kg": float(r["weight_kg"]) if r["weight_kg"] is not None else None,
+            "reps": r["reps"],
+            "achieved_at": r["achieved_at"].isoformat(),
+        }
+        by_type = records.setdefault(r["exercise_name"], {})
+        if r["record_type"] == "reps_at_weight":
+            by_type.setdefault("reps_at_weight", []).append(record)
+        else:
+            by_type[r["record_type"]] = record
+    return records
+
+
+async def rebuild_personal_records(conn: asyncpg.Connection, user_id: uuid.UUID | None = None) -> int:
+    """Recompute records for one user (or everyone). Returns the row count.
+
+    Blocks writes to exercise_logs for the duration so the trigger can't
+    interleave with the rebuild.
+    """
+    async with conn.transaction():
+        await conn.execute("LOCK TABLE exercise_logs IN SHARE MODE")
+        await conn.execute(
+            "DELETE FROM personal_records WHERE $1::uuid IS NULL OR user_id = $1",
+            user_id,
+        )
+        status = await conn.execute(_REBUILD_SQL, user_id)
+        await conn.execute(
+            "DELETE FROM rep_records WHERE $1::uuid IS NULL OR user_id = $1",
+            user_id,
+        )
+        rep_status = await conn.execute(_REBUILD_REPS_SQL, user_id)
+    count = int(status.split()[-1])
+    logger.info(
+        "Rebuilt %d personal_records and %s rep_records rows (user=%s)",
+        count, rep_status.split()[-1], user_id or "all",
+    )
+    return count
+
+
+async def backfill_personal_records(conn: asyncpg.Connection) -> None:
+    """Populate the tables on first startup after each was introduced."""
+    needed = await conn.fetchval(
+        """SELECT CASE WHEN EXISTS (SELECT 1 FROM personal_records)
+                       THEN NOT EXISTS (SELECT 1 FROM rep_records)
+                            AND EXISTS (SELECT 1 FROM exercise_logs WHERE reps > 0)
+                       ELSE EXISTS (SELECT 1 FROM exercise_logs) END"""
+    )
+    if needed:
+        await rebuild_personal_records(conn)
+
+
+async def main(user_id: uuid.UUID | None) -> None:
+    conn = await asyncpg.connect(dsn=settings.DATABASE_URL)
+    try:
+        count = await rebuild_personal_records(conn, user_id)
+    finally:
+        await conn.close()
+    print(f"Rebuilt {count} personal_records rows")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", type=uuid.UUID, help="only rebuild this user's rows")
+    args = parser.parse_args()
+    asyncio.run(main(args.user))
@@ -1,14 +1,33 @@
+import hashlib
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import asyncpg
+import numpy as np
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, ConfigDict
 from pydantic.alias_generators import to_camel
 
+from app.analytics import MAX_WINDOW_DAYS, MIN_WINDOW_DAYS, progress_analytics
 from app.auth import get_current_user
 from app.db import get_db, fetch_one, fetch_all, execute
-from app.exercise_resolver import resolve_exercise_name
+from app.downsample import lttb_indices
+from app.etags import history_fingerprint, make_etag, not_modified
+from app.idempotency import MAX_KEY_LENGTH, claim_key, store_response
+from app.personal_records import get_personal_records
+from app.exercise_resolver import (
+    REMEMBERED_TIERS,
+    correct_resolution,
+    forget_resolution,
+    insert_exercises,
+    list_resolutions,
+    remember_resolutions,
+    resolve_exercise,
+    resolve_exercise_name,
+    resolve_exercise_names,
+    resolve_exercise_tiers,
+)
 
 router = APIRouter(prefix="/api/exercises", tags=["exercises"])
 
@@ -26,6 +45,30 @@ class LogSetRequest(BaseModel):
     notes: str | None = None
 
 
+class BatchSet(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+    exercise_name: str
+    weight_kg: float | None = None
+    reps: int | None = None
+    rpe: float | None = None
+    distance_m: float | None = None
+    duration_seconds: int | None = None
+    round_number: int | None = None
+    notes: str | None = None
+
+
+class LogSetBatchRequest(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+    session_id: str
+    sets: list[BatchSet]
+
+
+class ResolutionRequest(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+    raw_name: str
+    exercise_name: str
+
+
 class LogSetUpdate(BaseModel):
     model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
     weight_kg: float | None = None
@@ -69,39 +112,190 @@ async def _validate_session(conn, session_id: uuid.UUID, user_id: uuid.UUID, req
     return row
 
 
+# Validates the session, numbers the set and inserts it in one statement. The
+# session row is always returned (when it exists) so the caller can tell a
+# foreign/missing session (404) from one that isn't in progress (400); the
+# log columns are NULL when nothing was inserted. lock_session_set_numbers
+# serializes numbering per (session, exercise) across partitions; the
+# per-partition set-number unique index is a backstop, so a duplicate fails
+# with a unique violation (and _insert_set retries) instead of being stored.
+_LOG_SET_SQL = """
+WITH s AS (
+    SELECT user_id, status FROM workout_sessions WHERE id = $1
+), ins AS (
+    INSERT INTO exercise_logs (user_id, session_id, exercise_name, set_number, weight_kg, reps, rpe, distance_m, duration_seconds, round_number, notes)
+    SELECT $2, $1, $3::text,
+           (SELECT COALESCE(MAX(max_set), 0) + 1 FROM lock_session_set_numbers($1, ARRAY[$3::text])),
+           $4::numeric, $5::int, $6::numeric, $7::numeric, $8::int, $9::int, $10::text
+    FROM s
+    WHERE s.user_id = $2 AND s.status = 'in_progress'
+    RETURNING *
+)
+SELECT s.user_id AS session_user_id, s.status AS session_status, ins.*
+FROM s LEFT JOIN ins ON true
+"""
+
+_SET_NUMBER_ATTEMPTS = 5
+
+
+async def _insert_set(conn, *args: object, savepoint: bool = False) -> dict | None:
+    """Run _LOG_SET_SQL, retrying when a concurrent insert took the same set number.
+
+    Inside a transaction pass savepoint=True so a failed attempt doesn't abort it.
+    """
+    for attempt in range(_SET_NUMBER_ATTEMPTS):
+        try:
+            if not savepoint:
+                return await fetch_one(conn, _LOG_SET_SQL, *args)
+            async with conn.transaction():
+                return await fetch_one(conn, _LOG_SET_SQL, *args)
+        except asyncpg.UniqueViolationError:
+            if attempt == _SET_NUMBER_ATTEMPTS - 1:
+                raise
+    return None
+
+
+async def _log_set(conn, user_id: uuid.UUID, body: LogSetRequest, exercise_name: str, savepoint: bool = False) -> dict:
+    """Insert one set and return it in camelCase; 404/400 for a foreign or closed session."""
+    row = await _insert_set(
+        conn, uuid.UUID(body.session_id), user_id, exercise_name,
+        body.weight_kg, body.reps, body.rpe, body.distance_m, body.duration_seconds, body.round_number, body.notes,
+        savepoint=savepoint,
+    )
+    if not row or str(row["session_user_id"]) != str(user_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+    if row["id"] is None:
+        raise HTTPException(status_code=400, detail="Session is not in progress")
+    return _log_to_camel(row)
+
+
 @router.post("/log", status_code=status.HTTP_201_CREATED)
 async def create_exercise_log(
     body: LogSetRequest,
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=MAX_KEY_LENGTH),
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
 ):
+    """Log one set. With an Idempotency-Key header, a retry of the same request
+    returns the set logged the first time instead of logging it again.
+    """
     user_id = uuid.UUID(user["user_id"])
-    session_id = uuid.UUID(body.session_id)
-    await _validate_session(conn, session_id, user_id)
 
     # Resolve to canonical exercise name
-    resolved_name = await resolve_exercise_name(conn, body.exercise_name)
+    resolved_name, tier = await resolve_exercise(conn, body.exercise_name, user_id, auto_insert=False)
+    if tier == "unmatched":
+        # A new name becomes an exercise only once the set can be logged
+        await _validate_session(conn, uuid.UUID(body.session_id), user_id)
+        await insert_exercises(conn, [resolved_name])
+        tier = "inserted"
+
+    if idempotency_key is None:
+        response = await _log_set(conn, user_id, body, resolved_name)
+    else:
+        request_hash = hashlib.sha256(body.model_dump_json().encode()).hexdigest()
+        async with conn.transaction():
+            stored = await claim_key(conn, user_id, idempotency_key, request_hash)
+            if stored is not None:
+                if stored["request_hash"] != request_hash:
+                    raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+                return stored["response"]
+            # An error rolls back the claim too, so the client can retry with the same key
+            response = await _log_set(conn, user_id, body, resolved_name, savepoint=True)
+            await store_response(conn, user_id, idempotency_key, response)
+
+    # Logging against a fuzzy match or a new name confirms it; remember it for
+    # this user (correctable through /api/exercises/resolutions)
+    if tier in REMEMBERED_TIERS:
+        await remember_resolutions(conn, user_id, {body.exercise_name: resolved_name})
+
+    return response
+
+
+# Numbers each set after the highest existing set for its exercise in the
+# session (read under the same locks as _LOG_SET_SQL), in request order. ids are generated by the caller so the returned
+# rows can be put back in request order (RETURNING order is not guaranteed).
+_LOG_SET_BATCH_SQL = """
+INSERT INTO exercise_logs (id, user_id, session_id, exercise_name, set_number, weight_kg, reps, rpe, distance_m, duration_seconds, round_number, notes)
+SELECT b.id, $1, $2, b.exercise_name,
+       COALESCE(m.max_set, 0) + ROW_NUMBER() OVER (PARTITION BY b.exercise_name ORDER BY b.ord),
+       b.weight_kg, b.reps, b.rpe, b.distance_m, b.duration_seconds, b.round_number, b.notes
+FROM unnest($3::uuid[], $4::text[], $5::numeric[], $6::int[], $7::numeric[], $8::numeric[], $9::int[], $10::int[], $11::text[])
+     WITH ORDINALITY AS b(id, exercise_name, weight_kg, reps, rpe, distance_m, duration_seconds, round_number, notes, ord)
+LEFT JOIN lock_session_set_numbers($2, $4::text[]) m ON m.exercise = b.exercise_name
+RETURNING *
+"""
+
+_MAX_BATCH_SETS = 200
+
+
+@router.post("/log/batch", status_code=status.HTTP_201_CREATED)
+async def create_exercise_logs_batch(
+    body: LogSetBatchRequest,
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Log many sets (any mix of exercises) for one session in a single transaction.
 
-    # Auto-calculate set_number
-    result = await fetch_one(
-        conn,
-        "SELECT COALESCE(MAX(set_number), 0) + 1 AS next_set FROM exercise_logs WHERE session_id = $1 AND exercise_name = $2",
-        session_id,
-        resolved_name,
-    )
-    set_number = result["next_set"]
+    Returns the created logs in request order.
+    """
+    if not body.sets:
+        raise HTTPException(status_code=400, detail="No sets to log")
+    if len(body.sets) > _MAX_BATCH_SETS:
+        raise HTTPException(status_code=400, detail=f"At most {_MAX_BATCH_SETS} sets per batch")
 
-    log_id = uuid.uuid4()
-    await execute(
-        conn,
-        """INSERT INTO exercise_logs (id, user_id, session_id, exercise_name, set_number, weight_kg, reps, rpe, distance_m, duration_seconds, round_number, notes)
-           VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)""",
-        log_id, user_id, session_id, resolved_name, set_number,
-        body.weight_kg, body.reps, body.rpe, body.distance_m, body.duration_seconds, body.round_number, body.notes,
-    )
-
-    row = await fetch_one(conn, "SELECT * FROM exercise_logs WHERE id = $1", log_id)
-    return _log_to_camel(row)
+    user_id = uuid.UUID(user["user_id"])
+    session_id = uuid.UUID(body.session_id)
+    resolved = await resolve_exercise_tiers(conn, [s.exercise_name for s in body.sets], user_id, auto_insert=False)
+    new_names = list(dict.fromkeys(name for name, tier in resolved.values() if tier == "unmatched"))
+    log_ids = [uuid.uuid4() for _ in body.sets]
+
+    for attempt in range(_SET_NUMBER_ATTEMPTS):
+        try:
+            async with conn.transaction():
+                # Lock the session so its status can't change under the batch
+                row = await fetch_one(
+                    conn,
+                    "SELECT user_id, status FROM workout_sessions WHERE id = $1 FOR UPDATE",
+                    session_id,
+                )
+                if not row or str(row["user_id"]) != str(user_id):
+                    raise HTTPException(status_code=404, detail="Session not found")
+                if row["status"] != "in_progress":
+                    raise HTTPException(status_code=400, detail="Session is not in progress")
+
+                if new_names:
+                    await insert_exercises(conn, new_names)
+                rows = await fetch_all(
+                    conn, _LOG_SET_BATCH_SQL, user_id, session_id, log_ids,
+                    [resolved[s.exercise_name][0] for s in body.sets],
+                    [s.weight_kg for s in body.sets],
+                    [s.reps for s in body.sets],
+                    [s.rpe for s in body.sets],
+                    [s.distance_m for s in body.sets],
+                    [s.duration_seconds for s in body.sets],
+                    [s.round_number for s in body.sets],
+                    [s.notes for s in body.sets],
+                )
+            break
+        except asyncpg.UniqueViolationError:
+            # A single-set log landed on one of our set numbers; renumber and retry
+            if attempt == _SET_NUMBER_ATTEMPTS - 1:
+                raise
+
+    # New names were inserted above, so they're remembered like single-set inserts
+    await remember_resolutions(conn, user_id, {
+        raw: canonical for raw, (canonical, tier) in resolved.items() if tier in REMEMBERED_TIERS or tier == "unmatched"
+    })
+
+    by_id = {r["id"]: r for r in rows}
+    return [_log_to_camel(by_id[log_id]) for log_id in log_ids]
+
+
+_LIST_LOGS_SQL = """
+SELECT * FROM exercise_logs
+WHERE session_id = $1 AND exercise_name = $2 AND user_id = $3
+ORDER BY set_number
+"""
 
 
 @router.get("/log")
@@ -115,16 +309,51 @@ async def list_exercise_logs(
     sid = uuid.UUID(session_id)
     await _validate_session(conn, sid, user_id, require_in_progress=False)
 
-    rows = await fetch_all(
-        conn,
-        """SELECT * FROM exercise_logs
-           WHERE session_id = $1 AND exercise_name = $2 AND user_id = $3
-           ORDER BY set_number""",
-        sid, exercise_name, user_id,
-    )
+    rows = await fetch_all(conn, _LIST_LOGS_SQL, sid, exercise_name, user_id)
     return [_log_to_camel(r) for r in rows]
 
 
+# Session ownership check and every log in one round trip; a session with no
+# logs comes back as a single row of NULL log columns.
+_SESSION_LOGS_SQL = """
+SELECT l.*
+FROM workout_sessions s
+LEFT JOIN exercise_logs l ON l.session_id = s.id AND l.user_id = s.user_id
+WHERE s.id = $1 AND s.user_id = $2
+ORDER BY l.exercise_name, l.set_number
+"""
+
+
+def group_logs_by_exercise(rows: list[dict]) -> dict[str, list[dict]]:
+    """{exercise_name: [camelCase logs by set number]} from rows ordered by name, set."""
+    grouped: dict[str, list[dict]] = {}
+    for r in rows:
+        if r["id"] is not None:
+            grouped.setdefault(r["exercise_name"], []).append(_log_to_camel(r))
+    return grouped
+
+
+async def fetch_session_logs(conn, session_id: uuid.UUID, user_id: uuid.UUID) -> dict[str, list[dict]] | None:
+    """Every log in a session grouped by exercise, or None if it isn't the user's."""
+    rows = await fetch_all(conn, _SESSION_LOGS_SQL, session_id, user_id)
+    if not rows:
+        return None
+    return group_logs_by_exercise(rows)
+
+
+@router.get("/log/session/{session_id}")
+async def list_session_logs(
+    session_id: uuid.UUID,
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Every log in a session as {exerciseName: [sets]}, for opening a workout in one request."""
+    logs = await fetch_session_logs(conn, session_id, uuid.UUID(user["user_id"]))
+    if logs is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return logs
+
+
 @router.patch("/log/{log_id}")
 async def update_exercise_log(
     log_id: uuid.UUID,
@@ -214,63 +443,238 @@ async def list_logged_exercise_names(
     return [r["exercise_name"] for r in rows]
 
 
-@router.get("/history")
-async def exercise_history(
-    exercise_name: str = Query(...),
-    days: int = Query(default=90),
+@router.get("/resolutions")
+async def get_resolutions(
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """The user's remembered name mappings (fuzzy matches and new names they logged)."""
+    rows = await list_resolutions(conn, uuid.UUID(user["user_id"]))
+    return [
+        {"rawName": r["raw_key"], "exerciseName": r["exercise_name"], "updatedAt": r["updated_at"].isoformat()}
+        for r in rows
+    ]
+
+
+@router.put("/resolutions")
+async def put_resolution(
+    body: ResolutionRequest,
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Map a raw name to an existing exercise for this user, replacing any remembered match."""
+    if not body.raw_name.strip():
+        raise HTTPException(status_code=400, detail="rawName is required")
+    stored = await correct_resolution(conn, uuid.UUID(user["user_id"]), body.raw_name, body.exercise_name)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return {"rawName": body.raw_name.strip().lower(), "exerciseName": stored}
+
+
+@router.delete("/resolutions", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resolution(
+    raw_name: str = Query(..., min_length=1),
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
 ):
+    """Forget a remembered mapping so the name is matched afresh."""
+    if not await forget_resolution(conn, uuid.UUID(user["user_id"]), raw_name):
+        raise HTTPException(status_code=404, detail="Resolution not found")
+
+
+_RECORD_KEYS = {
+    "max_weight": "maxWeight",
+    "e1rm": "e1rm",
+    "max_reps": "maxReps",
+    "max_distance": "maxDistance",
+    "max_duration": "maxDuration",
+}
+
+
+def _record_to_camel(r: dict) -> dict:
+    return {"value": r["value"], "weightKg": r["weight_kg"], "reps": r["reps"], "achievedAt": r["achieved_at"]}
+
+
+@router.get("/records")
+async def list_personal_records(
+    exercise_name: str | None = Query(default=None),
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Best-ever marks per exercise (all exercises unless exercise_name is given)."""
     user_id = uuid.UUID(user["user_id"])
-    resolved_name = await resolve_exercise_name(conn, exercise_name)
+    names = None
+    if exercise_name is not None:
+        names = [await resolve_exercise_name(conn, exercise_name, user_id)]
+
+    records = await get_personal_records(conn, user_id, names)
+    return [
+        {
+            "exerciseName": name,
+            "records": {
+                _RECORD_KEYS[record_type]: _record_to_camel(r)
+                for record_type, r in by_type.items()
+                if record_type != "reps_at_weight"
+            },
+            "repsAtWeight": [_record_to_camel(r) for r in by_type.get("reps_at_weight", [])],
+        }
+        for name, by_type in records.items()
+    ]
+
+
+@router.get("/analytics")
+async def exercise_analytics(
+    days: int = Query(default=180, ge=MIN_WINDOW_DAYS, le=MAX_WINDOW_DAYS),
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """e1RM trends, RPE drift and plateaus per exercise plus weekly volume per muscle group."""
+    summary = await progress_analytics(conn, uuid.UUID(user["user_id"]), days)
+    return {
+        "windowDays": summary["window_days"],
+        "exercises": [
+            {
+                "exerciseName": e["exercise_name"],
+                "muscleGroup": e["muscle_group"],
+                "sessions": e["sessions"],
+                "latestE1rm": e["latest_e1rm"],
+                "bestE1rm": e["best_e1rm"],
+                "e1rmTrendKgPerWeek": e["e1rm_trend_kg_per_week"],
+                "rpeDriftPerWeek": e["rpe_drift_per_week"],
+                "plateau": e["plateau"],
+            }
+            for e in summary["exercises"]
+        ],
+        "weeklyVolume": [
+            {
+                "weekStart": w["week_start"],
+                "muscleGroup": w["muscle_group"],
+                "volumeKg": w["volume_kg"],
+                "sets": w["sets"],
+            }
+            for w in summary["weekly_volume"]
+        ],
+    }
 
-    rows = await fetch_all(
-        conn,
-        """SELECT DATE(logged_at) AS session_date,
-                  MAX(weight_kg) AS max_weight,
-                  MAX(reps) AS best_reps,
-                  COUNT(*) AS total_sets
-           FROM exercise_logs
-           WHERE user_id = $1 AND exercise_name = $2
-                 AND logged_at >= NOW() - INTERVAL '1 day' * $3
-           GROUP BY DATE(logged_at)
-           ORDER BY session_date""",
-        user_id, resolved_name, days,
-    )
+
+def _history_series(name: str, rows: list[dict], max_points: int | None) -> dict:
+    """Build a /history response from exercise_daily_stats rows (oldest first).
+
+    ``max_points`` thins long windows with LTTB on max weight, keeping the
+    first, last and heaviest days.
+    """
+    if max_points is not None and len(rows) > max_points:
+        keep = lttb_indices(
+            np.array([r["session_date"].toordinal() for r in rows]),
+            np.array([float(r["max_weight"] or 0) for r in rows]),
+            max_points,
+        )
+        rows = [rows[i] for i in keep]
     return {
-        "exerciseName": resolved_name,
+        "exerciseName": name,
         "dataPoints": [
             {
                 "date": r["session_date"].isoformat(),
                 "maxWeight": float(r["max_weight"]) if r["max_weight"] is not None else 0,
                 "bestReps": r["best_reps"],
                 "totalSets": r["total_sets"],
+                "volumeKg": float(r["volume_kg"]) if r.get("volume_kg") is not None else 0,
             }
             for r in rows
         ],
     }
 
 
-@router.get("/history/detail")
-async def exercise_history_detail(
+@router.get("/history")
+async def exercise_history(
+    request: Request,
+    response: Response,
     exercise_name: str = Query(...),
     days: int = Query(default=90),
+    max_points: int | None = Query(default=None, ge=3),
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
 ):
     user_id = uuid.UUID(user["user_id"])
-    resolved_name = await resolve_exercise_name(conn, exercise_name)
+    resolved_name = await resolve_exercise_name(conn, exercise_name, user_id)
+
+    fingerprint = await history_fingerprint(conn, user_id, resolved_name, days)
+    etag = make_etag(user_id, "history", resolved_name, days, max_points, fingerprint)
+    if cached := not_modified(request, response, etag):
+        return cached
 
     rows = await fetch_all(
         conn,
-        """SELECT DATE(logged_at) AS session_date, set_number, weight_kg, reps, rpe
-           FROM exercise_logs
+        """SELECT log_date AS session_date, max_weight, best_reps, total_sets, volume_kg
+           FROM exercise_daily_stats
            WHERE user_id = $1 AND exercise_name = $2
-                 AND logged_at >= NOW() - INTERVAL '1 day' * $3
-           ORDER BY session_date, set_number""",
+                 AND log_date >= DATE(NOW() - INTERVAL '1 day' * $3)
+           ORDER BY log_date""",
         user_id, resolved_name, days,
     )
+    return _history_series(resolved_name, rows, max_points)
 
+
+_MAX_BATCH_HISTORY = 50
+
+
+@router.get("/history/batch")
+async def exercise_history_batch(
+    exercise_names: list[str] = Query(...),
+    days: int = Query(default=90),
+    max_points: int | None = Query(default=None, ge=3),
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """/history for several exercises at once, in request order.
+
+    Names are resolved in bulk and every series comes from one query. Names
+    that resolve to the same exercise share one series.
+    """
+    if len(exercise_names) > _MAX_BATCH_HISTORY:
+        raise HTTPException(status_code=400, detail=f"At most {_MAX_BATCH_HISTORY} exercises per request")
+
+    user_id = uuid.UUID(user["user_id"])
+    resolved = await resolve_exercise_names(conn, exercise_names, user_id)
+    names = list(dict.fromkeys(resolved[n] for n in exercise_names))
+
+    rows = await fetch_all(
+        conn,
+        """SELECT exercise_name, log_date AS session_date, max_weight, best_reps, total_sets, volume_kg
+           FROM exercise_daily_stats
+           WHERE user_id = $1 AND exercise_name = ANY($2::text[])
+                 AND log_date >= DATE(NOW() - INTERVAL '1 day' * $3)
+           ORDER BY exercise_name, log_date""",
+        user_id, names, days,
+    )
+    by_name: dict[str, list[dict]] = {name: [] for name in names}
+    for r in rows:
+        by_name[r["exercise_name"]].append(r)
+    return [_history_series(name, by_name[name], max_points) for name in names]
+
+
+# One page of days (newest first) from the rollup, then their sets. Keyset on
+# log_date so a day's sets never straddle two pages.
+_HISTORY_DETAIL_PAGE_SQL = """
+WITH days AS (
+    SELECT user_id, exercise_name, log_date
+    FROM exercise_daily_stats
+    WHERE user_id = $1 AND exercise_name = $2
+          AND log_date >= DATE(NOW() - INTERVAL '1 day' * $3)
+          AND ($4::date IS NULL OR log_date < $4)
+    ORDER BY log_date DESC
+    LIMIT $5
+)
+SELECT d.log_date AS session_date, l.set_number, l.weight_kg, l.reps, l.rpe
+FROM days d
+JOIN exercise_logs l
+  ON l.user_id = d.user_id AND l.exercise_name = d.exercise_name
+     AND l.logged_at >= d.log_date AND l.logged_at < d.log_date + 1
+ORDER BY d.log_date DESC, l.set_number
+"""
+
+
+def _group_sets_by_day(rows: list[dict]) -> list[dict]:
     from itertools import groupby
     from operator import itemgetter
 
@@ -286,5 +690,51 @@ async def exercise_history_detail(
             for r in group
         ]
         result.append({"date": date_val.isoformat(), "sets": sets})
-
     return result
+
+
+@router.get("/history/detail")
+async def exercise_history_detail(
+    request: Request,
+    response: Response,
+    exercise_name: str = Query(...),
+    days: int = Query(default=90),
+    limit: int | None = Query(default=None, ge=1, le=100),
+    before: date | None = Query(default=None),
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Per-set history grouped by day.
+
+    Without ``limit`` returns every day in the window, oldest first. With
+    ``limit`` returns ``{"days": [...], "nextCursor": ...}`` holding at most
+    ``limit`` days, newest first; pass ``nextCursor`` back as ``before`` to get
+    the next (older) page. ``nextCursor`` is null on the last page.
+    """
+    user_id = uuid.UUID(user["user_id"])
+    resolved_name = await resolve_exercise_name(conn, exercise_name, user_id)
+
+    fingerprint = await history_fingerprint(conn, user_id, resolved_name, days)
+    etag = make_etag(user_id, "history_detail", resolved_name, days, limit, before, fingerprint)
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    if limit is not None:
+        rows = await fetch_all(conn, _HISTORY_DETAIL_PAGE_SQL, user_id, resolved_name, days, before, limit)
+        page = _group_sets_by_day(rows)
+        next_cursor = page[-1]["date"] if len(page) == limit else None
+        return {"days": page, "nextCursor": next_cursor}
+
+    rows = await fetch_all(
+        conn,
+        """SELECT d.log_date AS session_date, l.set_number, l.weight_kg, l.reps, l.rpe
+           FROM exercise_daily_stats d
+           JOIN exercise_logs l
+             ON l.user_id = d.user_id AND l.exercise_name = d.exercise_name
+                AND l.logged_at >= d.log_date AND l.logged_at < d.log_date + 1
+           WHERE d.user_id = $1 AND d.exercise_name = $2
+                 AND d.log_date >= DATE(NOW() - INTERVAL '1 day' * $3)
+           ORDER BY d.log_date, l.set_number""",
+        user_id, resolved_name, days,
+    )
+    return _group_sets_by_day(rows)
@@ -1,11 +1,17 @@
 import json
 import uuid
+from collections import OrderedDict
 from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from app.auth import get_current_user
 from app.db import get_db, fetch_one, fetch_all, execute
+from app.etags import make_etag, not_modified, schedule_fingerprint, session_fingerprint
+from app.routes.exercises import fetch_session_logs, group_logs_by_exercise
+from app.session_cache import session_cache
+from app.session_migration import v1_to_groups
+from app.session_states import apply_transition
 
 router = APIRouter(prefix="/api", tags=["sessions"])
 
@@ -28,72 +34,81 @@ def _exercise_to_camel(ex: dict) -> dict:
     return result
 
 
+# Optional timer fields in output order: (camelCase, snake_case). Stored
+# configs use either spelling (agent output is snake_case, app edits are
+# camelCase); camelCase wins when a config somehow carries both.
+_TIMER_FIELDS = (
+    ("restSeconds", "rest_seconds"),
+    ("warmupRestSeconds", "warmup_rest_seconds"),
+    ("intervalSeconds", "interval_seconds"),
+    ("totalRounds", "total_rounds"),
+    ("timeLimitSeconds", "time_limit_seconds"),
+    ("workSeconds", "work_seconds"),
+    ("circuitRestSeconds", "circuit_rest_seconds"),
+    ("roundRestSeconds", "round_rest_seconds"),
+    ("rounds", "rounds"),
+    ("prepCountdownSeconds", "prep_countdown_seconds"),
+)
+
+
 def _timer_config_to_camel(tc: dict) -> dict:
     """Convert a timer_config dict from snake_case to camelCase."""
-    return {
-        "mode": tc.get("mode", "standard"),
-        **({"restSeconds": tc["rest_seconds"]} if "rest_seconds" in tc else {}),
-        **({"restSeconds": tc["restSeconds"]} if "restSeconds" in tc else {}),
-        **({"warmupRestSeconds": tc["warmup_rest_seconds"]} if "warmup_rest_seconds" in tc else {}),
-        **({"warmupRestSeconds": tc["warmupRestSeconds"]} if "warmupRestSeconds" in tc else {}),
-        **({"intervalSeconds": tc["interval_seconds"]} if "interval_seconds" in tc else {}),
-        **({"intervalSeconds": tc["intervalSeconds"]} if "intervalSeconds" in tc else {}),
-        **({"totalRounds": tc["total_rounds"]} if "total_rounds" in tc else {}),
-        **({"totalRounds": tc["totalRounds"]} if "totalRounds" in tc else {}),
-        **({"timeLimitSeconds": tc["time_limit_seconds"]} if "time_limit_seconds" in tc else {}),
-        **({"timeLimitSeconds": tc["timeLimitSeconds"]} if "timeLimitSeconds" in tc else {}),
-        **({"workSeconds": tc["work_seconds"]} if "work_seconds" in tc else {}),
-        **({"workSeconds": tc["workSeconds"]} if "workSeconds" in tc else {}),
-        **({"circuitRestSeconds": tc["circuit_rest_seconds"]} if "circuit_rest_seconds" in tc else {}),
-        **({"circuitRestSeconds": tc["circuitRestSeconds"]} if "circuitRestSeconds" in tc else {}),
-        **({"roundRestSeconds": tc["round_rest_seconds"]} if "round_rest_seconds" in tc else {}),
-        **({"roundRestSeconds": tc["roundRestSeconds"]} if "roundRestSeconds" in tc else {}),
-        **({"rounds": tc["rounds"]} if "rounds" in tc else {}),
-        **({"prepCountdownSeconds": tc["prep_countdown_seconds"]} if "prep_countdown_seconds" in tc else {}),
-        **({"prepCountdownSeconds": tc["prepCountdownSeconds"]} if "prepCountdownSeconds" in tc else {}),
-    }
+    result = {"mode": tc.get("mode", "standard")}
+    for camel, snake in _TIMER_FIELDS:
+        if camel in tc:
+            result[camel] = tc[camel]
+        elif snake in tc:
+            result[camel] = tc[snake]
+    return result
 
 
 def _group_to_camel(g: dict) -> dict:
     """Convert an exercise group dict to camelCase."""
-    return {
+    result = {
         "groupId": g.get("group_id", g.get("groupId", "")),
         "groupType": g.get("group_type", g.get("groupType", "single")),
         "timerConfig": _timer_config_to_camel(g.get("timer_config", g.get("timerConfig", {"mode": "standard"}))),
         "exercises": [_exercise_to_camel(ex) for ex in g.get("exercises", [])],
-        **({"notes": g["notes"]} if g.get("notes") else {}),
     }
+    if g.get("notes"):
+        result["notes"] = g["notes"]
+    return result
 
 
-def _flat_exercises_to_groups(exercises: list[dict]) -> list[dict]:
-    """Transform a flat v1 exercises list into exerciseGroups format (camelCase)."""
-    groups = []
-    for ex in exercises:
-        groups.append({
-            "groupId": str(uuid.uuid4()),
-            "groupType": "single",
-            "timerConfig": {"mode": "standard", "restSeconds": 90},
-            "exercises": [_exercise_to_camel(ex)],
-        })
-    return groups
+def _groups_to_camel(session_id: uuid.UUID, exercises_raw: list | None, schema_version: int) -> list[dict]:
+    if exercises_raw and schema_version < 2:
+        # v1 row the background migration hasn't reached yet; same groups it will write
+        exercises_raw = v1_to_groups(session_id, exercises_raw)
+    return [_group_to_camel(g) for g in exercises_raw or []]
 
 
-def _to_camel(row: dict) -> dict:
-    """Convert a workout_sessions DB row to camelCase JSON."""
-    exercises_raw = row.get("exercises")
-    if isinstance(exercises_raw, str):
-        exercises_raw = json.loads(exercises_raw)
+# Converted exercise groups keyed by the stored JSON text. A week reload after
+# one session changes finds the other six here, skipping json.loads and the
+# conversion. Entries are shared between responses, so treat them as read-only.
+_GROUPS_MEMO_MAX = 1024
+_groups_memo: OrderedDict[tuple, list[dict]] = OrderedDict()
 
-    schema_version = row.get("schema_version") or 1
 
-    if schema_version >= 2 and exercises_raw:
-        # Data is already in exercise_groups format (snake_case from agent) — convert to camelCase
-        exercise_groups = [_group_to_camel(g) for g in exercises_raw]
-    elif exercises_raw:
-        # v1 flat exercises — wrap into single-exercise groups
-        exercise_groups = _flat_exercises_to_groups(exercises_raw)
+def _exercise_groups(row: dict) -> list[dict]:
+    exercises_raw = row.get("exercises")
+    schema_version = row.get("schema_version") or 1
+    if not isinstance(exercises_raw, str):
+        return _groups_to_camel(row["id"], exercises_raw, schema_version)
+    key = (row["id"], schema_version, exercises_raw)
+    groups = _groups_memo.get(key)
+    if groups is None:
+        groups = _groups_to_camel(row["id"], json.loads(exercises_raw), schema_version)
+        _groups_memo[key] = groups
+        if len(_groups_memo) > _GROUPS_MEMO_MAX:
+            _groups_memo.popitem(last=False)
     else:
-        exercise_groups = []
+        _groups_memo.move_to_end(key)
+    return groups
+
+
+def _to_camel(row: dict) -> dict:
+    """Convert a workout_sessions DB row to camelCase JSON."""
+    exercise_groups = _exercise_groups(row)
 
     return {
         "id": str(row["id"]),
@@ -111,6 +126,8 @@ def _to_camel(row: dict) -> dict:
 
 @router.get("/sessions")
 async def list_sessions(
+    request: Request,
+    response: Response,
     week_start: date = Query(..., description="Monday of the target week (YYYY-MM-DD)"),
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
@@ -119,22 +136,86 @@ async def list_sessions(
     user_id = uuid.UUID(user["user_id"])
     week_end = week_start + timedelta(days=6)
 
-    rows = await fetch_all(
-        conn,
-        """SELECT id, user_id, plan_id, scheduled_date, title, status,
-                  exercises, started_at, completed_at, created_at, schema_version
-           FROM workout_sessions
-           WHERE user_id = $1 AND scheduled_date BETWEEN $2 AND $3
-           ORDER BY scheduled_date""",
-        user_id,
-        week_start,
-        week_end,
-    )
-    return [_to_camel(r) for r in rows]
+    async def fingerprint() -> str:
+        return await schedule_fingerprint(conn, user_id, week_start, week_end)
+
+    async def load() -> list[dict]:
+        rows = await fetch_all(
+            conn,
+            """SELECT id, user_id, plan_id, scheduled_date, title, status,
+                      exercises, started_at, completed_at, created_at, schema_version
+               FROM workout_sessions
+               WHERE user_id = $1 AND scheduled_date BETWEEN $2 AND $3
+               ORDER BY scheduled_date""",
+            user_id,
+            week_start,
+            week_end,
+        )
+        return [_to_camel(r) for r in rows]
+
+    return await session_cache.serve(request, response, user_id, ("sessions", week_start), fingerprint, load)
+
+
+_MAX_CALENDAR_DAYS = 366
+
+# One slim row per session. The exercise count is taken from the JSONB in SQL,
+# so the column itself never leaves the database.
+_CALENDAR_SQL = """
+SELECT id, scheduled_date, title, status,
+       CASE WHEN COALESCE(schema_version, 1) >= 2
+            THEN (SELECT COALESCE(SUM(jsonb_array_length(g->'exercises')), 0)::int
+                  FROM jsonb_array_elements(exercises) g)
+            ELSE jsonb_array_length(exercises)
+       END AS exercise_count
+FROM workout_sessions
+WHERE user_id = $1 AND scheduled_date BETWEEN $2 AND $3
+ORDER BY scheduled_date
+"""
+
+
+# Declared before /sessions/{session_id} so "calendar" isn't parsed as an id
+@router.get("/sessions/calendar")
+async def session_calendar(
+    request: Request,
+    response: Response,
+    start_date: date = Query(..., description="First day of the range (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Last day of the range, inclusive"),
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Id, date, title, status and exercise count of every session in a date range.
+
+    For month and quarter views: one small query instead of a full-week
+    fetch per week. Ranges are limited to a year.
+    """
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    if (end_date - start_date).days >= _MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {_MAX_CALENDAR_DAYS} days per request")
+    user_id = uuid.UUID(user["user_id"])
+
+    fingerprint = await schedule_fingerprint(conn, user_id, start_date, end_date)
+    etag = make_etag(user_id, "calendar", start_date, end_date, fingerprint)
+    if cached := not_modified(request, response, etag):
+        return cached
+
+    rows = await fetch_all(conn, _CALENDAR_SQL, user_id, start_date, end_date)
+    return [
+        {
+            "id": str(r["id"]),
+            "scheduledDate": r["scheduled_date"].isoformat(),
+            "title": r["title"],
+            "status": r["status"],
+            "exerciseCount": r["exercise_count"],
+        }
+        for r in rows
+    ]
 
 
 @router.get("/sessions/{session_id}")
 async def get_session(
+    request: Request,
+    response: Response,
     session_id: uuid.UUID,
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
@@ -142,6 +223,58 @@ async def get_session(
     """Return a single workout session by ID."""
     user_id = uuid.UUID(user["user_id"])
 
+    async def fingerprint() -> str:
+        fingerprint = await session_fingerprint(conn, session_id, user_id)
+        if fingerprint is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return fingerprint
+
+    async def load() -> dict:
+        row = await fetch_one(
+            conn,
+            """SELECT id, user_id, plan_id, scheduled_date, title, status,
+                      exercises, started_at, completed_at, created_at, schema_version
+               FROM workout_sessions
+               WHERE id = $1 AND user_id = $2""",
+            session_id,
+            user_id,
+        )
+        if not row:
+            raise HTTPException(status_code=404, detail="Session not found")
+        return _to_camel(row)
+
+    return await session_cache.serve(request, response, user_id, ("session", session_id), fingerprint, load)
+
+
+_DELETE_SESSION_LOGS_SQL = "DELETE FROM exercise_logs WHERE session_id = $1"
+
+# Each exercise's sets from the most recent other session it was logged in.
+# The lateral lookup walks idx_exercise_logs_lookup backwards, one row per name.
+_PREVIOUS_SETS_SQL = """
+SELECT l.*
+FROM unnest($2::text[]) AS n(exercise_name)
+CROSS JOIN LATERAL (
+    SELECT session_id FROM exercise_logs
+    WHERE user_id = $1 AND exercise_name = n.exercise_name AND session_id <> $3
+    ORDER BY logged_at DESC
+    LIMIT 1
+) p
+JOIN exercise_logs l ON l.session_id = p.session_id AND l.exercise_name = n.exercise_name
+ORDER BY l.exercise_name, l.set_number
+"""
+
+
+@router.get("/sessions/{session_id}/workout")
+async def get_workout(
+    session_id: uuid.UUID,
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Everything the workout screen needs when it opens: the session, its logs
+    by exercise, and each exercise's sets from the last time it was done.
+    """
+    user_id = uuid.UUID(user["user_id"])
+
     row = await fetch_one(
         conn,
         """SELECT id, user_id, plan_id, scheduled_date, title, status,
@@ -153,7 +286,19 @@ async def get_session(
     )
     if not row:
         raise HTTPException(status_code=404, detail="Session not found")
-    return _to_camel(row)
+    session = _to_camel(row)
+
+    logs = await fetch_session_logs(conn, session_id, user_id) or {}
+
+    # Plan names are canonicalised when the plan is saved, so they match log names
+    planned = [ex["name"] for g in session["exerciseGroups"] for ex in g["exercises"] if ex["name"]]
+    names = list(dict.fromkeys(planned + list(logs)))
+    previous_sets = {}
+    if names:
+        rows = await fetch_all(conn, _PREVIOUS_SETS_SQL, user_id, names, session_id)
+        previous_sets = group_logs_by_exercise(rows)
+
+    return {"session": session, "logs": logs, "previousSets": previous_sets}
 
 
 @router.post("/sessions/{session_id}/start")
@@ -162,30 +307,8 @@ async def start_session(
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
 ):
-    user_id = uuid.UUID(user["user_id"])
-    row = await fetch_one(
-        conn,
-        "SELECT * FROM workout_sessions WHERE id = $1 AND user_id = $2",
-        session_id, user_id,
-    )
-    if not row:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if row["status"] != "scheduled":
-        raise HTTPException(status_code=400, detail=f"Cannot start session with status '{row['status']}'")
-
-    await execute(
-        conn,
-        "UPDATE workout_sessions SET status = 'in_progress', started_at = NOW() WHERE id = $1",
-        session_id,
-    )
-    updated = await fetch_one(
-        conn,
-        """SELECT id, user_id, plan_id, scheduled_date, title, status,
-                  exercises, started_at, completed_at, created_at, schema_version
-           FROM workout_sessions WHERE id = $1""",
-        session_id,
-    )
-    return _to_camel(updated)
+    row = await apply_transition(conn, session_id, uuid.UUID(user["user_id"]), "start")
+    return _to_camel(row)
 
 
 @router.post("/sessions/{session_id}/complete")
@@ -194,30 +317,8 @@ async def complete_session(
     user: dict = Depends(get_current_user),
     conn=Depends(get_db),
 ):
-    user_id = uuid.UUID(user["user_id"])
-    row = await fetch_one(
-        conn,
-        "SELECT * FROM workout_sessions WHERE id = $1 AND user_id = $2",
-        session_id, user_id,
-    )
-    if not row:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if row["status"] != "in_progress":
-        raise HTTPException(status_code=400, detail=f"Cannot complete session with status '{row['status']}'")
-
-    await execute(
-        conn,
-        "UPDATE workout_sessions SET status = 'completed', completed_at = NOW() WHERE id = $1",
-        session_id,
-    )
-    updated = await fetch_one(
-        conn,
-        """SELECT id, user_id, plan_id, scheduled_date, title, status,
-                  exercises, started_at, completed_at, created_at, schema_version
-           FROM workout_sessions WHERE id = $1""",
-        session_id,
-    )
-    return _to_camel(updated)
+    row = await apply_transition(conn, session_id, uuid.UUID(user["user_id"]), "complete")
+    return _to_camel(row)
 
 
 @router.post("/sessions/{session_id}/reopen")
@@ -227,30 +328,8 @@ async def reopen_session(
     conn=Depends(get_db),
 ):
     """Reopen a completed session so the user can add/edit sets."""
-    user_id = uuid.UUID(user["user_id"])
-    row = await fetch_one(
-        conn,
-        "SELECT * FROM workout_sessions WHERE id = $1 AND user_id = $2",
-        session_id, user_id,
-    )
-    if not row:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if row["status"] != "completed":
-        raise HTTPException(status_code=400, detail=f"Cannot reopen session with status '{row['status']}'")
-
-    await execute(
-        conn,
-        "UPDATE workout_sessions SET status = 'in_progress', completed_at = NULL WHERE id = $1",
-        session_id,
-    )
-    updated = await fetch_one(
-        conn,
-        """SELECT id, user_id, plan_id, scheduled_date, title, status,
-                  exercises, started_at, completed_at, created_at, schema_version
-           FROM workout_sessions WHERE id = $1""",
-        session_id,
-    )
-    return _to_camel(updated)
+    row = await apply_transition(conn, session_id, uuid.UUID(user["user_id"]), "reopen")
+    return _to_camel(row)
 
 
 @router.post("/sessions/{session_id}/reset")
@@ -260,30 +339,8 @@ async def reset_session(
     conn=Depends(get_db),
 ):
     """Reset a session back to scheduled, clearing started_at and completed_at."""
-    user_id = uuid.UUID(user["user_id"])
-    row = await fetch_one(
-        conn,
-        "SELECT * FROM workout_sessions WHERE id = $1 AND user_id = $2",
-        session_id, user_id,
-    )
-    if not row:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if row["status"] == "scheduled":
-        raise HTTPException(status_code=400, detail="Session is already scheduled")
-
-    await execute(
-        conn,
-        "UPDATE workout_sessions SET status = 'scheduled', started_at = NULL, completed_at = NULL WHERE id = $1",
-        session_id,
-    )
-    updated = await fetch_one(
-        conn,
-        """SELECT id, user_id, plan_id, scheduled_date, title, status,
-                  exercises, started_at, completed_at, created_at, schema_version
-           FROM workout_sessions WHERE id = $1""",
-        session_id,
-    )
-    return _to_camel(updated)
+    row = await apply_transition(conn, session_id, uuid.UUID(user["user_id"]), "reset")
+    return _to_camel(row)
 
 
 @router.delete("/sessions/{session_id}")
@@ -302,8 +359,10 @@ async def delete_session(
     if not row:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    await execute(conn, "DELETE FROM exercise_logs WHERE session_id = $1", session_id)
+    await execute(conn, _DELETE_SESSION_LOGS_SQL, session_id)
     await execute(conn, "DELETE FROM workout_sessions WHERE id = $1", session_id)
+    # Don't wait for the notification to reach this process
+    session_cache.invalidate(user_id)
 
     return {
         "deleted": True,
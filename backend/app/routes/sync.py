@@ -0,0 +1,135 @@
+"""Delta sync for the mobile app.
+
+GET /api/sync?since=<cursor> returns the sessions, logs and profile changed
+after the cursor, the ids of sessions and logs deleted since then, and a new
+cursor to send next time.
+
+Rows are stamped with the id of the transaction that last wrote them
+(change_xid, set by the sync_stamp trigger). Transactions don't commit in id
+order, so "the highest id seen" would skip a slower transaction that commits
+later with a lower id. The cursor is instead the xmin of the snapshot that
+served the response: every transaction below it had finished, so it was
+either in that response or an earlier one, and anything at or above it is
+sent again next time. A row can therefore arrive twice; clients apply
+changes as upserts by id.
+
+A response with resync=true means the client should reload through the
+regular endpoints and continue from the returned cursor: on first use (no
+cursor), when the cursor predates TOMBSTONE_TTL, or when there are more
+changes than one response carries.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.auth import get_current_user
+from app.db import get_db, fetch_one, fetch_all
+from app.routes.exercises import _log_to_camel
+from app.routes.profile import _row_to_response
+from app.routes.sessions import _to_camel
+
+logger = logging.getLogger("sync")
+
+router = APIRouter(prefix="/api", tags=["sync"])
+
+TOMBSTONE_TTL = timedelta(days=30)
+_PURGE_INTERVAL_SECONDS = 24 * 60 * 60
+_MAX_SYNC_ROWS = 500
+
+# Each fetches one row more than a response carries, to detect overflow
+_SYNC_SESSIONS_SQL = """
+SELECT id, user_id, plan_id, scheduled_date, title, status,
+       exercises, started_at, completed_at, created_at, schema_version
+FROM workout_sessions
+WHERE user_id = $1 AND change_xid >= $2
+LIMIT $3
+"""
+
+_SYNC_LOGS_SQL = """
+SELECT * FROM exercise_logs
+WHERE user_id = $1 AND change_xid >= $2
+LIMIT $3
+"""
+
+
+def _encode_cursor(horizon: int, issued_at: datetime) -> str:
+    return f"{horizon}.{int(issued_at.timestamp())}"
+
+
+def _decode_cursor(cursor: str) -> tuple[int, datetime]:
+    try:
+        horizon, issued = cursor.split(".")
+        return int(horizon), datetime.fromtimestamp(int(issued), tz=timezone.utc)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+
+
+async def purge_tombstones(conn: asyncpg.Connection) -> int:
+    """Drop tombstones older than TOMBSTONE_TTL; older cursors get resync instead."""
+    status = await conn.execute(
+        "DELETE FROM sync_tombstones WHERE deleted_at < NOW() - $1::interval", TOMBSTONE_TTL
+    )
+    count = int(status.split()[-1])
+    if count:
+        logger.info("Purged %d sync tombstones", count)
+    return count
+
+
+async def purge_tombstones_daily(pool: asyncpg.Pool) -> None:
+    """Background task: run purge_tombstones daily for the life of the app."""
+    while True:
+        await asyncio.sleep(_PURGE_INTERVAL_SECONDS)
+        try:
+            async with pool.acquire() as conn:
+                await purge_tombstones(conn)
+        except Exception:
+            logger.exception("sync tombstone purge failed")
+
+
+@router.get("/sync")
+async def sync(
+    since: str | None = Query(default=None, description="cursor from the previous /sync response"),
+    user: dict = Depends(get_current_user),
+    conn=Depends(get_db),
+):
+    """Changes to the user's sessions, logs and profile since ``since``."""
+    user_id = uuid.UUID(user["user_id"])
+    since_xid, since_issued = _decode_cursor(since) if since is not None else (None, None)
+
+    # One snapshot for the horizon and every read below
+    async with conn.transaction(isolation="repeatable_read", readonly=True):
+        snap = await fetch_one(
+            conn, "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint AS horizon, NOW() AS now"
+        )
+        cursor = _encode_cursor(snap["horizon"], snap["now"])
+        if since_xid is None or since_issued < snap["now"] - TOMBSTONE_TTL:
+            return {"cursor": cursor, "resync": True}
+
+        sessions = await fetch_all(conn, _SYNC_SESSIONS_SQL, user_id, since_xid, _MAX_SYNC_ROWS + 1)
+        logs = await fetch_all(conn, _SYNC_LOGS_SQL, user_id, since_xid, _MAX_SYNC_ROWS + 1)
+        deleted = await fetch_all(
+            conn,
+            """SELECT entity, entity_id FROM sync_tombstones
+               WHERE user_id = $1 AND change_xid >= $2
+               LIMIT $3""",
+            user_id, since_xid, _MAX_SYNC_ROWS + 1,
+        )
+        if max(len(sessions), len(logs), len(deleted)) > _MAX_SYNC_ROWS:
+            return {"cursor": cursor, "resync": True}
+        profile = await fetch_one(
+            conn, "SELECT * FROM profiles WHERE id = $1 AND change_xid >= $2", user_id, since_xid
+        )
+
+    return {
+        "cursor": cursor,
+        "resync": False,
+        "profile": _row_to_response(profile).model_dump(by_alias=True) if profile else None,
+        "sessions": [_to_camel(r) for r in sessions],
+        "logs": [_log_to_camel(r) for r in logs],
+        "deletedSessionIds": [str(d["entity_id"]) for d in deleted if d["entity"] == "session"],
+        "deletedLogIds": [str(d["entity_id"]) for d in deleted if d["entity"] == "log"],
+    }
@@ -33,6 +33,14 @@ def _log_to_camel(row: dict) -> dict:
     }
 
 
+# Sets already logged for the exercise in this session, as context for parsing
+_SESSION_SETS_SQL = """
+SELECT weight_kg, reps, rpe FROM exercise_logs
+WHERE session_id = $1 AND exercise_name = $2
+ORDER BY set_number
+"""
+
+
 @router.post("/parse")
 async def voice_parse(
     audio: UploadFile = File(...),
@@ -56,7 +64,7 @@ async def voice_parse(
         raise HTTPException(status_code=400, detail="Session is not in progress")
 
     # Look up exercise category (cardio vs strength)
-    resolved_name = await resolve_exercise_name(conn, exercise_name)
+    resolved_name = await resolve_exercise_name(conn, exercise_name, user_id)
     ex_row = await fetch_one(
         conn,
         "SELECT category FROM exercises WHERE LOWER(name) = LOWER($1)",
@@ -95,13 +103,7 @@ async def voice_parse(
         return {"needsClarification": "Could not understand audio. Please try again."}
 
     # 2. Get previous sets for context
-    prev_rows = await fetch_all(
-        conn,
-        """SELECT weight_kg, reps, rpe FROM exercise_logs
-           WHERE session_id = $1 AND exercise_name = $2
-           ORDER BY set_number""",
-        sid, exercise_name,
-    )
+    prev_rows = await fetch_all(conn, _SESSION_SETS_SQL, sid, exercise_name)
     prev_sets = [
         {"weightKg": float(r["weight_kg"]) if r["weight_kg"] else 0, "reps": r["reps"], "rpe": float(r["rpe"]) if r.get("rpe") else None}
         for r in prev_rows
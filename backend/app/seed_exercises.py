@@ -2,6 +2,8 @@ import logging
 
 import asyncpg
 
+from app.exercise_catalog import catalog
+
 logger = logging.getLogger("seed_exercises")
 
 EXERCISES = [
@@ -86,20 +88,50 @@ EXERCISES = [
 ]
 
 
+async def migrate_legacy_aliases(conn: asyncpg.Connection) -> None:
+    """Copy aliases from the superseded exercises.aliases column, once.
+
+    Runs before seeding; once exercise_aliases has rows it has nothing to do.
+    """
+    if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM exercise_aliases)"):
+        return
+    result = await conn.execute(
+        """INSERT INTO exercise_aliases (alias, exercise_name)
+           SELECT a, e.name FROM exercises e, unnest(e.aliases) AS a
+           ON CONFLICT (LOWER(alias)) DO NOTHING"""
+    )
+    logger.info("Copied %d legacy aliases into exercise_aliases", int(result.split()[-1]))
+
+
 async def seed_exercises(conn: asyncpg.Connection) -> None:
-    """Insert canonical exercises on startup (ON CONFLICT DO NOTHING)."""
+    """Insert canonical exercises and their aliases on startup (ON CONFLICT DO NOTHING)."""
     inserted = 0
     for ex in EXERCISES:
         result = await conn.execute(
-            """INSERT INTO exercises (name, aliases, muscle_group, category, equipment)
-               VALUES ($1, $2, $3, $4, $5)
+            """INSERT INTO exercises (name, muscle_group, category, equipment)
+               VALUES ($1, $2, $3, $4)
                ON CONFLICT (name) DO NOTHING""",
             ex["name"],
-            ex["aliases"],
             ex["muscle_group"],
             ex["category"],
             ex["equipment"],
         )
         if result == "INSERT 0 1":
             inserted += 1
-    logger.info("Seeded %d new exercises (%d total in seed list)", inserted, len(EXERCISES))
+
+    aliases = [(alias, ex["name"]) for ex in EXERCISES for alias in ex["aliases"]]
+    result = await conn.execute(
+        """INSERT INTO exercise_aliases (alias, exercise_name)
+           SELECT * FROM unnest($1::text[], $2::text[])
+           ON CONFLICT (LOWER(alias)) DO NOTHING""",
+        [a for a, _ in aliases],
+        [n for _, n in aliases],
+    )
+    aliases_inserted = int(result.split()[-1])
+
+    if inserted or aliases_inserted:
+        catalog.invalidate()
+    logger.info(
+        "Seeded %d new exercises and %d new aliases (%d exercises in seed list)",
+        inserted, aliases_inserted, len(EXERCISES),
+    )
@@ -0,0 +1,163 @@
+"""Per-user cache of session reads, invalidated through LISTEN/NOTIFY.
+
+Sessions are written by this process's routes, by the MCP server and by
+background jobs. A trigger on workout_sessions (main._SCHEMA_SQL) sends the
+user's id on the session_changes channel when a change commits. Every API
+process listens on its own connection and drops that user's entries, so
+repeated week and session reads are served from memory without going stale
+after an agent edit.
+
+Entries are only served while the listener is connected: a dropped
+connection empties the cache and switches it off until the listener is
+back. A read that started before an invalidation isn't stored, so a slow
+request can't put pre-change data back. TTL bounds the damage of anything
+else that slips through.
+
+Invalidation generations are kept for the max_users most recently
+invalidated users. Users without one share a floor, which is raised to the
+generation of every entry dropped, so an outstanding token can't pass again
+once its user's entry is gone.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple
+
+import asyncpg
+from fastapi import Request, Response
+
+from app.etags import make_etag, not_modified
+
+logger = logging.getLogger("session_cache")
+
+CHANNEL = "session_changes"
+_RECONNECT_SECONDS = 5.0
+
+
+class Entry(NamedTuple):
+    etag: str
+    body: Any
+    stored_at: float
+
+
+class SessionCache:
+    """LRU of users, each holding their cached responses by key."""
+
+    def __init__(self, max_users: int = 1000, max_entries_per_user: int = 32, ttl: float = 300.0) -> None:
+        self.max_users = max_users
+        self.max_entries_per_user = max_entries_per_user
+        self.ttl = ttl
+        self.listening = False
+        self._users: OrderedDict[uuid.UUID, OrderedDict[Hashable, Entry]] = OrderedDict()
+        self._epoch = 0
+        self._clock = 0
+        self._floor = 0
+        self._generations: OrderedDict[uuid.UUID, int] = OrderedDict()
+
+    def token(self, user_id: uuid.UUID) -> tuple[int, int]:
+        """Taken before reading from the DB; put() refuses if it's outdated."""
+        return self._epoch, self._generations.get(user_id, self._floor)
+
+    def get(self, user_id: uuid.UUID, key: Hashable) -> Entry | None:
+        if not self.listening:
+            return None
+        entries = self._users.get(user_id)
+        entry = entries.get(key) if entries else None
+        if entry is None:
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl:
+            del entries[key]
+            return None
+        self._users.move_to_end(user_id)
+        entries.move_to_end(key)
+        return entry
+
+    def put(self, user_id: uuid.UUID, key: Hashable, token: tuple[int, int], etag: str, body: Any) -> Entry:
+        entry = Entry(etag, body, time.monotonic())
+        if not self.listening or token != self.token(user_id):
+            return entry
+        entries = self._users.setdefault(user_id, OrderedDict())
+        self._users.move_to_end(user_id)
+        entries[key] = entry
+        entries.move_to_end(key)
+        if len(entries) > self.max_entries_per_user:
+            entries.popitem(last=False)
+        if len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return entry
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._users.pop(user_id, None)
+        self._clock += 1
+        self._generations[user_id] = self._clock
+        self._generations.move_to_end(user_id)
+        if len(self._generations) > self.max_users:
+            # Oldest first, so the floor only rises
+            _, self._floor = self._generations.popitem(last=False)
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._generations.clear()
+        self._epoch += 1
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            self.invalidate(uuid.UUID(payload))
+        except ValueError:
+            logger.warning("Ignoring %s payload %r", channel, payload)
+
+    async def serve(
+        self,
+        request: Request,
+        response: Response,
+        user_id: uuid.UUID,
+        key: tuple,
+        fingerprint: Callable[[], Awaitable[str]],
+        load: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Answer a read from the cache or the DB, honouring If-None-Match.
+
+        On a miss, ``fingerprint`` feeds the ETag (etags.make_etag of the
+        user, ``key`` and the fingerprint) and ``load`` builds the body.
+        """
+        entry = self.get(user_id, key)
+        if entry is None:
+            token = self.token(user_id)
+            etag = make_etag(user_id, *key, await fingerprint())
+        else:
+            etag = entry.etag
+        if cached := not_modified(request, response, etag):
+            return cached
+        if entry is None:
+            entry = self.put(user_id, key, token, etag, await load())
+        return entry.body
+
+    async def listen(self, dsn: str) -> None:
+        """Background task: hold a LISTEN connection for the life of the app."""
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(dsn=dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _: lost.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                # Anything cached before now may have missed a notification
+                self.clear()
+                self.listening = True
+                await lost.wait()
+                logger.warning("Lost the %s listener connection", CHANNEL)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Couldn't listen on %s", CHANNEL)
+            finally:
+                self.listening = False
+                self.clear()
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(_RECONNECT_SECONDS)
+
+
+session_cache = SessionCache()
@@ -0,0 +1,116 @@
+"""Rewrite schema_version 1 workout sessions into the v2 group format.
+
+v1 sessions store a flat exercises list; v2 stores exercise groups (the
+format the agent writes today), each with a persisted group_id. Converted
+groups get ids derived from the session id and the group's position
+(uuid5), so a v1 row reads the same before and after it is rewritten.
+
+Startup runs migrate_v1_sessions as a background task. It works through
+the rows in small batches with a pause between them, so it never holds
+many row locks or competes with requests for long. It can also be run by
+hand:
+
+    cd backend && python -m app.session_migration [--batch-size 200]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+
+import asyncpg
+
+from app.config import settings
+
+logger = logging.getLogger("session_migration")
+
+BATCH_SIZE = 200
+BATCH_PAUSE_SECONDS = 0.5
+
+_GROUP_ID_NAMESPACE = uuid.UUID("5d0b7a3c-2f4e-4b8a-9c61-7e2a1f3d9b40")
+
+
+def group_id_for(session_id: uuid.UUID, index: int) -> str:
+    """Stable id for the index-th group of a converted v1 session."""
+    return str(uuid.uuid5(_GROUP_ID_NAMESPACE, f"{session_id}:{index}"))
+
+
+def v1_to_groups(session_id: uuid.UUID, exercises: list[dict]) -> list[dict]:
+    """Wrap each v1 exercise in a single-exercise group with the standard timer."""
+    return [
+        {
+            "group_id": group_id_for(session_id, i),
+            "group_type": "single",
+            "timer_config": {"mode": "standard", "rest_seconds": 90},
+            "exercises": [ex],
+        }
+        for i, ex in enumerate(exercises)
+    ]
+
+
+async def migrate_batch(conn: asyncpg.Connection, batch_size: int = BATCH_SIZE) -> int:
+    """Convert up to ``batch_size`` v1 sessions. Returns how many were converted.
+
+    Rows another transaction holds are skipped and picked up by a later
+    batch; rows that became v2 in the meantime are left alone.
+    """
+    async with conn.transaction():
+        rows = await conn.fetch(
+            """SELECT id, exercises FROM workout_sessions
+               WHERE COALESCE(schema_version, 1) < 2
+               LIMIT $1 FOR UPDATE SKIP LOCKED""",
+            batch_size,
+        )
+        if not rows:
+            return 0
+        ids, groups = [], []
+        for r in rows:
+            exercises = r["exercises"]
+            if isinstance(exercises, str):
+                exercises = json.loads(exercises)
+            ids.append(r["id"])
+            groups.append(json.dumps(v1_to_groups(r["id"], exercises or [])))
+        await conn.execute(
+            """UPDATE workout_sessions s SET exercises = v.exercises::jsonb, schema_version = 2
+               FROM unnest($1::uuid[], $2::text[]) AS v(id, exercises)
+               WHERE s.id = v.id AND COALESCE(s.schema_version, 1) < 2""",
+            ids, groups,
+        )
+    return len(rows)
+
+
+async def migrate_v1_sessions(
+    pool: asyncpg.Pool, batch_size: int = BATCH_SIZE, pause: float = BATCH_PAUSE_SECONDS
+) -> int:
+    """Convert every v1 session, one batch per pool checkout. Returns the total."""
+    total = 0
+    while True:
+        try:
+            async with pool.acquire() as conn:
+                converted = await migrate_batch(conn, batch_size)
+        except Exception:
+            logger.exception("v1 session migration failed after %d sessions", total)
+            return total
+        total += converted
+        if converted < batch_size:
+            break
+        await asyncio.sleep(pause)
+    if total:
+        logger.info("Converted %d v1 sessions to exercise groups", total)
+    return total
+
+
+async def main(batch_size: int) -> None:
+    pool = await asyncpg.create_pool(dsn=settings.DATABASE_URL, min_size=1, max_size=1)
+    try:
+        count = await migrate_v1_sessions(pool, batch_size)
+    finally:
+        await pool.close()
+    print(f"Converted {count} sessions")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,85 @@
+"""Workout session status transitions.
+
+    scheduled --start--> in_progress --complete--> completed
+                         in_progress <--reopen---- completed
+    in_progress / completed / skipped --reset--> scheduled
+
+Each transition is a single conditional UPDATE ... RETURNING: the status
+check and the write happen in one statement, so two devices tapping "start"
+at once can't both succeed, and the success path is one round trip. Only
+when no row comes back is the session looked up again, to tell a missing
+session (404) from one in the wrong status (400).
+"""
+import uuid
+from typing import NamedTuple
+
+import asyncpg
+from fastapi import HTTPException
+
+from app.db import fetch_one
+from app.session_cache import session_cache
+
+SESSION_COLUMNS = """id, user_id, plan_id, scheduled_date, title, status,
+                  exercises, started_at, completed_at, created_at, schema_version"""
+
+
+class Transition(NamedTuple):
+    from_statuses: tuple[str, ...]
+    set_sql: str
+    error: str  # formatted with the current status
+
+
+TRANSITIONS: dict[str, Transition] = {
+    "start": Transition(
+        ("scheduled",),
+        "status = 'in_progress', started_at = NOW()",
+        "Cannot start session with status '{status}'",
+    ),
+    "complete": Transition(
+        ("in_progress",),
+        "status = 'completed', completed_at = NOW()",
+        "Cannot complete session with status '{status}'",
+    ),
+    "reopen": Transition(
+        ("completed",),
+        "status = 'in_progress', completed_at = NULL",
+        "Cannot reopen session with status '{status}'",
+    ),
+    "reset": Transition(
+        ("in_progress", "completed", "skipped"),
+        "status = 'scheduled', started_at = NULL, completed_at = NULL",
+        "Session is already {status}",
+    ),
+}
+
+_UPDATE_SQL = {
+    action: f"""UPDATE workout_sessions SET {t.set_sql}
+           WHERE id = $1 AND user_id = $2 AND status = ANY($3::text[])
+           RETURNING {SESSION_COLUMNS}"""
+    for action, t in TRANSITIONS.items()
+}
+
+
+async def apply_transition(
+    conn: asyncpg.Connection, session_id: uuid.UUID, user_id: uuid.UUID, action: str
+) -> dict:
+    """Apply ``action`` to the user's session and return the updated row.
+
+    Raises 404 if the session doesn't exist (or isn't the user's) and 400 if
+    its status doesn't allow the transition.
+    """
+    transition = TRANSITIONS[action]
+    row = await fetch_one(conn, _UPDATE_SQL[action], session_id, user_id, list(transition.from_statuses))
+    if row:
+        # The change is committed; don't wait for the notification to reach this process
+        session_cache.invalidate(user_id)
+        return row
+
+    current = await fetch_one(
+        conn,
+        "SELECT status FROM workout_sessions WHERE id = $1 AND user_id = $2",
+        session_id, user_id,
+    )
+    if not current:
+        raise HTTPException(status_code=404, detail="Session not found")
+    raise HTTPException(status_code=400, detail=transition.error.format(status=current["status"]))
@@ -0,0 +1,120 @@
+"""Resolver accuracy and latency: in-process catalog cache vs the SQL path.
+
+Resolves every entry of resolver_corpus.CORPUS through both paths and reports
+accuracy per noise kind, hits per match tier (memo/exact/alias/trigram/
+inserted) and latency percentiles. Resolves pass no user, so memo stays 0
+unless that changes.
+
+Runs against DATABASE_URL (a local Postgres the API has started against at
+least once, so the schema and seed exercises exist). Each resolve runs in its
+own transaction that is rolled back, so auto-inserts neither persist nor leak
+into later lookups.
+
+    cd backend && python -m benchmarks.bench_resolver --iterations 20
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter, defaultdict
+
+import asyncpg
+
+from app import exercise_resolver
+from app.config import settings
+from app.exercise_catalog import ExerciseCatalog
+from benchmarks.resolver_corpus import CORPUS
+
+_TIERS = ("memo", "exact", "alias", "trigram", "inserted")
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[idx]
+
+
+async def _run_corpus(conn: asyncpg.Connection, iterations: int, use_catalog: bool) -> dict:
+    catalog = ExerciseCatalog()
+    if use_catalog:
+        await catalog.load(conn)
+    exercise_resolver.catalog = catalog
+
+    samples: list[float] = []
+    tiers: Counter[str] = Counter()
+    correct: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    misses: dict[str, str] = {}
+
+    for i in range(iterations):
+        for raw, expected, kind in CORPUS:
+            tr = conn.transaction()
+            await tr.start()
+            start = time.perf_counter()
+            name, tier = await exercise_resolver.resolve_exercise(conn, raw)
+            samples.append((time.perf_counter() - start) * 1000)
+            await tr.rollback()
+            if tier == "inserted" and use_catalog:
+                await catalog.load(conn)  # reload now so the next timed resolve doesn't
+
+            if i == 0:
+                tiers[tier] += 1
+                total[kind] += 1
+                if name == expected:
+                    correct[kind] += 1
+                else:
+                    misses[raw] = f"{name} ({tier}), expected {expected}"
+
+    return {"samples": samples, "tiers": tiers, "correct": correct, "total": total, "misses": misses}
+
+
+def _report(label: str, result: dict) -> None:
+    samples = result["samples"]
+    correct, total = result["correct"], result["total"]
+    print(f"== {label} ==")
+    print(
+        f"latency ms  p50 {_percentile(samples, 50):.3f}  p95 {_percentile(samples, 95):.3f}"
+        f"  p99 {_percentile(samples, 99):.3f}  ({len(samples)} resolves)"
+    )
+    print("tier hits   " + "  ".join(f"{t} {result['tiers'][t]}" for t in _TIERS))
+    print(f"accuracy    {sum(correct.values())}/{sum(total.values())}")
+    for kind in total:
+        print(f"  {kind:<13} {correct[kind]}/{total[kind]}")
+    if result["misses"]:
+        print("misses")
+        for raw, detail in result["misses"].items():
+            print(f"  {raw!r}: {detail}")
+    print()
+
+
+async def main(iterations: int, show_misses: bool) -> None:
+    logging.getLogger("exercise_resolver").setLevel(logging.ERROR)
+    logging.getLogger("exercise_catalog").setLevel(logging.ERROR)
+    conn = await asyncpg.connect(dsn=settings.DATABASE_URL)
+    original = exercise_resolver.catalog
+    try:
+        results = {
+            # An unloaded catalog is bypassed, i.e. the DB-only path
+            "sql": await _run_corpus(conn, iterations, use_catalog=False),
+            "cache": await _run_corpus(conn, iterations, use_catalog=True),
+        }
+    finally:
+        exercise_resolver.catalog = original
+        await conn.close()
+
+    by_kind: defaultdict[str, int] = defaultdict(int)
+    for _, _, kind in CORPUS:
+        by_kind[kind] += 1
+    print(f"{len(CORPUS)} corpus entries ({', '.join(f'{k} {n}' for k, n in by_kind.items())}) x {iterations} iterations\n")
+    for label, result in results.items():
+        if not show_misses:
+            result["misses"] = {}
+        _report(label, result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--misses", action="store_true", help="list every corpus entry that resolved wrongly")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.misses))
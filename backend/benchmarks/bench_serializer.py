@@ -0,0 +1,178 @@
+"""Session serializer: table-driven, memoized _to_camel vs the previous implementation.
+
+Serializes a realistic week (7 v2 sessions, 5-6 exercise groups each, every
+timer mode, snake_case agent output mixed with camelCase app edits) through
+both implementations, checks the JSON is byte-identical and reports the time
+per week: cold (nothing memoized) and reloaded after one session changed,
+which is what a week read sees after a set is logged. Never connects to the
+database.
+
+    cd backend && python -m benchmarks.bench_serializer --iterations 500
+"""
+import argparse
+import json
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+from app.routes import sessions
+from app.routes.sessions import _exercise_to_camel, _to_camel
+
+
+# The implementation before the rename table and the memo, kept as the baseline
+def _legacy_timer_config_to_camel(tc: dict) -> dict:
+    return {
+        "mode": tc.get("mode", "standard"),
+        **({"restSeconds": tc["rest_seconds"]} if "rest_seconds" in tc else {}),
+        **({"restSeconds": tc["restSeconds"]} if "restSeconds" in tc else {}),
+        **({"warmupRestSeconds": tc["warmup_rest_seconds"]} if "warmup_rest_seconds" in tc else {}),
+        **({"warmupRestSeconds": tc["warmupRestSeconds"]} if "warmupRestSeconds" in tc else {}),
+        **({"intervalSeconds": tc["interval_seconds"]} if "interval_seconds" in tc else {}),
+        **({"intervalSeconds": tc["intervalSeconds"]} if "intervalSeconds" in tc else {}),
+        **({"totalRounds": tc["total_rounds"]} if "total_rounds" in tc else {}),
+        **({"totalRounds": tc["totalRounds"]} if "totalRounds" in tc else {}),
+        **({"timeLimitSeconds": tc["time_limit_seconds"]} if "time_limit_seconds" in tc else {}),
+        **({"timeLimitSeconds": tc["timeLimitSeconds"]} if "timeLimitSeconds" in tc else {}),
+        **({"workSeconds": tc["work_seconds"]} if "work_seconds" in tc else {}),
+        **({"workSeconds": tc["workSeconds"]} if "workSeconds" in tc else {}),
+        **({"circuitRestSeconds": tc["circuit_rest_seconds"]} if "circuit_rest_seconds" in tc else {}),
+        **({"circuitRestSeconds": tc["circuitRestSeconds"]} if "circuitRestSeconds" in tc else {}),
+        **({"roundRestSeconds": tc["round_rest_seconds"]} if "round_rest_seconds" in tc else {}),
+        **({"roundRestSeconds": tc["roundRestSeconds"]} if "roundRestSeconds" in tc else {}),
+        **({"rounds": tc["rounds"]} if "rounds" in tc else {}),
+        **({"prepCountdownSeconds": tc["prep_countdown_seconds"]} if "prep_countdown_seconds" in tc else {}),
+        **({"prepCountdownSeconds": tc["prepCountdownSeconds"]} if "prepCountdownSeconds" in tc else {}),
+    }
+
+
+def _legacy_group_to_camel(g: dict) -> dict:
+    return {
+        "groupId": g.get("group_id", g.get("groupId", "")),
+        "groupType": g.get("group_type", g.get("groupType", "single")),
+        "timerConfig": _legacy_timer_config_to_camel(g.get("timer_config", g.get("timerConfig", {"mode": "standard"}))),
+        "exercises": [_exercise_to_camel(ex) for ex in g.get("exercises", [])],
+        **({"notes": g["notes"]} if g.get("notes") else {}),
+    }
+
+
+_TIMERS = [
+    {"mode": "standard", "rest_seconds": 120, "warmup_rest_seconds": 60, "prep_countdown_seconds": 5},
+    {"mode": "standard", "restSeconds": 90},
+    {"mode": "emom", "interval_seconds": 60, "total_rounds": 10, "prep_countdown_seconds": 10},
+    {"mode": "amrap", "time_limit_seconds": 600},
+    {"mode": "circuit", "work_seconds": 40, "circuit_rest_seconds": 20, "round_rest_seconds": 90, "rounds": 3},
+    {"mode": "circuit", "workSeconds": 45, "circuitRestSeconds": 15, "roundRestSeconds": 60, "rounds": 4},
+]
+
+
+def _exercise(i: int, camel: bool) -> dict:
+    ex = {"name": f"Exercise {i}", "sets": 3 + i % 3, "reps": 6 + i % 7, "notes": "slow eccentric" if i % 4 else ""}
+    if camel:
+        ex.update({"youtubeUrl": f"https://youtube.com/watch?v=x{i}", "exerciseType": "strength", "targetRpe": 8})
+    else:
+        ex.update({"youtube_url": f"https://youtube.com/watch?v=x{i}", "exercise_type": "strength"})
+    return ex
+
+
+def build_week(week_start: date = date(2026, 3, 2)) -> list[dict]:
+    """Seven workout_sessions rows shaped like asyncpg returns them."""
+    user_id, plan_id = uuid.uuid4(), uuid.uuid4()
+    created = datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+    rows = []
+    for day in range(7):
+        groups = []
+        for g in range(5 + day % 2):
+            camel = (day + g) % 3 == 0  # edited in the app since the agent wrote it
+            timer = _TIMERS[(day + g) % len(_TIMERS)]
+            group_type = "single" if timer["mode"] == "standard" else timer["mode"]
+            exercises = [_exercise(day * 10 + g * 2 + k, camel) for k in range(1 if group_type == "single" else 3)]
+            if camel:
+                group = {"groupId": str(uuid.uuid4()), "groupType": group_type, "timerConfig": timer}
+            else:
+                group = {"group_id": str(uuid.uuid4()), "group_type": group_type, "timer_config": timer}
+            group["exercises"] = exercises
+            if g == 0:
+                group["notes"] = "Warm up with two lighter sets"
+            groups.append(group)
+        started = created + timedelta(days=day + 1) if day < 4 else None
+        rows.append({
+            "id": uuid.uuid4(), "user_id": user_id, "plan_id": plan_id,
+            "scheduled_date": week_start + timedelta(days=day), "title": f"Day {day + 1}",
+            "status": "completed" if day < 3 else "in_progress" if day == 3 else "scheduled",
+            "exercises": json.dumps(groups),
+            "started_at": started,
+            "completed_at": started + timedelta(hours=1) if day < 3 else None,
+            "created_at": created, "schema_version": 2,
+        })
+    return rows
+
+
+def _legacy_exercise_groups(row: dict) -> list[dict]:
+    return [_legacy_group_to_camel(g) for g in json.loads(row["exercises"])]
+
+
+def _serialize(rows: list[dict], legacy: bool) -> list[dict]:
+    original = sessions._exercise_groups
+    if legacy:
+        sessions._exercise_groups = _legacy_exercise_groups
+    try:
+        return [_to_camel(r) for r in rows]
+    finally:
+        sessions._exercise_groups = original
+
+
+def _cold(rows: list[dict]) -> list[dict]:
+    sessions._groups_memo.clear()
+    return _serialize(rows, legacy=False)
+
+
+def _reload(rows: list[dict], edited: dict) -> list[dict]:
+    """Serialize the week with one session edited since the last read."""
+    sessions._groups_memo.pop((edited["id"], edited["schema_version"], edited["exercises"]), None)
+    return _serialize(rows, legacy=False)
+
+
+def _best_of(fn, iterations: int, repeats: int = 7) -> float:
+    """Best per-call time in microseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+
+def main(iterations: int) -> None:
+    rows = build_week()
+    legacy = json.dumps(_serialize(rows, legacy=True)).encode()
+    current = json.dumps(_serialize(rows, legacy=False)).encode()
+    if legacy != current:
+        raise SystemExit("serializer output differs from the previous implementation")
+    parsed = [json.loads(r["exercises"]) for r in rows]
+    print(f"7 sessions, {sum(map(len, parsed))} groups, {len(current)} bytes of JSON: byte-identical\n")
+
+    # Group conversion alone, then the whole _to_camel, which also pays for
+    # json.loads of the stored exercises unless the memo already has them
+    cases = {
+        "groups": (
+            lambda: [[_legacy_group_to_camel(g) for g in gs] for gs in parsed],
+            lambda: [[sessions._group_to_camel(g) for g in gs] for gs in parsed],
+        ),
+        "cold": (lambda: _serialize(rows, legacy=True), lambda: _cold(rows)),
+        "reload": (lambda: _serialize(rows, legacy=True), lambda: _reload(rows, rows[3])),
+    }
+    print(f"{'us/week':<10} {'previous':>9} {'current':>9}")
+    for label, (before_fn, after_fn) in cases.items():
+        before, after = float("inf"), float("inf")
+        for _ in range(3):  # interleave so drift hits both sides
+            before = min(before, _best_of(before_fn, iterations))
+            after = min(after, _best_of(after_fn, iterations))
+        print(f"{label:<10} {before:9.1f} {after:9.1f}  ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+    main(args.iterations)
@@ -0,0 +1,83 @@
+"""Noisy raw exercise names mapped to the canonical name they should resolve to.
+
+Every expected name comes from seed_exercises.EXERCISES. Entries are tagged by
+the kind of noise they exercise so a resolver change can be judged per
+category, not just overall.
+"""
+
+from app.seed_exercises import EXERCISES
+
+# (raw input, expected canonical name, kind)
+CORPUS: list[tuple[str, str, str]] = [
+    # Canonical name, different case
+    ("barbell bench press", "Barbell Bench Press", "exact"),
+    ("LAT PULLDOWN", "Lat Pulldown", "exact"),
+    ("hammer curl", "Hammer Curl", "exact"),
+    ("arnold press", "Arnold Press", "exact"),
+    ("Face Pull", "Face Pull", "exact"),
+
+    # Known aliases
+    ("OHP", "Overhead Press", "alias"),
+    ("rdl", "Romanian Deadlift", "alias"),
+    ("BSS", "Bulgarian Split Squat", "alias"),
+    ("cgbp", "Close Grip Bench Press", "alias"),
+    ("erg", "Rowing Machine", "alias"),
+    ("seated row", "Seated Cable Row", "alias"),
+    ("pec deck fly", "Pec Deck", "alias"),
+    ("lat pull down", "Lat Pulldown", "alias"),
+
+    # Gym shorthand / abbreviations
+    ("db bench", "Dumbbell Bench Press", "abbreviation"),
+    ("incline db", "Incline Dumbbell Bench Press", "abbreviation"),
+    ("bb squat", "Barbell Back Squat", "abbreviation"),
+    ("db shoulder press", "Dumbbell Shoulder Press", "abbreviation"),
+    ("db lateral raise", "Lateral Raise", "abbreviation"),
+    ("t bar row", "T-Bar Row", "abbreviation"),
+    ("db fly", "Dumbbell Fly", "abbreviation"),
+    ("single arm db row", "Dumbbell Row", "abbreviation"),
+    ("db rdl", "Romanian Deadlift", "abbreviation"),
+    ("ohp machine", "Machine Shoulder Press", "abbreviation"),
+    ("bw dips", "Chest Dip", "abbreviation"),
+
+    # Voice-transcript misspellings and split/merged words
+    ("dumbell row", "Dumbbell Row", "misspelling"),
+    ("romainian deadlift", "Romanian Deadlift", "misspelling"),
+    ("bulgarian split squad", "Bulgarian Split Squat", "misspelling"),
+    ("lateral raize", "Lateral Raise", "misspelling"),
+    ("tricep push down", "Tricep Pushdown", "misspelling"),
+    ("over head press", "Overhead Press", "misspelling"),
+    ("bench pres", "Barbell Bench Press", "misspelling"),
+    ("inclined bench press", "Incline Barbell Bench Press", "misspelling"),
+    ("skullcrusher", "Skull Crusher", "misspelling"),
+    ("hamer curl", "Hammer Curl", "misspelling"),
+
+    # Plurals
+    ("skull crushers", "Skull Crusher", "plural"),
+    ("face pulls", "Face Pull", "plural"),
+    ("goblet squats", "Goblet Squat", "plural"),
+    ("hip thrusts", "Hip Thrust", "plural"),
+    ("pull ups", "Pull-Up", "plural"),
+    ("chin ups", "Chin-Up", "plural"),
+    ("deadlifts", "Conventional Deadlift", "plural"),
+    ("squats", "Barbell Back Squat", "plural"),
+    ("lunges", "Walking Lunge", "plural"),
+    ("calf raises", "Calf Raise", "plural"),
+    ("leg curls", "Leg Curl", "plural"),
+    ("preacher curls", "Preacher Curl", "plural"),
+    ("cable flies", "Cable Crossover", "plural"),
+    ("russian twists", "Russian Twist", "plural"),
+    ("planks", "Plank", "plural"),
+
+    # Weight / distance noise left in by voice or quick typing
+    ("bench press 80kg", "Barbell Bench Press", "unit_noise"),
+    ("squat 100 kg", "Barbell Back Squat", "unit_noise"),
+    ("deadlift 225 lbs", "Conventional Deadlift", "unit_noise"),
+    ("ohp 40kg x 8", "Overhead Press", "unit_noise"),
+    ("db curl 12.5kg", "Dumbbell Curl", "unit_noise"),
+    ("lat pulldown 60 kg", "Lat Pulldown", "unit_noise"),
+    ("treadmill 5k", "Treadmill Run", "unit_noise"),
+    ("rower 2000m", "Rowing Machine", "unit_noise"),
+]
+
+_CANONICAL = {ex["name"] for ex in EXERCISES}
+assert all(expected in _CANONICAL for _, expected, _ in CORPUS), "corpus expects a non-seed name"
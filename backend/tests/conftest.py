@@ -19,6 +19,7 @@ from app.routes.sessions import router as sessions_router
 from app.routes.exercises import router as exercises_router
 from app.routes.voice import router as voice_router
 from app.routes.chat import router as chat_router
+from app.routes.sync import router as sync_router
 
 TEST_USER = {
     "user_id": "00000000-0000-0000-0000-000000000099",
@@ -56,6 +57,7 @@ def app(mock_conn: AsyncMock) -> FastAPI:
     test_app.include_router(exercises_router)
     test_app.include_router(voice_router)
     test_app.include_router(chat_router)
+    test_app.include_router(sync_router)
 
     # Mock agent for chat endpoint
     mock_agent = AsyncMock()
@@ -0,0 +1,97 @@
+import uuid
+from unittest.mock import AsyncMock
+
+import numpy as np
+import pytest
+
+from app.analytics import fetch_training_columns, progress_analytics, summarize
+
+pytestmark = pytest.mark.anyio
+
+TODAY = 20_000  # 2024-10-04, a Friday
+
+
+def _columns(sets: list[tuple]) -> dict:
+    """sets: (exercise, muscle_group, days_ago, weight, reps, rpe)"""
+    exercise, group, ago, weight, reps, rpe = zip(*sets)
+    return {
+        "today": np.int64(TODAY),
+        "exercise": np.array(exercise, dtype=object),
+        "muscle_group": np.array(group, dtype=object),
+        "day": TODAY - np.array(ago, dtype=np.int64),
+        "weight": np.array(weight, dtype=float),
+        "reps": np.array(reps, dtype=float),
+        "rpe": np.array(rpe, dtype=float),
+    }
+
+
+def test_e1rm_trend_and_rpe_drift():
+    # Bench climbs 2.5kg a week at 5 reps while RPE creeps up half a point a week
+    sets = []
+    for week in range(6):
+        ago = 35 - week * 7
+        sets.append(("Bench", "chest", ago, 100 + 2.5 * week, 5, 7 + 0.5 * week))
+        sets.append(("Bench", "chest", ago, 90, 8, None))
+    summary = summarize(_columns(sets), 90)
+
+    [bench] = summary["exercises"]
+    assert bench["sessions"] == 6
+    assert bench["latest_e1rm"] == pytest.approx(112.5 * (1 + 5 / 30), abs=0.1)
+    assert bench["best_e1rm"] == bench["latest_e1rm"]
+    assert bench["e1rm_trend_kg_per_week"] == pytest.approx(2.5 * (1 + 5 / 30), abs=0.01)
+    assert bench["rpe_drift_per_week"] == pytest.approx(0.5)
+    assert bench["plateau"] is False
+
+
+def test_plateau_needs_recent_sessions_without_a_new_best():
+    sets = [("Squat", "legs", 60, 140, 5, 8)]
+    sets += [("Squat", "legs", ago, 140, 5, 8.5) for ago in (20, 13, 6)]
+    sets += [("Deadlift", "back", 60, 180, 3, None), ("Deadlift", "back", 5, 190, 3, None)]
+    sets += [("Curl", "arms", 2, 20, 10, None)]
+    by_name = {e["exercise_name"]: e for e in summarize(_columns(sets), 90)["exercises"]}
+
+    assert by_name["Squat"]["plateau"] is True
+    assert by_name["Deadlift"]["plateau"] is False  # new best, too few recent sessions anyway
+    assert by_name["Curl"]["plateau"] is False
+    # Not enough points for a trend
+    assert by_name["Deadlift"]["e1rm_trend_kg_per_week"] is None
+    assert by_name["Deadlift"]["rpe_drift_per_week"] is None
+    # Most-trained first
+    assert [e["exercise_name"] for e in summarize(_columns(sets), 90)["exercises"]] == ["Squat", "Deadlift", "Curl"]
+
+
+def test_weekly_volume_per_muscle_group():
+    sets = [
+        ("Bench", "chest", 0, 100, 5, None),   # Friday, week of Monday 2024-09-30
+        ("Fly", "chest", 4, 20, 10, None),     # Monday of the same week
+        ("Bench", "chest", 5, 100, 5, None),   # Sunday, previous week
+        ("Row", "back", 0, 80, 10, None),
+    ]
+    volume = summarize(_columns(sets), 90)["weekly_volume"]
+    assert volume == [
+        {"week_start": "2024-09-23", "muscle_group": "chest", "volume_kg": 500.0, "sets": 1},
+        {"week_start": "2024-09-30", "muscle_group": "back", "volume_kg": 800.0, "sets": 1},
+        {"week_start": "2024-09-30", "muscle_group": "chest", "volume_kg": 700.0, "sets": 2},
+    ]
+
+
+async def test_no_logs_in_window():
+    conn = AsyncMock()
+    conn.fetchrow.return_value = {
+        "today": TODAY, "exercise": None, "muscle_group": None, "day": None,
+        "weight": None, "reps": None, "rpe": None,
+    }
+    columns = await fetch_training_columns(conn, uuid.uuid4(), 30)
+    assert summarize(columns, 30) == {"window_days": 30, "exercises": [], "weekly_volume": []}
+
+
+@pytest.mark.parametrize("days, window", [(1, 7), (100_000, 730)])
+async def test_window_is_clamped(days, window):
+    conn = AsyncMock()
+    conn.fetchrow.return_value = {
+        "today": TODAY, "exercise": None, "muscle_group": None, "day": None,
+        "weight": None, "reps": None, "rpe": None,
+    }
+    summary = await progress_analytics(conn, uuid.uuid4(), days)
+    assert summary["window_days"] == window
+    assert window in conn.fetchrow.call_args.args
@@ -0,0 +1,40 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.daily_stats import backfill_daily_stats, rebuild_daily_stats
+
+pytestmark = pytest.mark.anyio
+
+
+def _conn() -> AsyncMock:
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.execute.side_effect = ["LOCK TABLE", "DELETE 4", "INSERT 0 7"]
+    return conn
+
+
+async def test_rebuild_scoped_to_user():
+    conn = _conn()
+    user_id = uuid.uuid4()
+    assert await rebuild_daily_stats(conn, user_id) == 7
+    lock, delete, insert = conn.execute.call_args_list
+    assert "LOCK TABLE exercise_logs" in lock.args[0]
+    assert delete.args[1:] == (user_id,)
+    assert insert.args[1:] == (user_id,)
+    conn.transaction.assert_called_once()
+
+
+async def test_backfill_skips_populated_rollup():
+    conn = _conn()
+    conn.fetchval.return_value = True
+    await backfill_daily_stats(conn)
+    conn.execute.assert_not_called()
+
+
+async def test_backfill_rebuilds_empty_rollup():
+    conn = _conn()
+    conn.fetchval.side_effect = [False, True]
+    await backfill_daily_stats(conn)
+    assert conn.execute.await_count == 3
@@ -0,0 +1,34 @@
+import numpy as np
+
+from app.downsample import lttb_indices
+
+
+def test_short_series_returned_whole():
+    x = np.arange(5)
+    assert lttb_indices(x, x * 2.0, 10).tolist() == [0, 1, 2, 3, 4]
+
+
+def test_output_size_and_endpoints():
+    x = np.arange(1000)
+    y = np.sin(x / 50.0)
+    keep = lttb_indices(x, y, 50)
+    assert len(keep) == 50
+    assert keep[0] == 0 and keep[-1] == 999
+    assert np.all(np.diff(keep) > 0)
+
+
+def test_keeps_single_spike():
+    x = np.arange(2000)
+    y = np.full(2000, 60.0)
+    y[1234] = 100.0  # one-off PR
+    keep = lttb_indices(x, y, 20)
+    assert 1234 in keep
+
+
+def test_keeps_series_maximum_over_noise():
+    rng = np.random.default_rng(7)
+    x = np.arange(3000)
+    y = 80 + rng.normal(0, 5, 3000)
+    keep = lttb_indices(x, y, 30)
+    assert int(y.argmax()) in keep
+    assert len(keep) == 30
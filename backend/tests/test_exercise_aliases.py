@@ -0,0 +1,79 @@
+"""exercise_aliases: seeding, the one-shot copy from exercises.aliases, and lookups.
+
+The lookup tests need a real Postgres and are skipped unless TEST_DATABASE_URL
+points at a scratch database; their changes are rolled back.
+"""
+import json
+import os
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.exercise_resolver import _RESOLVE_SQL
+from app.seed_exercises import EXERCISES, migrate_legacy_aliases, seed_exercises
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+needs_db = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+async def test_seed_writes_every_alias_in_one_statement():
+    conn = AsyncMock()
+    conn.execute.return_value = "INSERT 0 0"
+    await seed_exercises(conn)
+
+    alias_calls = [c for c in conn.execute.call_args_list if "exercise_aliases" in c.args[0]]
+    assert len(alias_calls) == 1
+    _, aliases, names = alias_calls[0].args
+    expected = [(a, ex["name"]) for ex in EXERCISES for a in ex["aliases"]]
+    assert list(zip(aliases, names)) == expected
+
+
+async def test_legacy_alias_copy_runs_once():
+    conn = AsyncMock()
+    conn.fetchval.return_value = False
+    conn.execute.return_value = "INSERT 0 3"
+    await migrate_legacy_aliases(conn)
+    assert "unnest(e.aliases)" in conn.execute.call_args.args[0]
+
+    conn.reset_mock()
+    conn.fetchval.return_value = True
+    await migrate_legacy_aliases(conn)
+    conn.execute.assert_not_called()
+
+
+@pytest.fixture
+async def db_conn():
+    import asyncpg
+    from app.main import _SCHEMA_SQL
+
+    conn = await asyncpg.connect(dsn=TEST_DATABASE_URL)
+    tr = conn.transaction()
+    await tr.start()
+    try:
+        await conn.execute(_SCHEMA_SQL)
+        await conn.execute("DELETE FROM exercise_aliases")
+        yield conn
+    finally:
+        await tr.rollback()
+        await conn.close()
+
+
+@needs_db
+async def test_legacy_aliases_resolve_through_index(db_conn):
+    await db_conn.execute(
+        """INSERT INTO exercises (name, aliases) VALUES ('Zercher Squat', ARRAY['Zercher', 'ZS'])
+           ON CONFLICT (name) DO UPDATE SET aliases = EXCLUDED.aliases"""
+    )
+    await migrate_legacy_aliases(db_conn)
+    await seed_exercises(db_conn)
+
+    row = await db_conn.fetchrow(_RESOLVE_SQL, "zercher", None, None)
+    assert (row["name"], row["tier"]) == ("Zercher Squat", "alias")
+    row = await db_conn.fetchrow(_RESOLVE_SQL, "rdl", None, None)
+    assert (row["name"], row["tier"]) == ("Romanian Deadlift", "alias")
+
+    await db_conn.execute("SET LOCAL enable_seqscan = off")
+    plan = json.loads(await db_conn.fetchval(
+        "EXPLAIN (FORMAT JSON) SELECT exercise_name FROM exercise_aliases WHERE LOWER(alias) = LOWER($1)", "rdl"
+    ))
+    assert "idx_exercise_aliases_lower" in json.dumps(plan)
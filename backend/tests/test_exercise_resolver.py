@@ -1,13 +1,35 @@
+import uuid
+
 import pytest
-from unittest.mock import AsyncMock
-from app.exercise_resolver import resolve_exercise_name, _extract_muscle_group
+from unittest.mock import AsyncMock, MagicMock
+from app.exercise_catalog import ExerciseCatalog, similarity, trigrams
+from app.exercise_resolver import (
+    resolve_exercise,
+    resolve_exercise_name,
+    resolve_exercise_names,
+    resolve_exercise_tiers,
+    remember_resolutions,
+    correct_resolution,
+    forget_resolution,
+    _extract_muscle_group,
+    _memos,
+)
 
 pytestmark = pytest.mark.anyio
 
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+@pytest.fixture(autouse=True)
+def _clear_memo():
+    _memos.clear()
+    yield
+    _memos.clear()
+
 
 async def test_exact_match():
     conn = AsyncMock()
-    conn.fetchrow.return_value = {"name": "Barbell Bench Press"}
+    conn.fetchrow.return_value = {"name": "Barbell Bench Press", "tier": "exact", "sim": None}
     result = await resolve_exercise_name(conn, "barbell bench press")
     assert result == "Barbell Bench Press"
     conn.fetchrow.assert_called_once()
@@ -15,64 +37,51 @@ async def test_exact_match():
 
 async def test_alias_match():
     conn = AsyncMock()
-    conn.fetchrow.side_effect = [None, {"name": "Barbell Bench Press"}]
-    result = await resolve_exercise_name(conn, "bench")
-    assert result == "Barbell Bench Press"
+    conn.fetchrow.return_value = {"name": "Barbell Bench Press", "tier": "alias", "sim": None}
+    result = await resolve_exercise(conn, "bench")
+    assert result == ("Barbell Bench Press", "alias")
+    conn.fetchrow.assert_called_once()
 
 
 async def test_trigram_match():
     conn = AsyncMock()
-    conn.fetchrow.side_effect = [None, None, {"name": "Barbell Bench Press", "sim": 0.55}]
-    result = await resolve_exercise_name(conn, "barbell benchpress")
-    assert result == "Barbell Bench Press"
+    conn.fetchrow.return_value = {"name": "Barbell Bench Press", "tier": "trigram", "sim": 0.55}
+    result = await resolve_exercise(conn, "barbell benchpress")
+    assert result == ("Barbell Bench Press", "trigram")
+    conn.fetchrow.assert_called_once()
 
 
-async def test_trigram_match_with_muscle_hint_prefers_correct_group():
-    """When input contains 'shoulder', prefer the shoulders exercise over chest."""
+async def test_single_statement_passes_muscle_hint():
+    """The muscle-group bonus is applied in SQL, driven by the hint parameter."""
     conn = AsyncMock()
-    # Exact match: None, Alias match: None
-    conn.fetchrow.side_effect = [None, None]
-    # Trigram fetch returns multiple candidates (chest press has higher raw sim)
-    conn.fetch.return_value = [
-        {"name": "Machine Chest Press", "muscle_group": "chest", "sim": 0.45},
-        {"name": "Machine Shoulder Press", "muscle_group": "shoulders", "sim": 0.40},
-    ]
+    conn.fetchrow.return_value = {"name": "Machine Shoulder Press", "tier": "trigram", "sim": 0.40}
     result = await resolve_exercise_name(conn, "shoulder press machine")
     assert result == "Machine Shoulder Press"
+    assert conn.fetchrow.call_args.args[1:] == ("shoulder press machine", "shoulders", None)
 
 
-async def test_trigram_match_with_muscle_hint_no_candidates():
-    """When muscle hint is present but no candidates pass threshold, auto-insert."""
+async def test_single_statement_no_hint():
     conn = AsyncMock()
-    conn.fetchrow.side_effect = [None, None]
-    conn.fetch.return_value = []
-    conn.execute = AsyncMock()
-    result = await resolve_exercise_name(conn, "shoulder something weird")
-    assert result == "shoulder something weird"
-    conn.execute.assert_called_once()
-
-
-async def test_trigram_no_muscle_hint_picks_best_sim():
-    """Without muscle keywords, standard trigram picks highest similarity."""
-    conn = AsyncMock()
-    conn.fetchrow.side_effect = [None, None, {"name": "Barbell Row", "sim": 0.50}]
+    conn.fetchrow.return_value = {"name": "Barbell Row", "tier": "trigram", "sim": 0.50}
     result = await resolve_exercise_name(conn, "barbell rows")
     assert result == "Barbell Row"
+    assert conn.fetchrow.call_args.args[1:] == ("barbell rows", None, None)
 
 
 async def test_no_match_auto_insert():
     conn = AsyncMock()
-    conn.fetchrow.side_effect = [None, None, None]
+    conn.fetchrow.return_value = None
     conn.execute = AsyncMock()
-    result = await resolve_exercise_name(conn, "My Custom Exercise")
-    assert result == "My Custom Exercise"
+    result = await resolve_exercise(conn, "My Custom Exercise")
+    assert result == ("My Custom Exercise", "inserted")
+    conn.fetchrow.assert_called_once()
     conn.execute.assert_called_once()
 
 
 async def test_empty_input():
     conn = AsyncMock()
-    result = await resolve_exercise_name(conn, "")
-    assert result == ""
+    result = await resolve_exercise(conn, "")
+    assert result == ("", "blank")
     conn.fetchrow.assert_not_called()
 
 
@@ -83,6 +92,37 @@ async def test_whitespace_only():
     conn.fetchrow.assert_not_called()
 
 
+async def test_bulk_resolve_single_query_and_insert():
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {"raw": "bench press", "name": "Barbell Bench Press", "tier": "alias"},
+        {"raw": "barbell rows", "name": "Barbell Row", "tier": "trigram"},
+        {"raw": "Sled Push", "name": None, "tier": None},
+        {"raw": "sled push", "name": None, "tier": None},
+    ]
+    result = await resolve_exercise_names(
+        conn, ["bench press", "barbell rows", "Sled Push", " sled push ", "bench press"],
+    )
+    assert result == {
+        "bench press": "Barbell Bench Press",
+        "barbell rows": "Barbell Row",
+        "Sled Push": "Sled Push",
+        " sled push ": "Sled Push",
+    }
+    conn.fetch.assert_called_once()
+    assert conn.fetch.call_args.args[1] == ["bench press", "barbell rows", "Sled Push", "sled push"]
+    conn.execute.assert_called_once()
+    assert conn.execute.call_args.args[1] == ["Sled Push"]
+
+
+async def test_bulk_resolve_no_match_needs_no_insert():
+    conn = AsyncMock()
+    conn.fetch.return_value = [{"raw": "Squat", "name": "Barbell Back Squat", "tier": "alias"}]
+    result = await resolve_exercise_names(conn, ["Squat", ""])
+    assert result == {"Squat": "Barbell Back Squat", "": ""}
+    conn.execute.assert_not_called()
+
+
 # Unit tests for _extract_muscle_group
 def test_extract_muscle_group_shoulder():
     assert _extract_muscle_group("shoulder press machine") == "shoulders"
@@ -110,3 +150,176 @@ def test_extract_muscle_group_none():
 
 def test_extract_muscle_group_delt():
     assert _extract_muscle_group("rear delt fly") == "shoulders"
+
+
+# In-process catalog cache
+_CATALOG_ROWS = [
+    {"name": "Barbell Bench Press", "aliases": ["Bench Press", "Flat Bench"], "muscle_group": "chest"},
+    {"name": "Machine Chest Press", "aliases": [], "muscle_group": "chest"},
+    {"name": "Machine Shoulder Press", "aliases": [], "muscle_group": "shoulders"},
+    {"name": "Barbell Row", "aliases": ["BB Row"], "muscle_group": "back"},
+]
+
+
+async def _loaded_catalog() -> ExerciseCatalog:
+    conn = AsyncMock()
+    conn.fetch.return_value = _CATALOG_ROWS
+    cat = ExerciseCatalog()
+    await cat.load(conn)
+    return cat
+
+
+def test_trigram_similarity_matches_pg_trgm_semantics():
+    assert trigrams("Row") == {"  r", " ro", "row", "ow "}
+    assert similarity(trigrams("Barbell Row"), trigrams("barbell row")) == 1.0
+    assert similarity(trigrams("Squat"), trigrams("Plank")) == 0.0
+
+
+async def test_catalog_resolves_without_db(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    assert await resolve_exercise_name(conn, "barbell bench press") == "Barbell Bench Press"
+    assert await resolve_exercise_name(conn, "flat bench") == "Barbell Bench Press"
+    assert await resolve_exercise_name(conn, "barbell rows") == "Barbell Row"
+    conn.fetchrow.assert_not_called()
+    conn.fetch.assert_not_called()
+
+
+async def test_catalog_trigram_prefers_muscle_hint(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    assert await resolve_exercise_name(conn, "shoulder press machine") == "Machine Shoulder Press"
+    conn.fetchrow.assert_not_called()
+
+
+async def test_catalog_miss_falls_through_and_caches_insert(monkeypatch):
+    cat = await _loaded_catalog()
+    monkeypatch.setattr("app.exercise_resolver.catalog", cat)
+    conn = AsyncMock()
+    conn.is_in_transaction = MagicMock(return_value=False)
+    conn.fetchrow.return_value = None
+    assert await resolve_exercise_name(conn, "My Custom Exercise") == "My Custom Exercise"
+    conn.execute.assert_called_once()
+    assert cat.lookup("my custom exercise") == ("My Custom Exercise", "exact")
+
+
+async def test_insert_inside_transaction_waits_for_commit(monkeypatch):
+    cat = await _loaded_catalog()
+    monkeypatch.setattr("app.exercise_resolver.catalog", cat)
+    conn = AsyncMock()
+    conn.is_in_transaction = MagicMock(return_value=True)
+    conn.fetchrow.return_value = None
+    assert await resolve_exercise_name(conn, "My Custom Exercise") == "My Custom Exercise"
+    # A rollback would otherwise leave the name in the catalog until the TTL
+    assert cat.lookup("my custom exercise") != ("My Custom Exercise", "exact")
+    assert cat.is_stale()
+
+
+async def test_bulk_resolve_uses_catalog_first(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    result = await resolve_exercise_names(conn, ["bench press", "BB Row"])
+    assert result == {"bench press": "Barbell Bench Press", "BB Row": "Barbell Row"}
+    conn.fetch.assert_not_called()
+
+
+async def test_catalog_reloads_when_invalidated(monkeypatch):
+    cat = await _loaded_catalog()
+    cat.invalidate()
+    monkeypatch.setattr("app.exercise_resolver.catalog", cat)
+    conn = AsyncMock()
+    conn.fetch.return_value = _CATALOG_ROWS + [
+        {"name": "Sled Push", "aliases": [], "muscle_group": "legs"},
+    ]
+    assert await resolve_exercise_name(conn, "sled push") == "Sled Push"
+    conn.fetch.assert_called_once()
+    assert not cat.is_stale()
+
+
+async def test_memo_tier_from_db():
+    conn = AsyncMock()
+    conn.fetchrow.return_value = {"name": "Dumbbell Row", "tier": "memo", "sim": None}
+    assert await resolve_exercise(conn, "db rows", USER_ID) == ("Dumbbell Row", "memo")
+    assert conn.fetchrow.call_args.args[1:] == ("db rows", None, USER_ID)
+
+
+async def test_remember_resolutions_upserts_once(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    await resolve_exercise(conn, "barbell rows", USER_ID)
+    await remember_resolutions(conn, USER_ID, {" bench pres ": "Barbell Bench Press", "": "Plank"})
+    await remember_resolutions(conn, USER_ID, {"Bench Pres": "Barbell Bench Press"})
+    conn.execute.assert_called_once()
+    assert conn.execute.call_args.args[1:] == (USER_ID, ["bench pres"], ["Barbell Bench Press"])
+
+
+async def test_memo_outranks_catalog(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {"raw_key": "barbell rows", "exercise_name": "Machine Chest Press"},
+        {"raw_key": "bb row", "exercise_name": "Machine Chest Press"},
+    ]
+    assert await resolve_exercise(conn, "barbell rows", USER_ID) == ("Machine Chest Press", "memo")
+    assert await resolve_exercise(conn, "BB Row", USER_ID) == ("Machine Chest Press", "memo")
+    # Other users still get the catalog match
+    assert await resolve_exercise(conn, "barbell rows") == ("Barbell Row", "trigram")
+    conn.fetch.assert_called_once()
+    conn.fetchrow.assert_not_called()
+
+
+async def test_fuzzy_catalog_hit_served_when_user_has_no_memo(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    assert await resolve_exercise(conn, "barbell rows", USER_ID) == ("Barbell Row", "trigram")
+    assert await resolve_exercise(conn, "shoulder press machine", USER_ID) == ("Machine Shoulder Press", "trigram")
+    conn.fetch.assert_called_once()
+    conn.fetchrow.assert_not_called()
+
+
+async def test_memos_reload_after_ttl(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    conn.fetch.return_value = []
+    await resolve_exercise(conn, "barbell rows", USER_ID)
+    # Another process remembered a mapping
+    conn.fetch.return_value = [{"raw_key": "barbell rows", "exercise_name": "Machine Chest Press"}]
+    monkeypatch.setattr("app.exercise_resolver._MEMO_TTL", 0)
+    assert await resolve_exercise(conn, "barbell rows", USER_ID) == ("Machine Chest Press", "memo")
+
+
+async def test_correct_and_forget_drop_cached_memos(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    conn.fetch.return_value = [{"raw_key": "barbell rows", "exercise_name": "Machine Chest Press"}]
+    await resolve_exercise(conn, "barbell rows", USER_ID)
+
+    conn.fetchval.return_value = "Barbell Row"
+    assert await correct_resolution(conn, USER_ID, " Barbell Rows ", "barbell row") == "Barbell Row"
+    assert conn.fetchval.call_args.args[1:] == (USER_ID, "Barbell Rows", "barbell row")
+    assert USER_ID not in _memos
+
+    conn.fetch.return_value = [{"raw_key": "barbell rows", "exercise_name": "Barbell Row"}]
+    assert await resolve_exercise(conn, "barbell rows", USER_ID) == ("Barbell Row", "memo")
+    conn.execute.return_value = "DELETE 1"
+    assert await forget_resolution(conn, USER_ID, "barbell rows")
+    assert USER_ID not in _memos
+    conn.execute.return_value = "DELETE 0"
+    assert not await forget_resolution(conn, USER_ID, "barbell rows")
+
+
+async def test_bulk_resolve_uses_memo(monkeypatch):
+    monkeypatch.setattr("app.exercise_resolver.catalog", await _loaded_catalog())
+    conn = AsyncMock()
+    conn.fetch.return_value = [{"raw_key": "barbell rows", "exercise_name": "Machine Chest Press"}]
+    result = await resolve_exercise_tiers(conn, ["barbell rows", "bench press"], USER_ID)
+    assert result == {"barbell rows": ("Machine Chest Press", "memo"), "bench press": ("Barbell Bench Press", "alias")}
+    conn.fetch.assert_called_once()
+
+
+async def test_bulk_resolve_reports_inserted_tier():
+    conn = AsyncMock()
+    conn.fetch.return_value = [{"raw": "Sled Push", "name": None, "tier": None}]
+    assert await resolve_exercise_tiers(conn, ["Sled Push"]) == {"Sled Push": ("Sled Push", "inserted")}
@@ -1,5 +1,8 @@
+import json
 import uuid
 from datetime import datetime, timezone
+from unittest.mock import MagicMock
+import asyncpg
 import pytest
 from httpx import AsyncClient
 
@@ -12,16 +15,13 @@ async def test_create_exercise_log(client: AsyncClient, mock_conn):
     log_id = uuid.uuid4()
     now = datetime.now(timezone.utc)
 
-    # Mock session validation + exercise resolver + set_number + fetch log
+    # Mock exercise resolver + validate/number/insert statement
     mock_conn.fetchrow.side_effect = [
-        # _validate_session
-        {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
-        # resolve_exercise_name: exact match
-        {"name": "Barbell Bench Press"},
-        # set_number query
-        {"next_set": 1},
-        # fetch created log
+        # resolve_exercise: exact match
+        {"name": "Barbell Bench Press", "tier": "exact", "sim": None},
+        # _LOG_SET_SQL
         {
+            "session_user_id": uuid.UUID(TEST_USER_ID), "session_status": "in_progress",
             "id": log_id, "user_id": uuid.UUID(TEST_USER_ID),
             "session_id": uuid.UUID(TEST_SESSION_ID), "exercise_name": "Barbell Bench Press",
             "set_number": 1, "weight_kg": 80.0, "reps": 8, "rpe": None, "notes": None,
@@ -42,6 +42,72 @@ async def test_create_exercise_log(client: AsyncClient, mock_conn):
     assert data["setNumber"] == 1
     assert data["weightKg"] == 80.0
     assert data["reps"] == 8
+    assert mock_conn.fetchrow.await_count == 2
+    mock_conn.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tier, resolved", [("trigram", "Barbell Bench Press"), ("inserted", "bench pres")])
+async def test_create_exercise_log_remembers_resolution(client: AsyncClient, mock_conn, tier, resolved):
+    now = datetime.now(timezone.utc)
+    mock_conn.fetchrow.side_effect = [
+        # resolve_exercise: fuzzy match, or no match at all (checked against the session before inserting)
+        *([{"name": resolved, "tier": tier, "sim": 0.5}] if tier == "trigram" else [
+            None, {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
+        ]),
+        {
+            "session_user_id": uuid.UUID(TEST_USER_ID), "session_status": "in_progress",
+            "id": uuid.uuid4(), "user_id": uuid.UUID(TEST_USER_ID),
+            "session_id": uuid.UUID(TEST_SESSION_ID), "exercise_name": resolved,
+            "set_number": 1, "weight_kg": 80.0, "reps": 8, "rpe": None, "notes": None,
+            "logged_at": now,
+        },
+    ]
+    resp = await client.post("/api/exercises/log", json={
+        "sessionId": TEST_SESSION_ID,
+        "exerciseName": "bench pres",
+        "weightKg": 80.0,
+        "reps": 8,
+    })
+    assert resp.status_code == 201
+    memo_sql, *memo_args = mock_conn.execute.call_args.args
+    assert "exercise_name_memos" in memo_sql
+    assert memo_args == [uuid.UUID(TEST_USER_ID), ["bench pres"], [resolved]]
+
+
+@pytest.mark.asyncio
+async def test_list_resolutions(client: AsyncClient, mock_conn):
+    now = datetime.now(timezone.utc)
+    mock_conn.fetch.return_value = [{"raw_key": "incline db", "exercise_name": "incline db", "updated_at": now}]
+    resp = await client.get("/api/exercises/resolutions")
+    assert resp.status_code == 200
+    assert resp.json() == [{"rawName": "incline db", "exerciseName": "incline db", "updatedAt": now.isoformat()}]
+
+
+@pytest.mark.asyncio
+async def test_correct_resolution(client: AsyncClient, mock_conn):
+    mock_conn.fetchval.return_value = "Incline Dumbbell Bench Press"
+    resp = await client.put("/api/exercises/resolutions", json={
+        "rawName": "Incline DB", "exerciseName": "incline dumbbell bench press",
+    })
+    assert resp.status_code == 200
+    assert resp.json() == {"rawName": "incline db", "exerciseName": "Incline Dumbbell Bench Press"}
+
+    mock_conn.fetchval.return_value = None
+    resp = await client.put("/api/exercises/resolutions", json={"rawName": "incline db", "exerciseName": "Nope"})
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_resolution(client: AsyncClient, mock_conn):
+    mock_conn.execute.return_value = "DELETE 1"
+    resp = await client.delete("/api/exercises/resolutions", params={"raw_name": "incline db"})
+    assert resp.status_code == 204
+    assert mock_conn.execute.call_args.args[1:] == (uuid.UUID(TEST_USER_ID), "incline db")
+
+    mock_conn.execute.return_value = "DELETE 0"
+    resp = await client.delete("/api/exercises/resolutions", params={"raw_name": "incline db"})
+    assert resp.status_code == 404
 
 
 @pytest.mark.asyncio
@@ -105,14 +171,11 @@ async def test_create_cardio_log(client: AsyncClient, mock_conn):
     now = datetime.now(timezone.utc)
 
     mock_conn.fetchrow.side_effect = [
-        # _validate_session
-        {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
-        # resolve_exercise_name: exact match
-        {"name": "Treadmill Run"},
-        # set_number query
-        {"next_set": 1},
-        # fetch created log
+        # resolve_exercise: exact match
+        {"name": "Treadmill Run", "tier": "exact", "sim": None},
+        # _LOG_SET_SQL
         {
+            "session_user_id": uuid.UUID(TEST_USER_ID), "session_status": "in_progress",
             "id": log_id, "user_id": uuid.UUID(TEST_USER_ID),
             "session_id": uuid.UUID(TEST_SESSION_ID), "exercise_name": "Treadmill Run",
             "set_number": 1, "weight_kg": None, "reps": None, "rpe": 6.0,
@@ -173,3 +236,252 @@ async def test_create_log_wrong_session(client: AsyncClient, mock_conn):
         "reps": 5,
     })
     assert resp.status_code == 404
+
+
+def _session_only_row(user_id: str, status: str) -> dict:
+    """_LOG_SET_SQL result when the session exists but nothing was inserted."""
+    return {
+        "session_user_id": uuid.UUID(user_id), "session_status": status,
+        "id": None, "user_id": None, "session_id": None, "exercise_name": None,
+        "set_number": None, "logged_at": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_log_other_users_session(client: AsyncClient, mock_conn):
+    mock_conn.fetchrow.side_effect = [
+        {"name": "Squat", "tier": "exact", "sim": None},
+        _session_only_row("00000000-0000-0000-0000-000000000001", "in_progress"),
+    ]
+
+    resp = await client.post("/api/exercises/log", json={
+        "sessionId": TEST_SESSION_ID,
+        "exerciseName": "Squat",
+    })
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_log_session_not_in_progress(client: AsyncClient, mock_conn):
+    mock_conn.fetchrow.side_effect = [
+        {"name": "Squat", "tier": "exact", "sim": None},
+        _session_only_row(TEST_USER_ID, "completed"),
+    ]
+
+    resp = await client.post("/api/exercises/log", json={
+        "sessionId": TEST_SESSION_ID,
+        "exerciseName": "Squat",
+    })
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_create_log_retries_set_number_collision(client: AsyncClient, mock_conn):
+    """A concurrent insert that took the same set number is retried, not duplicated."""
+    now = datetime.now(timezone.utc)
+    mock_conn.fetchrow.side_effect = [
+        {"name": "Squat", "tier": "exact", "sim": None},
+        asyncpg.UniqueViolationError("duplicate key"),
+        {
+            "session_user_id": uuid.UUID(TEST_USER_ID), "session_status": "in_progress",
+            "id": uuid.uuid4(), "user_id": uuid.UUID(TEST_USER_ID),
+            "session_id": uuid.UUID(TEST_SESSION_ID), "exercise_name": "Squat",
+            "set_number": 2, "weight_kg": 100.0, "reps": 5, "rpe": None, "notes": None,
+            "logged_at": now,
+        },
+    ]
+
+    resp = await client.post("/api/exercises/log", json={
+        "sessionId": TEST_SESSION_ID,
+        "exerciseName": "Squat",
+        "weightKg": 100,
+        "reps": 5,
+    })
+    assert resp.status_code == 201
+    assert resp.json()["setNumber"] == 2
+
+
+@pytest.mark.asyncio
+async def test_create_logs_batch(client: AsyncClient, mock_conn):
+    now = datetime.now(timezone.utc)
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetchrow.return_value = {"user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"}
+    queries = []
+
+    async def _fetch(sql, *args):
+        queries.append(sql)
+        if len(queries) == 1:
+            # resolve_exercise_names: one bulk query
+            return [
+                {"raw": "bench", "name": "Barbell Bench Press", "tier": "alias"},
+                {"raw": "Plank", "name": "Plank", "tier": "exact"},
+            ]
+        user_id, session_id, ids, names, *cols = args
+        round_numbers = cols[-2]
+        # Rows come back out of order; the response must follow request order
+        return [
+            {
+                "id": log_id, "user_id": user_id, "session_id": session_id, "exercise_name": name,
+                "set_number": 1, "round_number": rnd, "logged_at": now,
+            }
+            for log_id, name, rnd in reversed(list(zip(ids, names, round_numbers)))
+        ]
+
+    mock_conn.fetch = _fetch
+
+    resp = await client.post("/api/exercises/log/batch", json={
+        "sessionId": TEST_SESSION_ID,
+        "sets": [
+            {"exerciseName": "bench", "roundNumber": 1},
+            {"exerciseName": "Plank", "roundNumber": 1},
+            {"exerciseName": "bench", "roundNumber": 2},
+        ],
+    })
+    assert resp.status_code == 201
+    data = resp.json()
+    assert [(d["exerciseName"], d["roundNumber"]) for d in data] == [
+        ("Barbell Bench Press", 1), ("Plank", 1), ("Barbell Bench Press", 2),
+    ]
+    assert len(queries) == 2
+    mock_conn.fetchrow.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_logs_batch_session_not_in_progress(client: AsyncClient, mock_conn):
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetch.return_value = [{"raw": "Plank", "name": "Plank", "tier": "exact"}]
+    mock_conn.fetchrow.return_value = {"user_id": uuid.UUID(TEST_USER_ID), "status": "completed"}
+
+    resp = await client.post("/api/exercises/log/batch", json={
+        "sessionId": TEST_SESSION_ID,
+        "sets": [{"exerciseName": "Plank", "durationSeconds": 60}],
+    })
+    assert resp.status_code == 400
+    mock_conn.fetch.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_create_logs_batch_foreign_session_inserts_no_exercises(client: AsyncClient, mock_conn):
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetch.return_value = [{"raw": "Sled Push", "name": None, "tier": None}]
+    mock_conn.fetchrow.return_value = None
+
+    resp = await client.post("/api/exercises/log/batch", json={
+        "sessionId": TEST_SESSION_ID,
+        "sets": [{"exerciseName": "Sled Push", "distanceM": 20}],
+    })
+    assert resp.status_code == 404
+    mock_conn.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_exercise_log_foreign_session_inserts_no_exercise(client: AsyncClient, mock_conn):
+    mock_conn.fetchrow.side_effect = [
+        None,  # resolve_exercise: no match
+        {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.uuid4(), "status": "in_progress"},
+    ]
+    resp = await client.post("/api/exercises/log", json={
+        "sessionId": TEST_SESSION_ID, "exerciseName": "Sled Push", "distanceM": 20,
+    })
+    assert resp.status_code == 404
+    mock_conn.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_create_logs_batch_empty(client: AsyncClient, mock_conn):
+    resp = await client.post("/api/exercises/log/batch", json={"sessionId": TEST_SESSION_ID, "sets": []})
+    assert resp.status_code == 400
+
+
+def _log_row(exercise_name: str, set_number: int, weight_kg: float, session_id: str = TEST_SESSION_ID) -> dict:
+    return {
+        "id": uuid.uuid4(), "user_id": uuid.UUID(TEST_USER_ID), "session_id": uuid.UUID(session_id),
+        "exercise_name": exercise_name, "set_number": set_number, "weight_kg": weight_kg, "reps": 8,
+        "rpe": None, "distance_m": None, "duration_seconds": None, "round_number": None,
+        "notes": None, "logged_at": datetime.now(timezone.utc),
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_session_logs_grouped_by_exercise(client: AsyncClient, mock_conn):
+    mock_conn.fetch.return_value = [
+        _log_row("Barbell Bench Press", 1, 80.0),
+        _log_row("Barbell Bench Press", 2, 82.5),
+        _log_row("Barbell Row", 1, 60.0),
+    ]
+    resp = await client.get(f"/api/exercises/log/session/{TEST_SESSION_ID}")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert list(data) == ["Barbell Bench Press", "Barbell Row"]
+    assert [s["weightKg"] for s in data["Barbell Bench Press"]] == [80.0, 82.5]
+    assert mock_conn.fetch.await_count == 1
+    mock_conn.fetchrow.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_session_logs_empty_session(client: AsyncClient, mock_conn):
+    mock_conn.fetch.return_value = [{k: None for k in _log_row("x", 1, 0.0)}]
+    resp = await client.get(f"/api/exercises/log/session/{TEST_SESSION_ID}")
+    assert resp.status_code == 200
+    assert resp.json() == {}
+
+
+@pytest.mark.asyncio
+async def test_list_session_logs_not_found(client: AsyncClient, mock_conn):
+    mock_conn.fetch.return_value = []
+    resp = await client.get(f"/api/exercises/log/session/{TEST_SESSION_ID}")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_exercise_log_idempotency_key_first_request(client: AsyncClient, mock_conn):
+    mock_conn.transaction = MagicMock()
+    log = _log_row("Barbell Bench Press", 1, 80.0)
+    mock_conn.fetchrow.side_effect = [
+        {"name": "Barbell Bench Press", "tier": "exact", "sim": None},
+        {"session_user_id": uuid.UUID(TEST_USER_ID), "session_status": "in_progress", **log},
+    ]
+    mock_conn.fetchval.return_value = "retry-1"  # key claimed
+
+    resp = await client.post(
+        "/api/exercises/log",
+        json={"sessionId": TEST_SESSION_ID, "exerciseName": "Barbell Bench Press", "weightKg": 80.0, "reps": 8},
+        headers={"Idempotency-Key": "retry-1"},
+    )
+    assert resp.status_code == 201
+    assert resp.json()["id"] == str(log["id"])
+    # The response is stored under the key in the same transaction
+    store = mock_conn.execute.call_args
+    assert store.args[1:3] == (uuid.UUID(TEST_USER_ID), "retry-1")
+    assert json.loads(store.args[3]) == resp.json()
+
+
+@pytest.mark.asyncio
+async def test_create_exercise_log_idempotency_key_replay(client: AsyncClient, mock_conn):
+    import hashlib
+    from app.routes.exercises import LogSetRequest
+
+    mock_conn.transaction = MagicMock()
+    payload = {"sessionId": TEST_SESSION_ID, "exerciseName": "Barbell Bench Press", "weightKg": 80.0, "reps": 8}
+    stored = {"id": str(uuid.uuid4()), "exerciseName": "Barbell Bench Press", "setNumber": 1}
+    request_hash = hashlib.sha256(LogSetRequest(**payload).model_dump_json().encode()).hexdigest()
+    mock_conn.fetchrow.side_effect = [
+        {"name": "Barbell Bench Press", "tier": "exact", "sim": None},
+        {"request_hash": request_hash, "response": json.dumps(stored)},
+    ]
+    mock_conn.fetchval.return_value = None  # key already used
+
+    resp = await client.post("/api/exercises/log", json=payload, headers={"Idempotency-Key": "retry-1"})
+    assert resp.status_code == 201
+    assert resp.json() == stored
+    mock_conn.execute.assert_not_called()
+
+    # Same key, different set: rejected rather than replayed
+    mock_conn.fetchrow.side_effect = [
+        {"name": "Barbell Bench Press", "tier": "exact", "sim": None},
+        {"request_hash": request_hash, "response": json.dumps(stored)},
+    ]
+    resp = await client.post(
+        "/api/exercises/log", json={**payload, "weightKg": 85.0}, headers={"Idempotency-Key": "retry-1"}
+    )
+    assert resp.status_code == 422
@@ -0,0 +1,77 @@
+import os
+from datetime import date
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.partitioning import PARTITION_MONTHS_AHEAD, detach_partitions, ensure_partitions
+
+pytestmark = pytest.mark.anyio
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+needs_db = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+async def test_ensure_partitions_creates_months_ahead():
+    conn = AsyncMock()
+    conn.fetchval.return_value = 1
+    assert await ensure_partitions(conn) == 1
+    assert conn.fetchval.call_args.args[1] == PARTITION_MONTHS_AHEAD
+
+
+async def test_detach_partitions_before_month():
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {"relname": "exercise_logs_2024_11"},
+        {"relname": "exercise_logs_2024_12"},
+        {"relname": "exercise_logs_2025_01"},
+        {"relname": "exercise_logs_2025_02"},
+    ]
+    detached = await detach_partitions(conn, date(2025, 1, 1))
+    assert detached == ["exercise_logs_2024_11", "exercise_logs_2024_12"]
+    assert [c.args[0] for c in conn.execute.call_args_list] == [
+        'ALTER TABLE exercise_logs DETACH PARTITION "exercise_logs_2024_11"',
+        'ALTER TABLE exercise_logs DETACH PARTITION "exercise_logs_2024_12"',
+    ]
+
+
+@needs_db
+async def test_set_numbers_locked_across_partitions():
+    import asyncpg
+    from app.main import _SCHEMA_SQL
+    from app.routes.exercises import _LOG_SET_SQL
+
+    db_conn = await asyncpg.connect(dsn=TEST_DATABASE_URL)
+    tr = db_conn.transaction()
+    await tr.start()
+    try:
+        await db_conn.execute(_SCHEMA_SQL)
+        if await db_conn.fetchval("SELECT relkind FROM pg_class WHERE oid = 'exercise_logs'::regclass") != b"p":
+            pytest.skip("exercise_logs is not partitioned")
+        await db_conn.execute("SELECT create_exercise_logs_partition((date_trunc('month', NOW()) - INTERVAL '1 month')::date)")
+        user_id = await db_conn.fetchval("INSERT INTO profiles (email) VALUES ('partition-lock@example.com') RETURNING id")
+        session_id = await db_conn.fetchval(
+            """INSERT INTO workout_sessions (user_id, scheduled_date, title, status, exercises)
+               VALUES ($1, CURRENT_DATE, 'Legs', 'in_progress', '[]') RETURNING id""",
+            user_id,
+        )
+        args = (session_id, user_id, "Squat", 100, 5, None, None, None, None, None)
+        advisory_locks = """SELECT COUNT(*) FROM pg_locks
+                            WHERE locktype = 'advisory' AND pid = pg_backend_pid() AND granted"""
+        locks_before = await db_conn.fetchval(advisory_locks)
+
+        first = await db_conn.fetchrow(_LOG_SET_SQL, *args)
+        # Last month's partition: its unique index can't see this month's sets
+        await db_conn.execute(
+            "UPDATE exercise_logs SET logged_at = date_trunc('month', NOW()) - INTERVAL '1 minute' WHERE id = $1",
+            first["id"],
+        )
+        second = await db_conn.fetchrow(_LOG_SET_SQL, *args)
+        assert (first["set_number"], second["set_number"]) == (1, 2)
+
+        # One (session, exercise) lock, held to commit: a concurrent insert
+        # waits for it and then numbers after ours
+        assert await db_conn.fetchval(advisory_locks) == locks_before + 1
+    finally:
+        await tr.rollback()
+        await db_conn.close()
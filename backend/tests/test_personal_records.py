@@ -0,0 +1,103 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.personal_records import backfill_personal_records, get_personal_records, rebuild_personal_records
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_records_grouped_by_exercise():
+    achieved = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {"exercise_name": "Treadmill Run", "record_type": "max_distance", "value": 5000,
+         "weight_kg": None, "reps": None, "achieved_at": achieved},
+        {"exercise_name": "Treadmill Run", "record_type": "max_duration", "value": 1800,
+         "weight_kg": None, "reps": None, "achieved_at": achieved},
+    ]
+    records = await get_personal_records(conn, uuid.uuid4())
+    assert records == {
+        "Treadmill Run": {
+            "max_distance": {"value": 5000.0, "weight_kg": None, "reps": None, "achieved_at": achieved.isoformat()},
+            "max_duration": {"value": 1800.0, "weight_kg": None, "reps": None, "achieved_at": achieved.isoformat()},
+        }
+    }
+
+
+async def test_rebuild_scoped_to_user():
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.execute.side_effect = ["LOCK TABLE", "DELETE 2", "INSERT 0 5", "DELETE 1", "INSERT 0 3"]
+    user_id = uuid.uuid4()
+    assert await rebuild_personal_records(conn, user_id) == 5
+    _, *writes = conn.execute.call_args_list
+    assert ["rep_records" in w.args[0] for w in writes] == [False, False, True, True]
+    assert all(w.args[1:] == (user_id,) for w in writes)
+
+
+async def test_backfill_skips_populated_tables():
+    conn = AsyncMock()
+    conn.fetchval.return_value = False
+    await backfill_personal_records(conn)
+    assert "rep_records" in conn.fetchval.call_args.args[0]
+    conn.execute.assert_not_called()
+
+
+async def test_rep_records_listed_per_weight():
+    achieved = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    conn = AsyncMock()
+    conn.fetch.return_value = [
+        {"exercise_name": "Barbell Bench Press", "record_type": "max_reps", "value": 20,
+         "weight_kg": 20, "reps": 20, "achieved_at": achieved},
+        {"exercise_name": "Barbell Bench Press", "record_type": "reps_at_weight", "value": 8,
+         "weight_kg": 100, "reps": 8, "achieved_at": achieved},
+        {"exercise_name": "Barbell Bench Press", "record_type": "reps_at_weight", "value": 20,
+         "weight_kg": 20, "reps": 20, "achieved_at": achieved},
+    ]
+    [bench] = (await get_personal_records(conn, uuid.uuid4())).values()
+    assert bench["max_reps"]["reps"] == 20
+    assert [(r["weight_kg"], r["reps"]) for r in bench["reps_at_weight"]] == [(100.0, 8), (20.0, 20)]
+
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+async def test_heavier_rep_records_survive_light_sets():
+    """Against a scratch database (changes are rolled back), like test_query_plans."""
+    import asyncpg
+    from app.main import _SCHEMA_SQL
+
+    conn = await asyncpg.connect(dsn=TEST_DATABASE_URL)
+    tr = conn.transaction()
+    await tr.start()
+    try:
+        await conn.execute(_SCHEMA_SQL)
+        user_id = await conn.fetchval("INSERT INTO profiles (email) VALUES ('reps@example.com') RETURNING id")
+
+        async def log(weight, reps):
+            return await conn.fetchval(
+                """INSERT INTO exercise_logs (user_id, exercise_name, set_number, weight_kg, reps)
+                   VALUES ($1, 'Barbell Bench Press', 1, $2, $3) RETURNING id""",
+                user_id, weight, reps,
+            )
+
+        await log(20, 20)
+        await log(100, 6)
+        best_at_100 = await log(100, 8)
+        await log(100, 7)
+        await log(None, 12)
+        records = (await get_personal_records(conn, user_id))["Barbell Bench Press"]
+        assert records["max_reps"]["reps"] == 20
+        assert [(r["weight_kg"], r["reps"]) for r in records["reps_at_weight"]] == [(100.0, 8), (20.0, 20), (0.0, 12)]
+
+        await conn.execute("DELETE FROM exercise_logs WHERE id = $1", best_at_100)
+        records = (await get_personal_records(conn, user_id))["Barbell Bench Press"]
+        assert records["reps_at_weight"][0]["reps"] == 7
+    finally:
+        await tr.rollback()
+        await conn.close()
@@ -1,5 +1,5 @@
 import pytest
-from datetime import date
+from datetime import date, datetime, timezone
 
 pytestmark = pytest.mark.anyio
 
@@ -26,10 +26,10 @@ async def test_list_exercise_names_empty(client, mock_conn):
 
 async def test_exercise_history(client, mock_conn):
     # Mock resolver: fetchrow returns exact match
-    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME}
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
     # Mock history query
     mock_conn.fetch.return_value = [
-        {"session_date": date(2026, 1, 5), "max_weight": 70.0, "best_reps": 10, "total_sets": 4},
+        {"session_date": date(2026, 1, 5), "max_weight": 70.0, "best_reps": 10, "total_sets": 4, "volume_kg": 2800.0},
         {"session_date": date(2026, 1, 12), "max_weight": 72.5, "best_reps": 8, "total_sets": 3},
     ]
     resp = await client.get("/api/exercises/history", params={"exercise_name": "bench press", "days": 90})
@@ -39,10 +39,11 @@ async def test_exercise_history(client, mock_conn):
     assert len(data["dataPoints"]) == 2
     assert data["dataPoints"][0]["maxWeight"] == 70.0
     assert data["dataPoints"][0]["date"] == "2026-01-05"
+    assert data["dataPoints"][0]["volumeKg"] == 2800.0
 
 
 async def test_exercise_history_detail(client, mock_conn):
-    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME}
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
     mock_conn.fetch.return_value = [
         {"session_date": date(2026, 1, 12), "set_number": 1, "weight_kg": 72.5, "reps": 10, "rpe": 7.0},
         {"session_date": date(2026, 1, 12), "set_number": 2, "weight_kg": 72.5, "reps": 8, "rpe": 8.0},
@@ -57,3 +58,161 @@ async def test_exercise_history_detail(client, mock_conn):
     assert data[1]["date"] == "2026-01-19"
     assert len(data[1]["sets"]) == 1
     assert data[0]["sets"][0]["weightKg"] == 72.5
+
+
+async def test_exercise_history_detail_page(client, mock_conn):
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
+    mock_conn.fetch.return_value = [
+        {"session_date": date(2026, 1, 19), "set_number": 1, "weight_kg": 75.0, "reps": 8, "rpe": None},
+        {"session_date": date(2026, 1, 12), "set_number": 1, "weight_kg": 72.5, "reps": 10, "rpe": 7.0},
+        {"session_date": date(2026, 1, 12), "set_number": 2, "weight_kg": 72.5, "reps": 8, "rpe": 8.0},
+    ]
+    resp = await client.get(
+        "/api/exercises/history/detail",
+        params={"exercise_name": "bench press", "limit": 2, "before": "2026-01-26"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [d["date"] for d in data["days"]] == ["2026-01-19", "2026-01-12"]
+    assert data["nextCursor"] == "2026-01-12"
+    assert mock_conn.fetch.call_args.args[4:] == (date(2026, 1, 26), 2)
+
+
+async def test_exercise_history_detail_last_page(client, mock_conn):
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
+    mock_conn.fetch.return_value = [
+        {"session_date": date(2026, 1, 5), "set_number": 1, "weight_kg": 70.0, "reps": 10, "rpe": None},
+    ]
+    resp = await client.get("/api/exercises/history/detail", params={"exercise_name": "bench press", "limit": 2})
+    assert resp.status_code == 200
+    assert resp.json()["nextCursor"] is None
+
+
+async def test_exercise_history_max_points(client, mock_conn):
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
+    start = date(2024, 1, 1).toordinal()
+    mock_conn.fetch.return_value = [
+        {"session_date": date.fromordinal(start + i), "max_weight": 100.0 if i == 300 else 60.0 + i % 5,
+         "best_reps": 8, "total_sets": 3, "volume_kg": 1500.0}
+        for i in range(700)
+    ]
+    resp = await client.get("/api/exercises/history", params={"exercise_name": "bench press", "days": 9999, "max_points": 50})
+    assert resp.status_code == 200
+    points = resp.json()["dataPoints"]
+    assert len(points) == 50
+    assert points[0]["date"] == "2024-01-01"
+    assert max(p["maxWeight"] for p in points) == 100.0
+
+
+async def test_exercise_history_not_modified(client, mock_conn):
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
+    mock_conn.fetchval.return_value = "12:4410237"
+    mock_conn.fetch.return_value = []
+    params = {"exercise_name": "bench press"}
+    etag = (await client.get("/api/exercises/history", params=params)).headers["etag"]
+
+    mock_conn.fetch.reset_mock()
+    resp = await client.get("/api/exercises/history", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == etag
+    mock_conn.fetch.assert_not_awaited()
+
+    # A new log changes the fingerprint, and so the ETag
+    mock_conn.fetchval.return_value = "13:9120455"
+    resp = await client.get("/api/exercises/history", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+async def test_exercise_history_batch(client, mock_conn):
+    mock_conn.fetch.side_effect = [
+        # resolve_exercise_names: one bulk query
+        [
+            {"raw": "bench press", "name": EXERCISE_NAME, "tier": "alias"},
+            {"raw": "squats", "name": "Barbell Back Squat", "tier": "trigram"},
+            {"raw": "Barbell Bench Press", "name": EXERCISE_NAME, "tier": "exact"},
+        ],
+        # one grouped history query
+        [
+            {"exercise_name": "Barbell Back Squat", "session_date": date(2026, 1, 6), "max_weight": 100.0,
+             "best_reps": 5, "total_sets": 5, "volume_kg": 2500.0},
+            {"exercise_name": EXERCISE_NAME, "session_date": date(2026, 1, 5), "max_weight": 70.0,
+             "best_reps": 10, "total_sets": 4, "volume_kg": 2800.0},
+        ],
+    ]
+    resp = await client.get(
+        "/api/exercises/history/batch",
+        params=[("exercise_names", "bench press"), ("exercise_names", "squats"),
+                ("exercise_names", "Barbell Bench Press")],
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [s["exerciseName"] for s in data] == [EXERCISE_NAME, "Barbell Back Squat"]
+    assert data[0]["dataPoints"][0]["maxWeight"] == 70.0
+    assert data[1]["dataPoints"][0]["bestReps"] == 5
+    assert mock_conn.fetch.await_count == 2
+    assert mock_conn.fetch.call_args.args[2] == [EXERCISE_NAME, "Barbell Back Squat"]
+
+
+async def test_personal_records(client, mock_conn):
+    achieved = datetime(2026, 1, 12, 18, 30, tzinfo=timezone.utc)
+    mock_conn.fetchrow.return_value = {"name": EXERCISE_NAME, "tier": "exact", "sim": None}
+    mock_conn.fetch.return_value = [
+        {"exercise_name": EXERCISE_NAME, "record_type": "max_weight", "value": 100.0,
+         "weight_kg": 100.0, "reps": 3, "achieved_at": achieved},
+        {"exercise_name": EXERCISE_NAME, "record_type": "e1rm", "value": 110.0,
+         "weight_kg": 100.0, "reps": 3, "achieved_at": achieved},
+        {"exercise_name": EXERCISE_NAME, "record_type": "reps_at_weight", "value": 3,
+         "weight_kg": 100.0, "reps": 3, "achieved_at": achieved},
+        {"exercise_name": EXERCISE_NAME, "record_type": "reps_at_weight", "value": 20,
+         "weight_kg": 20.0, "reps": 20, "achieved_at": achieved},
+    ]
+    resp = await client.get("/api/exercises/records", params={"exercise_name": "bench press"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data == [{
+        "exerciseName": EXERCISE_NAME,
+        "records": {
+            "maxWeight": {"value": 100.0, "weightKg": 100.0, "reps": 3, "achievedAt": achieved.isoformat()},
+            "e1rm": {"value": 110.0, "weightKg": 100.0, "reps": 3, "achievedAt": achieved.isoformat()},
+        },
+        "repsAtWeight": [
+            {"value": 3.0, "weightKg": 100.0, "reps": 3, "achievedAt": achieved.isoformat()},
+            {"value": 20.0, "weightKg": 20.0, "reps": 20, "achievedAt": achieved.isoformat()},
+        ],
+    }]
+    assert mock_conn.fetch.call_args.args[2] == [EXERCISE_NAME]
+
+
+async def test_personal_records_all_exercises(client, mock_conn):
+    mock_conn.fetch.return_value = []
+    resp = await client.get("/api/exercises/records")
+    assert resp.status_code == 200
+    assert resp.json() == []
+    assert mock_conn.fetch.call_args.args[2] is None
+    mock_conn.fetchrow.assert_not_called()
+
+
+async def test_analytics(client, mock_conn):
+    mock_conn.fetchrow.return_value = {
+        "today": 20_000,
+        "exercise": [EXERCISE_NAME] * 3,
+        "muscle_group": ["chest"] * 3,
+        "day": [19_986, 19_993, 20_000],
+        "weight": [80.0, 82.5, 85.0],
+        "reps": [5, 5, 5],
+        "rpe": [8.0, None, 8.5],
+    }
+    resp = await client.get("/api/exercises/analytics", params={"days": 30})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["windowDays"] == 30
+    [bench] = data["exercises"]
+    assert bench["exerciseName"] == EXERCISE_NAME
+    assert bench["sessions"] == 3
+    assert bench["latestE1rm"] == 99.2
+    assert bench["e1rmTrendKgPerWeek"] == pytest.approx(2.92)
+    assert bench["rpeDriftPerWeek"] is None  # only two days with RPE
+    assert {w["weekStart"] for w in data["weeklyVolume"]} == {"2024-09-16", "2024-09-23", "2024-09-30"}
+    assert mock_conn.fetchrow.await_count == 1
+    assert mock_conn.fetchrow.call_args.args[2] == 30
@@ -0,0 +1,198 @@
+"""Query-plan regression tests for the session-scoped exercise_logs queries.
+
+Runs EXPLAIN against a real Postgres loaded with a realistic amount of data
+and fails if any of these queries falls back to a sequential scan of a large
+table. Skipped unless TEST_DATABASE_URL points at a scratch database; all
+changes are made inside a transaction that is rolled back.
+
+    TEST_DATABASE_URL=postgresql://localhost/gym_test pytest tests/test_query_plans.py
+"""
+import json
+import os
+import uuid
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+_MIN_LARGE_ROWS = 1000
+_USERS = 50
+_SESSIONS_PER_USER = 40
+_SETS_PER_SESSION = 24
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+SESSION_ID = uuid.UUID("00000000-0000-0000-0000-0000000000aa")
+
+
+@pytest.fixture
+async def plan_conn():
+    import asyncpg
+    from app.main import _SCHEMA_SQL
+
+    conn = await asyncpg.connect(dsn=TEST_DATABASE_URL)
+    tr = conn.transaction()
+    await tr.start()
+    try:
+        await conn.execute(_SCHEMA_SQL)
+        await conn.execute(
+            """INSERT INTO profiles (id, email)
+               SELECT CASE WHEN u = 1 THEN $1 ELSE gen_random_uuid() END, 'plan-' || u || '@example.com'
+               FROM generate_series(1, $2) AS u""",
+            USER_ID, _USERS,
+        )
+        await conn.execute(
+            """INSERT INTO workout_sessions (id, user_id, scheduled_date, title, status, exercises)
+               SELECT CASE WHEN p.id = $1 AND s = 1 THEN $2 ELSE gen_random_uuid() END,
+                      p.id, CURRENT_DATE - s, 'Session ' || s, 'in_progress', '[]'
+               FROM profiles p, generate_series(1, $3) AS s
+               WHERE p.email LIKE 'plan-%'""",
+            USER_ID, SESSION_ID, _SESSIONS_PER_USER,
+        )
+        await conn.execute(
+            """INSERT INTO exercise_logs (user_id, session_id, exercise_name, set_number, weight_kg, reps, logged_at)
+               SELECT s.user_id, s.id, 'Exercise ' || (n % 6), n / 6 + 1, 60 + n, 8,
+                      s.scheduled_date + make_interval(mins => n)
+               FROM workout_sessions s, generate_series(0, $1 - 1) AS n
+               WHERE s.title LIKE 'Session %'""",
+            _SETS_PER_SESSION,
+        )
+        await conn.execute("ANALYZE profiles, workout_sessions, exercise_logs")
+        yield conn
+    finally:
+        await tr.rollback()
+        await conn.close()
+
+
+def _seq_scans(plan: dict, large: set[str]) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in large:
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child, large))
+    return found
+
+
+def _queries() -> list[tuple[str, str, tuple]]:
+    from app.routes.exercises import _LIST_LOGS_SQL, _LOG_SET_BATCH_SQL, _LOG_SET_SQL, _SESSION_LOGS_SQL
+    from app.routes.sessions import _DELETE_SESSION_LOGS_SQL, _PREVIOUS_SETS_SQL
+    from app.routes.sync import _SYNC_LOGS_SQL, _SYNC_SESSIONS_SQL
+    from app.routes.voice import _SESSION_SETS_SQL
+
+    return [
+        (
+            "create_exercise_log",
+            _LOG_SET_SQL,
+            (SESSION_ID, USER_ID, "Exercise 1", 80.0, 8, None, None, None, None, None),
+        ),
+        (
+            "create_exercise_logs_batch",
+            _LOG_SET_BATCH_SQL,
+            (USER_ID, SESSION_ID, [uuid.uuid4()], ["Exercise 1"], [80.0], [8], [None], [None], [None], [None], [None]),
+        ),
+        (
+            "list_exercise_logs",
+            _LIST_LOGS_SQL,
+            (SESSION_ID, "Exercise 1", USER_ID),
+        ),
+        (
+            "list_session_logs",
+            _SESSION_LOGS_SQL,
+            (SESSION_ID, USER_ID),
+        ),
+        (
+            "get_workout previous sets",
+            _PREVIOUS_SETS_SQL,
+            (USER_ID, ["Exercise 1", "Exercise 2"], SESSION_ID),
+        ),
+        (
+            "voice_parse previous sets",
+            _SESSION_SETS_SQL,
+            (SESSION_ID, "Exercise 1"),
+        ),
+        (
+            "sync sessions",
+            _SYNC_SESSIONS_SQL,
+            (USER_ID, 1, 501),
+        ),
+        (
+            "sync logs",
+            _SYNC_LOGS_SQL,
+            (USER_ID, 1, 501),
+        ),
+        (
+            "delete_session",
+            _DELETE_SESSION_LOGS_SQL,
+            (SESSION_ID,),
+        ),
+    ]
+
+
+async def test_session_queries_use_indexes(plan_conn):
+    # By size rather than name: exercise_logs may be partitioned, and scanning
+    # its empty future-month partitions is free
+    large = {
+        r["relname"]
+        for r in await plan_conn.fetch("SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= $1", _MIN_LARGE_ROWS)
+    }
+    assert "workout_sessions" in large
+
+    failures = []
+    for label, sql, args in _queries():
+        plan = json.loads(await plan_conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *args))
+        scans = _seq_scans(plan[0]["Plan"], large)
+        if scans:
+            failures.append(f"{label}: seq scan on {', '.join(scans)}")
+    assert not failures, "\n".join(failures)
+
+
+def _nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _nodes(child)
+
+
+async def test_resolver_skips_trigram_scan_after_direct_hit(plan_conn):
+    from app.exercise_resolver import _RESOLVE_SQL
+
+    await plan_conn.execute("INSERT INTO exercises (name) VALUES ('Exercise 1') ON CONFLICT (name) DO NOTHING")
+    plan = json.loads(await plan_conn.fetchval(f"EXPLAIN (ANALYZE, FORMAT JSON) {_RESOLVE_SQL}", "exercise 1", None, USER_ID))
+    trigram_scans = [
+        node for node in _nodes(plan[0]["Plan"])
+        if node.get("Relation Name") == "exercises"
+        and "similarity" in node.get("Filter", "") + node.get("Index Cond", "") + node.get("Recheck Cond", "")
+    ]
+    assert trigram_scans
+    assert all(node["Actual Loops"] == 0 for node in trigram_scans)
+
+
+async def test_history_fingerprint_reads_only_the_rollup(plan_conn):
+    from app.etags import _HISTORY_SQL
+
+    await plan_conn.execute("ANALYZE exercise_daily_stats")
+    plan = json.loads(await plan_conn.fetchval(f"EXPLAIN (FORMAT JSON) {_HISTORY_SQL}", USER_ID, "Exercise 1", 90))
+    relations = {node.get("Relation Name") for node in _nodes(plan[0]["Plan"])} - {None}
+    assert relations == {"exercise_daily_stats"}
+
+
+async def test_set_edits_restamp_the_rollup_day(plan_conn):
+    from app.etags import history_fingerprint
+
+    # Everything here runs in one transaction, so clear the stamps to see them set
+    await plan_conn.execute("UPDATE exercise_daily_stats SET change_xid = 0 WHERE user_id = $1", USER_ID)
+    before = await history_fingerprint(plan_conn, USER_ID, "Exercise 1", 90)
+    log_date = await plan_conn.fetchval(
+        """UPDATE exercise_logs SET rpe = 9
+           WHERE id = (SELECT id FROM exercise_logs
+                       WHERE session_id = $1 AND exercise_name = 'Exercise 1' LIMIT 1)
+           RETURNING DATE(logged_at)""",
+        SESSION_ID,
+    )
+    stamps = dict(await plan_conn.fetch(
+        "SELECT log_date, change_xid FROM exercise_daily_stats WHERE user_id = $1 AND exercise_name = 'Exercise 1'",
+        USER_ID,
+    ))
+    assert stamps.pop(log_date) != 0
+    assert set(stamps.values()) == {0}
+    assert await history_fingerprint(plan_conn, USER_ID, "Exercise 1", 90) != before
@@ -0,0 +1,123 @@
+import uuid
+from unittest.mock import patch
+
+import pytest
+from httpx import AsyncClient
+
+from app.session_cache import SessionCache, session_cache
+from tests.conftest import TEST_USER
+
+pytestmark = pytest.mark.anyio
+
+USER_ID = uuid.UUID(TEST_USER["user_id"])
+OTHER_USER_ID = uuid.UUID(int=7)
+
+
+def _listening_cache(**kwargs) -> SessionCache:
+    cache = SessionCache(**kwargs)
+    cache.listening = True
+    return cache
+
+
+def test_put_get_invalidate():
+    cache = _listening_cache()
+    cache.put(USER_ID, ("session", 1), cache.token(USER_ID), '"a"', {"id": 1})
+    cache.put(OTHER_USER_ID, ("session", 1), cache.token(OTHER_USER_ID), '"b"', {"id": 2})
+    assert cache.get(USER_ID, ("session", 1)).body == {"id": 1}
+
+    cache.invalidate(USER_ID)
+    assert cache.get(USER_ID, ("session", 1)) is None
+    assert cache.get(OTHER_USER_ID, ("session", 1)).etag == '"b"'
+
+
+def test_read_started_before_invalidation_is_not_stored():
+    cache = _listening_cache()
+    token = cache.token(USER_ID)
+    cache.invalidate(USER_ID)
+    cache.put(USER_ID, ("session", 1), token, '"a"', {"id": 1})
+    assert cache.get(USER_ID, ("session", 1)) is None
+
+    token = cache.token(USER_ID)
+    cache.clear()
+    cache.put(USER_ID, ("session", 1), token, '"a"', {"id": 1})
+    assert cache.get(USER_ID, ("session", 1)) is None
+
+
+def test_generations_bounded_without_reviving_old_tokens():
+    cache = _listening_cache(max_users=2)
+    token = cache.token(USER_ID)
+    cache.invalidate(USER_ID)
+    for i in range(10):
+        cache.invalidate(uuid.UUID(int=100 + i))
+    assert len(cache._generations) == 2
+    assert USER_ID not in cache._generations
+
+    cache.put(USER_ID, ("session", 1), token, '"a"', {"id": 1})
+    assert cache.get(USER_ID, ("session", 1)) is None
+    cache.put(USER_ID, ("session", 1), cache.token(USER_ID), '"a"', {"id": 1})
+    assert cache.get(USER_ID, ("session", 1)).body == {"id": 1}
+
+
+def test_nothing_served_without_listener():
+    cache = SessionCache()
+    cache.put(USER_ID, ("session", 1), cache.token(USER_ID), '"a"', {"id": 1})
+    assert cache.get(USER_ID, ("session", 1)) is None
+
+
+def test_ttl_and_lru_bounds():
+    cache = _listening_cache(max_users=1, max_entries_per_user=1, ttl=10)
+    with patch("app.session_cache.time.monotonic", return_value=100.0):
+        cache.put(USER_ID, ("session", 1), cache.token(USER_ID), '"a"', 1)
+        cache.put(USER_ID, ("session", 2), cache.token(USER_ID), '"b"', 2)
+    assert cache.get(USER_ID, ("session", 1)) is None
+    with patch("app.session_cache.time.monotonic", return_value=105.0):
+        assert cache.get(USER_ID, ("session", 2)).body == 2
+    with patch("app.session_cache.time.monotonic", return_value=111.0):
+        assert cache.get(USER_ID, ("session", 2)) is None
+
+    cache.put(USER_ID, ("session", 1), cache.token(USER_ID), '"a"', 1)
+    cache.put(OTHER_USER_ID, ("session", 1), cache.token(OTHER_USER_ID), '"b"', 2)
+    assert cache.get(USER_ID, ("session", 1)) is None
+
+
+def test_notify_payload_invalidates_user():
+    cache = _listening_cache()
+    cache.put(USER_ID, ("session", 1), cache.token(USER_ID), '"a"', 1)
+    cache._on_notify(None, 0, "session_changes", "not-a-uuid")
+    assert cache.get(USER_ID, ("session", 1)) is not None
+    cache._on_notify(None, 0, "session_changes", str(USER_ID))
+    assert cache.get(USER_ID, ("session", 1)) is None
+
+
+@pytest.fixture
+def listening():
+    session_cache.clear()
+    session_cache.listening = True
+    yield session_cache
+    session_cache.listening = False
+    session_cache.clear()
+
+
+async def test_repeat_week_read_skips_db(client: AsyncClient, mock_conn, listening):
+    mock_conn.fetchval.return_value = "0:0"
+    mock_conn.fetch.return_value = []
+    params = {"week_start": "2026-03-02"}
+
+    first = await client.get("/api/sessions", params=params)
+    assert first.status_code == 200
+    mock_conn.fetch.reset_mock()
+    mock_conn.fetchval.reset_mock()
+
+    resp = await client.get("/api/sessions", params=params)
+    assert resp.status_code == 200
+    assert resp.json() == first.json()
+    assert resp.headers["etag"] == first.headers["etag"]
+    mock_conn.fetchval.assert_not_awaited()
+    mock_conn.fetch.assert_not_awaited()
+
+    resp = await client.get("/api/sessions", params=params, headers={"If-None-Match": first.headers["etag"]})
+    assert resp.status_code == 304
+
+    listening.invalidate(USER_ID)
+    await client.get("/api/sessions", params=params)
+    mock_conn.fetch.assert_awaited_once()
@@ -0,0 +1,61 @@
+import json
+import uuid
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.routes.sessions import _to_camel
+from app.session_migration import migrate_batch, v1_to_groups
+
+pytestmark = pytest.mark.anyio
+
+SESSION_ID = uuid.UUID("11111111-1111-1111-1111-111111111111")
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000099")
+V1_EXERCISES = [
+    {"name": "Bench Press", "sets": 3, "reps": 8, "youtube_url": ""},
+    {"name": "Pull Up", "sets": 3, "reps": 10, "youtube_url": ""},
+]
+
+
+def _row(exercises, schema_version):
+    return {
+        "id": SESSION_ID, "user_id": USER_ID, "plan_id": None, "scheduled_date": date(2026, 3, 2),
+        "title": "Upper", "status": "scheduled", "exercises": json.dumps(exercises),
+        "started_at": None, "completed_at": None, "created_at": None, "schema_version": schema_version,
+    }
+
+
+def test_group_ids_are_stable_per_session():
+    groups = v1_to_groups(SESSION_ID, V1_EXERCISES)
+    assert groups == v1_to_groups(SESSION_ID, V1_EXERCISES)
+    assert len({g["group_id"] for g in groups}) == 2
+    assert groups[0]["group_id"] != v1_to_groups(uuid.uuid4(), V1_EXERCISES)[0]["group_id"]
+
+
+def test_v1_read_matches_migrated_row():
+    v1 = _row(V1_EXERCISES, 1)
+    migrated = _row(v1_to_groups(SESSION_ID, V1_EXERCISES), 2)
+    assert _to_camel(v1) == _to_camel(v1) == _to_camel(migrated)
+    assert _to_camel(v1)["exerciseGroups"][1]["timerConfig"] == {"mode": "standard", "restSeconds": 90}
+
+
+async def test_migrate_batch_rewrites_v1_rows():
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.fetch.return_value = [{"id": SESSION_ID, "exercises": json.dumps(V1_EXERCISES)}]
+
+    assert await migrate_batch(conn, batch_size=50) == 1
+    assert conn.fetch.call_args.args[1] == 50
+    sql, ids, groups = conn.execute.call_args.args
+    assert "schema_version = 2" in sql
+    assert ids == [SESSION_ID]
+    assert json.loads(groups[0]) == v1_to_groups(SESSION_ID, V1_EXERCISES)
+
+
+async def test_migrate_batch_nothing_left():
+    conn = AsyncMock()
+    conn.transaction = MagicMock()
+    conn.fetch.return_value = []
+    assert await migrate_batch(conn) == 0
+    conn.execute.assert_not_awaited()
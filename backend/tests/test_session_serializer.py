@@ -0,0 +1,67 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+
+from app.routes import sessions
+from app.routes.sessions import _group_to_camel, _timer_config_to_camel, _to_camel
+
+
+def test_timer_config_renames_in_fixed_order():
+    tc = {"rounds": 3, "prep_countdown_seconds": 5, "work_seconds": 40, "mode": "circuit", "unknown": 1}
+    assert list(_timer_config_to_camel(tc).items()) == [
+        ("mode", "circuit"), ("workSeconds", 40), ("rounds", 3), ("prepCountdownSeconds", 5),
+    ]
+
+
+def test_timer_config_camel_spelling_wins():
+    tc = {"rest_seconds": 60, "restSeconds": 90}
+    assert _timer_config_to_camel(tc) == {"mode": "standard", "restSeconds": 90}
+
+
+def test_group_notes_only_when_set():
+    group = {"group_id": "g1", "group_type": "superset", "timer_config": {"mode": "standard", "rest_seconds": 60}}
+    assert "notes" not in _group_to_camel({**group, "notes": ""})
+    assert list(_group_to_camel({**group, "notes": "Go heavy"})) == [
+        "groupId", "groupType", "timerConfig", "exercises", "notes",
+    ]
+
+
+def test_session_json_is_stable():
+    groups = [{
+        "group_id": "g1", "group_type": "emom",
+        "timer_config": {"mode": "emom", "interval_seconds": 60, "total_rounds": 10},
+        "exercises": [{"name": "Kettlebell Swing", "sets": 1, "reps": 15, "youtube_url": "", "notes": ""}],
+    }]
+    row = {
+        "id": uuid.UUID(int=1), "user_id": uuid.UUID(int=2), "plan_id": None,
+        "scheduled_date": date(2026, 3, 2), "title": "Conditioning", "status": "scheduled",
+        "exercises": json.dumps(groups), "started_at": None, "completed_at": None,
+        "created_at": datetime(2026, 3, 1, tzinfo=timezone.utc), "schema_version": 2,
+    }
+    assert json.dumps(_to_camel(row)) == (
+        '{"id": "00000000-0000-0000-0000-000000000001", "userId": "00000000-0000-0000-0000-000000000002", '
+        '"planId": null, "scheduledDate": "2026-03-02", "title": "Conditioning", "status": "scheduled", '
+        '"exerciseGroups": [{"groupId": "g1", "groupType": "emom", '
+        '"timerConfig": {"mode": "emom", "intervalSeconds": 60, "totalRounds": 10}, '
+        '"exercises": [{"name": "Kettlebell Swing", "sets": 1, "reps": 15, "youtubeUrl": "", "notes": ""}]}], '
+        '"startedAt": null, "completedAt": null, "createdAt": "2026-03-01T00:00:00+00:00"}'
+    )
+
+
+def test_groups_memoized_on_stored_json(monkeypatch):
+    groups = [{"group_id": "g1", "group_type": "single", "exercises": [{"name": "Squat", "sets": 5, "reps": 5}]}]
+    row = {
+        "id": uuid.UUID(int=3), "user_id": uuid.UUID(int=2), "scheduled_date": date(2026, 3, 2),
+        "exercises": json.dumps(groups), "schema_version": 2,
+    }
+    first = _to_camel(row)["exerciseGroups"]
+
+    loads = []
+    monkeypatch.setattr(sessions.json, "loads", lambda text: loads.append(text) or json.JSONDecoder().decode(text))
+    assert _to_camel(dict(row))["exerciseGroups"] is first
+    assert loads == []
+
+    groups[0]["exercises"][0]["reps"] = 3
+    edited = _to_camel({**row, "exercises": json.dumps(groups)})["exerciseGroups"]
+    assert edited[0]["exercises"][0]["reps"] == 3
+    assert len(loads) == 1
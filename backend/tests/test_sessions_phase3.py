@@ -25,26 +25,23 @@ def _make_session_row(status="scheduled", started_at=None, completed_at=None):
 @pytest.mark.asyncio
 async def test_start_session(client: AsyncClient, mock_conn):
     now = datetime.now(timezone.utc)
-    mock_conn.fetchrow.side_effect = [
-        _make_session_row(status="scheduled"),
-        _make_session_row(status="in_progress", started_at=now),
-    ]
-    mock_conn.execute.return_value = "UPDATE 1"
+    mock_conn.fetchrow.return_value = _make_session_row(status="in_progress", started_at=now)
 
     resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/start")
     assert resp.status_code == 200
     assert resp.json()["status"] == "in_progress"
     assert resp.json()["startedAt"] is not None
+    # Status check and write are one conditional UPDATE
+    assert mock_conn.fetchrow.await_count == 1
+    sql, *args = mock_conn.fetchrow.call_args.args
+    assert "UPDATE workout_sessions" in sql and "status = ANY" in sql
+    assert args[2] == ["scheduled"]
 
 
 @pytest.mark.asyncio
 async def test_complete_session(client: AsyncClient, mock_conn):
     now = datetime.now(timezone.utc)
-    mock_conn.fetchrow.side_effect = [
-        _make_session_row(status="in_progress", started_at=now),
-        _make_session_row(status="completed", started_at=now, completed_at=now),
-    ]
-    mock_conn.execute.return_value = "UPDATE 1"
+    mock_conn.fetchrow.return_value = _make_session_row(status="completed", started_at=now, completed_at=now)
 
     resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/complete")
     assert resp.status_code == 200
@@ -53,23 +50,151 @@ async def test_complete_session(client: AsyncClient, mock_conn):
 
 @pytest.mark.asyncio
 async def test_cannot_start_in_progress_session(client: AsyncClient, mock_conn):
-    now = datetime.now(timezone.utc)
-    mock_conn.fetchrow.return_value = _make_session_row(status="in_progress", started_at=now)
+    mock_conn.fetchrow.side_effect = [None, {"status": "in_progress"}]
 
     resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/start")
     assert resp.status_code == 400
+    assert resp.json()["detail"] == "Cannot start session with status 'in_progress'"
 
 
 @pytest.mark.asyncio
 async def test_cannot_complete_scheduled_session(client: AsyncClient, mock_conn):
-    mock_conn.fetchrow.return_value = _make_session_row(status="scheduled")
+    mock_conn.fetchrow.side_effect = [None, {"status": "scheduled"}]
 
     resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/complete")
     assert resp.status_code == 400
 
 
+@pytest.mark.asyncio
+async def test_cannot_reset_scheduled_session(client: AsyncClient, mock_conn):
+    mock_conn.fetchrow.side_effect = [None, {"status": "scheduled"}]
+
+    resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/reset")
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Session is already scheduled"
+
+
+@pytest.mark.asyncio
+async def test_reset_skipped_session(client: AsyncClient, mock_conn):
+    mock_conn.fetchrow.return_value = _make_session_row(status="scheduled")
+
+    resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/reset")
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "scheduled"
+    assert "skipped" in mock_conn.fetchrow.call_args.args[3]
+
+
 @pytest.mark.asyncio
 async def test_start_nonexistent_session(client: AsyncClient, mock_conn):
     mock_conn.fetchrow.return_value = None
     resp = await client.post(f"/api/sessions/{TEST_SESSION_ID}/start")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_etag(client: AsyncClient, mock_conn):
+    mock_conn.fetchval.return_value = "1:-5108236"
+    mock_conn.fetch.return_value = [_make_session_row()]
+    params = {"week_start": "2026-03-02"}
+
+    resp = await client.get("/api/sessions", params=params)
+    assert resp.status_code == 200
+    etag = resp.headers["etag"]
+
+    mock_conn.fetch.reset_mock()
+    resp = await client.get("/api/sessions", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    mock_conn.fetch.assert_not_awaited()
+
+    resp = await client.get("/api/sessions", params={"week_start": "2026-03-09"}, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+    mock_conn.fetchval.return_value = "1:733120"
+    resp = await client.get("/api/sessions", params=params, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_session_not_modified(client: AsyncClient, mock_conn):
+    mock_conn.fetchval.return_value = 4120
+    mock_conn.fetchrow.return_value = _make_session_row()
+    etag = (await client.get(f"/api/sessions/{TEST_SESSION_ID}")).headers["etag"]
+
+    mock_conn.fetchrow.reset_mock()
+    resp = await client.get(f"/api/sessions/{TEST_SESSION_ID}", headers={"If-None-Match": f'W/{etag}, "other"'})
+    assert resp.status_code == 304
+    mock_conn.fetchrow.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_session_not_found(client: AsyncClient, mock_conn):
+    mock_conn.fetchval.return_value = None
+    resp = await client.get(f"/api/sessions/{TEST_SESSION_ID}")
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_session_calendar(client: AsyncClient, mock_conn):
+    mock_conn.fetch.return_value = [
+        {"id": uuid.UUID(TEST_SESSION_ID), "scheduled_date": date(2026, 3, 2), "title": "Upper Body",
+         "status": "completed", "exercise_count": 6},
+    ]
+    resp = await client.get("/api/sessions/calendar", params={"start_date": "2026-03-01", "end_date": "2026-05-31"})
+    assert resp.status_code == 200
+    assert resp.json() == [{
+        "id": TEST_SESSION_ID, "scheduledDate": "2026-03-02", "title": "Upper Body",
+        "status": "completed", "exerciseCount": 6,
+    }]
+    sql, *args = mock_conn.fetch.call_args.args
+    assert "jsonb_array_length" in sql and "exercises," not in sql
+    assert args[1:] == [date(2026, 3, 1), date(2026, 5, 31)]
+
+
+@pytest.mark.asyncio
+async def test_session_calendar_range_checked(client: AsyncClient, mock_conn):
+    resp = await client.get("/api/sessions/calendar", params={"start_date": "2026-03-31", "end_date": "2026-03-01"})
+    assert resp.status_code == 400
+    resp = await client.get("/api/sessions/calendar", params={"start_date": "2026-01-01", "end_date": "2027-06-30"})
+    assert resp.status_code == 400
+    mock_conn.fetch.assert_not_awaited()
+
+
+def _log_row(exercise_name, set_number, weight_kg, session_id=TEST_SESSION_ID):
+    return {
+        "id": uuid.uuid4(), "user_id": uuid.UUID(TEST_USER_ID), "session_id": uuid.UUID(session_id),
+        "exercise_name": exercise_name, "set_number": set_number, "weight_kg": weight_kg, "reps": 8,
+        "rpe": None, "distance_m": None, "duration_seconds": None, "round_number": None,
+        "notes": None, "logged_at": datetime.now(timezone.utc),
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_workout_bootstrap(client: AsyncClient, mock_conn):
+    previous_session = "22222222-2222-2222-2222-222222222222"
+    row = _make_session_row(status="in_progress", started_at=datetime.now(timezone.utc))
+    row["exercises"] = '[{"name": "Barbell Bench Press", "sets": 3, "reps": 8}, {"name": "Barbell Row", "sets": 3, "reps": 8}]'
+    mock_conn.fetchrow.return_value = row
+    mock_conn.fetch.side_effect = [
+        [_log_row("Barbell Bench Press", 1, 80.0)],
+        [_log_row("Barbell Bench Press", 1, 77.5, previous_session),
+         _log_row("Barbell Bench Press", 2, 77.5, previous_session)],
+    ]
+
+    resp = await client.get(f"/api/sessions/{TEST_SESSION_ID}/workout")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["session"]["id"] == TEST_SESSION_ID
+    assert [s["weightKg"] for s in data["logs"]["Barbell Bench Press"]] == [80.0]
+    assert list(data["previousSets"]) == ["Barbell Bench Press"]
+    assert data["previousSets"]["Barbell Bench Press"][0]["sessionId"] == previous_session
+    # Session row, its logs, then one query for every exercise's previous sets
+    assert mock_conn.fetchrow.await_count == 1
+    assert mock_conn.fetch.await_count == 2
+    assert mock_conn.fetch.call_args.args[2] == ["Barbell Bench Press", "Barbell Row"]
+
+
+@pytest.mark.asyncio
+async def test_get_workout_not_found(client: AsyncClient, mock_conn):
+    mock_conn.fetchrow.return_value = None
+    resp = await client.get(f"/api/sessions/{TEST_SESSION_ID}/workout")
+    assert resp.status_code == 404
@@ -0,0 +1,103 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import AsyncClient
+
+TEST_USER_ID = "00000000-0000-0000-0000-000000000099"
+NOW = datetime(2026, 3, 2, 12, 0, tzinfo=timezone.utc)
+
+
+def _cursor(horizon: int, issued_at: datetime = NOW) -> str:
+    return f"{horizon}.{int(issued_at.timestamp())}"
+
+
+def _session_row(session_id: uuid.UUID) -> dict:
+    return {
+        "id": session_id, "user_id": uuid.UUID(TEST_USER_ID), "plan_id": None,
+        "scheduled_date": date(2026, 3, 2), "title": "Upper Body", "status": "in_progress",
+        "exercises": "[]", "started_at": NOW, "completed_at": None, "created_at": NOW, "schema_version": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_first_sync_issues_cursor(client: AsyncClient, mock_conn):
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetchrow.return_value = {"horizon": 1200, "now": NOW}
+
+    resp = await client.get("/api/sync")
+    assert resp.status_code == 200
+    assert resp.json() == {"cursor": _cursor(1200), "resync": True}
+    mock_conn.fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_changes_since_cursor(client: AsyncClient, mock_conn):
+    session_id, deleted_log = uuid.uuid4(), uuid.uuid4()
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetchrow.side_effect = [{"horizon": 1300, "now": NOW}, None]
+    mock_conn.fetch.side_effect = [
+        [_session_row(session_id)],
+        [],
+        [{"entity": "log", "entity_id": deleted_log}],
+    ]
+
+    resp = await client.get("/api/sync", params={"since": _cursor(1200, NOW - timedelta(hours=1))})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["cursor"] == _cursor(1300)
+    assert data["resync"] is False
+    assert [s["id"] for s in data["sessions"]] == [str(session_id)]
+    assert data["logs"] == []
+    assert data["deletedSessionIds"] == []
+    assert data["deletedLogIds"] == [str(deleted_log)]
+    assert data["profile"] is None
+    # Rows written by transactions at or after the old horizon
+    assert mock_conn.fetch.call_args_list[0].args[1:3] == (uuid.UUID(TEST_USER_ID), 1200)
+    mock_conn.transaction.assert_called_once_with(isolation="repeatable_read", readonly=True)
+
+
+@pytest.mark.asyncio
+async def test_sync_stale_cursor_requires_resync(client: AsyncClient, mock_conn):
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetchrow.return_value = {"horizon": 1300, "now": NOW}
+
+    resp = await client.get("/api/sync", params={"since": _cursor(1200, NOW - timedelta(days=31))})
+    assert resp.json() == {"cursor": _cursor(1300), "resync": True}
+    mock_conn.fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sync_too_many_changes_requires_resync(client: AsyncClient, mock_conn):
+    from app.routes.sync import _MAX_SYNC_ROWS
+
+    mock_conn.transaction = MagicMock()
+    mock_conn.fetchrow.return_value = {"horizon": 1300, "now": NOW}
+    mock_conn.fetch.side_effect = [[], [{}] * (_MAX_SYNC_ROWS + 1), []]
+
+    resp = await client.get("/api/sync", params={"since": _cursor(1200)})
+    assert resp.json() == {"cursor": _cursor(1300), "resync": True}
+
+
+@pytest.mark.asyncio
+async def test_sync_rejects_malformed_cursor(client: AsyncClient, mock_conn):
+    resp = await client.get("/api/sync", params={"since": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tombstones_purged_daily_while_running():
+    from app.routes.sync import purge_tombstones_daily
+
+    conn = AsyncMock()
+    conn.execute.side_effect = [RuntimeError("db down"), "DELETE 3"]
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__.return_value = conn
+    # Two days pass, then the app shuts down; a failed purge doesn't end the loop
+    with patch("app.routes.sync.asyncio.sleep", AsyncMock(side_effect=[None, None, asyncio.CancelledError])):
+        with pytest.raises(asyncio.CancelledError):
+            await purge_tombstones_daily(pool)
+    assert conn.execute.await_count == 2
+    assert "DELETE FROM sync_tombstones" in conn.execute.call_args.args[0]
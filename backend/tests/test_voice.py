@@ -46,7 +46,7 @@ async def test_voice_parse_success(MockDG, MockAnthropic, client: AsyncClient, m
         # session validation
         {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
         # resolve_exercise_name: exact match
-        {"name": "Barbell Bench Press"},
+        {"name": "Barbell Bench Press", "tier": "exact", "sim": None},
         # exercise category lookup
         {"category": "compound"},
     ]
@@ -74,7 +74,7 @@ async def test_voice_parse_low_confidence(MockDG, client: AsyncClient, mock_conn
         # session validation
         {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
         # resolve_exercise_name: exact match
-        {"name": "Barbell Back Squat"},
+        {"name": "Barbell Back Squat", "tier": "exact", "sim": None},
         # exercise category lookup
         {"category": "compound"},
     ]
@@ -103,7 +103,7 @@ async def test_voice_parse_cardio(MockDG, MockAnthropic, client: AsyncClient, mo
         # session validation
         {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
         # resolve_exercise_name: exact match
-        {"name": "Treadmill Run"},
+        {"name": "Treadmill Run", "tier": "exact", "sim": None},
         # exercise category lookup
         {"category": "cardio"},
     ]
@@ -137,7 +137,7 @@ async def test_voice_parse_ambiguous(MockDG, MockAnthropic, client: AsyncClient,
         # session validation
         {"id": uuid.UUID(TEST_SESSION_ID), "user_id": uuid.UUID(TEST_USER_ID), "status": "in_progress"},
         # resolve_exercise_name: exact match
-        {"name": "Barbell Bench Press"},
+        {"name": "Barbell Bench Press", "tier": "exact", "sim": None},
         # exercise category lookup
         {"category": "compound"},
     ]
@@ -39,19 +39,27 @@ CREATE TABLE workout_sessions (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
--- Individual sets logged during workout (progressive overload data)
+-- Individual sets logged during workout (progressive overload data).
+-- Range-partitioned by month on logged_at; the API creates the monthly
+-- partitions on startup and daily after (see backend/app/partitioning.py).
 CREATE TABLE exercise_logs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     user_id UUID REFERENCES profiles(id),
     session_id UUID REFERENCES workout_sessions(id),
     exercise_name VARCHAR(100) NOT NULL,
     set_number INT NOT NULL,
     weight_kg DECIMAL(5,1),
-    reps INT NOT NULL,
+    reps INT,
     rpe DECIMAL(3,1),
+    distance_m DECIMAL(7,1),
+    duration_seconds INT,
     notes VARCHAR(500),
-    logged_at TIMESTAMPTZ DEFAULT NOW()
-);
+    logged_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (id, logged_at)
+) PARTITION BY RANGE (logged_at);
+
+-- Catches rows outside every monthly partition
+CREATE TABLE exercise_logs_default PARTITION OF exercise_logs DEFAULT;
 
 -- Chat history with the AI agent
 CREATE TABLE chat_messages (
@@ -63,7 +71,33 @@ CREATE TABLE chat_messages (
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
+-- Canonical exercise names; the API seeds the catalog on startup
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE TABLE exercises (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    name VARCHAR(100) UNIQUE NOT NULL,
+    aliases TEXT[] DEFAULT '{}',                  -- legacy, superseded by exercise_aliases
+    muscle_group VARCHAR(50),
+    category VARCHAR(30),
+    equipment VARCHAR(50),
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Alternative spellings, looked up case-insensitively by the name resolver
+CREATE TABLE exercise_aliases (
+    alias VARCHAR(100) NOT NULL,
+    exercise_name VARCHAR(100) NOT NULL REFERENCES exercises(name) ON DELETE CASCADE ON UPDATE CASCADE,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
 -- Indexes for performance
+CREATE INDEX idx_exercises_name_trgm ON exercises USING gin (name gin_trgm_ops);
+CREATE INDEX idx_exercises_name_lower ON exercises (LOWER(name));
+CREATE UNIQUE INDEX idx_exercise_aliases_lower ON exercise_aliases (LOWER(alias));
 CREATE INDEX idx_exercise_logs_lookup ON exercise_logs(user_id, exercise_name, logged_at);
+-- Session-scoped lookups (set numbering, per-session lists, session deletes).
+-- Unique per partition: a parent unique index would have to include logged_at.
+CREATE UNIQUE INDEX exercise_logs_default_session_set ON exercise_logs_default(session_id, exercise_name, set_number);
 CREATE INDEX idx_sessions_schedule ON workout_sessions(user_id, scheduled_date);
 CREATE INDEX idx_chat_history ON chat_messages(user_id, created_at);
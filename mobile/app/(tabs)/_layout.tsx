@@ -1,5 +1,8 @@
+import { useEffect } from 'react';
+import { AppState } from 'react-native';
 import { Tabs } from 'expo-router';
 import { MaterialCommunityIcons } from '@expo/vector-icons';
+import { useWorkoutStore } from '../../stores/workoutStore';
 import { colors } from '../../theme';
 
 function TabIcon({ name, color, size }: { name: string; color: string; size: number }) {
@@ -7,6 +10,16 @@ function TabIcon({ name, color, size }: { name: string; color: string; size: num
 }
 
 export default function TabLayout() {
+  const syncChanges = useWorkoutStore((s) => s.syncChanges);
+
+  // Screens sync on focus; this catches changes made elsewhere while backgrounded
+  useEffect(() => {
+    const subscription = AppState.addEventListener('change', (state) => {
+      if (state === 'active') syncChanges();
+    });
+    return () => subscription.remove();
+  }, [syncChanges]);
+
   return (
     <Tabs
       screenOptions={{
@@ -18,6 +18,9 @@ const TIME_RANGES = [
   { value: '9999', label: 'All' },
 ];
 
+// Long windows are thinned server-side (LTTB) to about this many chart points
+const CHART_MAX_POINTS = 120;
+
 export default function ProgressScreen() {
   const [exerciseNames, setExerciseNames] = useState<string[]>([]);
   const [selectedExercise, setSelectedExercise] = useState<string | null>(null);
@@ -47,7 +50,7 @@ export default function ProgressScreen() {
     const params = `exercise_name=${encodeURIComponent(selectedExercise)}&days=${days}`;
 
     Promise.all([
-      get<ExerciseProgressResponse>(`/api/exercises/history?${params}`),
+      get<ExerciseProgressResponse>(`/api/exercises/history?${params}&max_points=${CHART_MAX_POINTS}`),
       get<HistoryDayDetail[]>(`/api/exercises/history/detail?${params}`),
     ])
       .then(([historyData, detailData]) => {
@@ -1,8 +1,9 @@
-import React, { useCallback, useEffect, useState } from 'react';
+import React, { useCallback, useState } from 'react';
 import { Linking, ScrollView, StyleSheet, TouchableOpacity, View } from 'react-native';
 import { IconButton, Text } from 'react-native-paper';
 import { MaterialCommunityIcons } from '@expo/vector-icons';
 import { useRouter } from 'expo-router';
+import { useFocusEffect } from '@react-navigation/native';
 import { format, parseISO } from 'date-fns';
 import { ScreenContainer, Card, CardHeader, CardContent, Badge, Button } from '../../components/ui';
 import { useWorkoutStore } from '../../stores/workoutStore';
@@ -177,18 +178,16 @@ export default function ScheduleScreen() {
   const error = useWorkoutStore((s) => s.error);
   const nextWeek = useWorkoutStore((s) => s.nextWeek);
   const prevWeek = useWorkoutStore((s) => s.prevWeek);
-  const fetchWeekSessions = useWorkoutStore((s) => s.fetchWeekSessions);
+  const syncChanges = useWorkoutStore((s) => s.syncChanges);
 
-  useEffect(() => {
-    fetchWeekSessions(currentWeekStart);
-  }, [currentWeekStart, fetchWeekSessions]);
+  useFocusEffect(
+    useCallback(() => {
+      syncChanges();
+    }, [syncChanges]),
+  );
 
   const weekLabel = format(parseISO(currentWeekStart), "'Week of' MMM d");
 
-  const handleRefresh = useCallback(() => {
-    fetchWeekSessions(currentWeekStart);
-  }, [currentWeekStart, fetchWeekSessions]);
-
   return (
     <ScreenContainer scroll title="Schedule" padded={false}>
       <View style={styles.weekNav}>
@@ -211,7 +210,7 @@ export default function ScheduleScreen() {
           icon="refresh"
           iconColor={colors.textSecondary}
           size={20}
-          onPress={handleRefresh}
+          onPress={syncChanges}
           disabled={loading}
         />
       </View>
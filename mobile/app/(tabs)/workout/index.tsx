@@ -1,7 +1,8 @@
-import React, { useEffect } from 'react';
+import React, { useCallback } from 'react';
 import { StyleSheet, View } from 'react-native';
 import { Text } from 'react-native-paper';
 import { useRouter } from 'expo-router';
+import { useFocusEffect } from '@react-navigation/native';
 import { MaterialCommunityIcons } from '@expo/vector-icons';
 import { isToday, parseISO } from 'date-fns';
 import { ScreenContainer, Card, CardContent, Button } from '../../../components/ui';
@@ -12,12 +13,13 @@ export default function WorkoutIndexScreen() {
   const router = useRouter();
   const sessions = useWorkoutStore((s) => s.sessions);
   const activeSession = useWorkoutStore((s) => s.activeSession);
-  const fetchWeekSessions = useWorkoutStore((s) => s.fetchWeekSessions);
-  const currentWeekStart = useWorkoutStore((s) => s.currentWeekStart);
+  const syncChanges = useWorkoutStore((s) => s.syncChanges);
 
-  useEffect(() => {
-    fetchWeekSessions(currentWeekStart);
-  }, [currentWeekStart, fetchWeekSessions]);
+  useFocusEffect(
+    useCallback(() => {
+      syncChanges();
+    }, [syncChanges]),
+  );
 
   // Find active or today's sessions
   const todaySessions = sessions.filter((s) => {
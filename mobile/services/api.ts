@@ -30,23 +30,34 @@ async function getAuthHeaders(): Promise<Record<string, string>> {
   return {};
 }
 
+// Last ETag and body per GET path; revalidated with If-None-Match so an
+// unchanged schedule or history comes back as an empty 304.
+const MAX_ETAG_ENTRIES = 50;
+const etagCache = new Map<string, { etag: string; body: unknown }>();
+
 async function request<T>(
   method: string,
   path: string,
   options?: RequestOptions,
 ): Promise<T> {
   const authHeaders = await getAuthHeaders();
+  const cached = method === 'GET' ? etagCache.get(path) : undefined;
 
   const response = await fetch(`${API_URL}${path}`, {
     method,
     headers: {
       'Content-Type': 'application/json',
       ...authHeaders,
+      ...(cached ? { 'If-None-Match': cached.etag } : {}),
       ...options?.headers,
     },
     body: options?.body ? JSON.stringify(options.body) : undefined,
   });
 
+  if (response.status === 304 && cached) {
+    return cached.body as T;
+  }
+
   if (response.status === 401) {
     // TODO: trigger token refresh flow
     throw new ApiRequestError('Unauthorized', 401);
@@ -68,15 +79,44 @@ async function request<T>(
     return undefined as T;
   }
 
-  return response.json() as Promise<T>;
+  const body = (await response.json()) as T;
+  const etag = response.headers.get('ETag');
+  if (method === 'GET' && etag) {
+    etagCache.delete(path);
+    if (etagCache.size >= MAX_ETAG_ENTRIES) {
+      etagCache.delete(etagCache.keys().next().value as string);
+    }
+    etagCache.set(path, { etag, body });
+  }
+  return body;
 }
 
 export function get<T>(path: string): Promise<T> {
   return request<T>('GET', path);
 }
 
-export function post<T>(path: string, body: unknown): Promise<T> {
-  return request<T>('POST', path, { body });
+export function post<T>(path: string, body: unknown, headers?: Record<string, string>): Promise<T> {
+  return request<T>('POST', path, { body, headers });
+}
+
+/** A fresh key for the Idempotency-Key header; reuse it when retrying the same write. */
+export function newIdempotencyKey(): string {
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+}
+
+/**
+ * POST that retries network failures (no response received) with the same
+ * Idempotency-Key, so a write that did reach the server isn't applied twice.
+ */
+export async function postIdempotent<T>(path: string, body: unknown, attempts = 3): Promise<T> {
+  const headers = { 'Idempotency-Key': newIdempotencyKey() };
+  for (let attempt = 1; ; attempt++) {
+    try {
+      return await post<T>(path, body, headers);
+    } catch (e) {
+      if (e instanceof ApiRequestError || attempt >= attempts) throw e;
+    }
+  }
 }
 
 export function put<T>(path: string, body: unknown): Promise<T> {
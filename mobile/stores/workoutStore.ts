@@ -1,7 +1,7 @@
 import { create } from 'zustand';
 import { addDays, startOfWeek, formatISO } from 'date-fns';
-import { get as apiGet, post, patch, del } from '../services/api';
-import type { WorkoutSession, ExerciseLog, ExerciseGroup, TimerMode } from '../types';
+import { get as apiGet, post, postIdempotent, patch, del } from '../services/api';
+import type { WorkoutSession, ExerciseLog, ExerciseGroup, TimerMode, SyncResponse } from '../types';
 
 function getCurrentWeekStart(): string {
   const monday = startOfWeek(new Date(), { weekStartsOn: 1 });
@@ -45,6 +45,7 @@ interface WorkoutState extends TimerState {
   activeSession: WorkoutSession | null;
   exerciseLogs: Record<string, ExerciseLog[]>;
   currentWeekStart: string;
+  syncCursor: string | null;
   loading: boolean;
   error: string | null;
 
@@ -59,6 +60,8 @@ interface WorkoutState extends TimerState {
   updateSet: (logId: string, updates: Partial<ExerciseLog>) => Promise<void>;
   deleteSet: (logId: string, exerciseName: string) => Promise<void>;
   fetchExerciseLogs: (sessionId: string, exerciseName: string) => Promise<void>;
+  fetchSessionLogs: (sessionId: string) => Promise<void>;
+  syncChanges: () => Promise<void>;
   setActiveSession: (session: WorkoutSession | null) => void;
   nextWeek: () => void;
   prevWeek: () => void;
@@ -91,6 +94,7 @@ export const useWorkoutStore = create<WorkoutState>((set, get) => ({
   activeSession: null,
   exerciseLogs: {},
   currentWeekStart: getCurrentWeekStart(),
+  syncCursor: null,
   loading: false,
   error: null,
   ...initialTimerState,
@@ -116,6 +120,7 @@ export const useWorkoutStore = create<WorkoutState>((set, get) => ({
         activeSession: session,
         sessions: state.sessions.map((s) => (s.id === session.id ? session : s)),
       }));
+      await get().fetchSessionLogs(session.id);
     } catch {
       // Session may have been deleted — silently ignore
     }
@@ -211,7 +216,7 @@ export const useWorkoutStore = create<WorkoutState>((set, get) => ({
   logSet: async (sessionId: string, exerciseName: string, setData) => {
     set({ loading: true, error: null });
     try {
-      const log = await post<ExerciseLog>('/api/exercises/log', {
+      const log = await postIdempotent<ExerciseLog>('/api/exercises/log', {
         sessionId,
         exerciseName,
         ...setData,
@@ -276,6 +281,67 @@ export const useWorkoutStore = create<WorkoutState>((set, get) => ({
     }
   },
 
+  fetchSessionLogs: async (sessionId: string) => {
+    try {
+      const logs = await apiGet<Record<string, ExerciseLog[]>>(
+        `/api/exercises/log/session/${encodeURIComponent(sessionId)}`,
+      );
+      set({ exerciseLogs: logs });
+    } catch (e) {
+      set({ error: (e as Error).message });
+    }
+  },
+
+  syncChanges: async () => {
+    try {
+      const { syncCursor, activeSession, currentWeekStart } = get();
+      const query = syncCursor ? `?since=${encodeURIComponent(syncCursor)}` : '';
+      const delta = await apiGet<SyncResponse>(`/api/sync${query}`);
+      if (delta.resync) {
+        // Cursor first, then reload: anything written during the reload is re-sent next sync
+        set({ syncCursor: delta.cursor });
+        await get().fetchWeekSessions(currentWeekStart);
+        if (activeSession) await get().fetchSessionLogs(activeSession.id);
+        // A failed reload would leave gaps the deltas never fill: resync again next time
+        if (get().error) set({ syncCursor: null });
+        return;
+      }
+
+      const changed = new Map((delta.sessions ?? []).map((s) => [s.id, migrateSession(s)]));
+      const deletedSessions = new Set(delta.deletedSessionIds ?? []);
+      const deletedLogs = new Set(delta.deletedLogIds ?? []);
+      set((state) => {
+        // Keep the week list to the week on screen: sessions can move in or out of it
+        const weekEnd = formatISO(addDays(new Date(state.currentWeekStart), 7), { representation: 'date' });
+        const inWeek = (s: WorkoutSession) => s.scheduledDate >= state.currentWeekStart && s.scheduledDate < weekEnd;
+        const sessions = [
+          ...state.sessions.filter((s) => !deletedSessions.has(s.id) && !changed.has(s.id)),
+          ...changed.values(),
+        ]
+          .filter(inWeek)
+          .sort((a, b) => a.scheduledDate.localeCompare(b.scheduledDate));
+        const active = state.activeSession;
+        const exerciseLogs: Record<string, ExerciseLog[]> = {};
+        for (const [name, logs] of Object.entries(state.exerciseLogs)) {
+          exerciseLogs[name] = logs.filter((l) => !deletedLogs.has(l.id));
+        }
+        for (const log of delta.logs ?? []) {
+          if (!active || log.sessionId !== active.id) continue;
+          const logs = (exerciseLogs[log.exerciseName] ?? []).filter((l) => l.id !== log.id);
+          exerciseLogs[log.exerciseName] = [...logs, log].sort((a, b) => a.setNumber - b.setNumber);
+        }
+        return {
+          syncCursor: delta.cursor,
+          sessions,
+          activeSession: active && deletedSessions.has(active.id) ? null : active && (changed.get(active.id) ?? active),
+          exerciseLogs,
+        };
+      });
+    } catch (e) {
+      set({ error: (e as Error).message });
+    }
+  },
+
   setActiveSession: (session: WorkoutSession | null) => {
     set({ activeSession: session ? migrateSession(session) : null });
   },
@@ -283,13 +349,17 @@ export const useWorkoutStore = create<WorkoutState>((set, get) => ({
   nextWeek: () => {
     const current = new Date(get().currentWeekStart);
     const next = addDays(current, 7);
-    set({ currentWeekStart: formatISO(next, { representation: 'date' }) });
+    const weekStart = formatISO(next, { representation: 'date' });
+    set({ currentWeekStart: weekStart });
+    get().fetchWeekSessions(weekStart);
   },
 
   prevWeek: () => {
     const current = new Date(get().currentWeekStart);
     const prev = addDays(current, -7);
-    set({ currentWeekStart: formatISO(prev, { representation: 'date' }) });
+    const weekStart = formatISO(prev, { representation: 'date' });
+    set({ currentWeekStart: weekStart });
+    get().fetchWeekSessions(weekStart);
   },
 
   clearError: () => {
@@ -139,6 +139,27 @@ export interface ExerciseLog {
   loggedAt: string;
 }
 
+/** GET /api/sessions/{id}/workout — everything the workout screen needs on open. */
+export interface WorkoutBootstrap {
+  session: WorkoutSession;
+  logs: Record<string, ExerciseLog[]>;
+  previousSets: Record<string, ExerciseLog[]>;
+}
+
+/**
+ * GET /api/sync?since=<cursor>. Apply rows as upserts by id (a row can arrive
+ * twice). On resync, reload through the regular endpoints, then sync from cursor.
+ */
+export interface SyncResponse {
+  cursor: string;
+  resync: boolean;
+  profile?: Profile | null;
+  sessions?: WorkoutSession[];
+  logs?: ExerciseLog[];
+  deletedSessionIds?: string[];
+  deletedLogIds?: string[];
+}
+
 // ===== Chat =====
 export type ChatRole = 'user' | 'assistant';
 
@@ -196,6 +217,7 @@ export interface ProgressDataPoint {
   maxWeight: number;
   bestReps: number;
   totalSets: number;
+  volumeKg: number;
 }
 
 export interface ExerciseProgressResponse {